@@ -10,66 +10,43 @@ from PIL import Image
 from pathfinding.core.diagonal_movement import DiagonalMovement
 from pathfinding.core.grid import Grid
 from pathfinding.finder.a_star import AStarFinder
+from pathfinding.io.image import draw_path, find_color, load_image
 
 
 # image file with the map
 BASE_PATH = Path(os.path.dirname(__file__))
 MAP_FILE = BASE_PATH / "map.png"
 OUT_FILE = BASE_PATH / "out.png"
-# color channel order, defaults to RGB
-RED, GREEN, BLUE = 0, 1, 2
 
-
-def green(pixel: list) -> bool: 
-    """Returns True if the pixel is green (the starting point)"""
-    return pixel[RED] < 10 and pixel[GREEN] > 250 and pixel[BLUE] < 10
-
-
-def red(pixel: list) -> bool:
-    """Returns True if the pixel is red (the goal position)"""
-    return pixel[RED] > 250 and pixel[GREEN] < 10 and pixel[BLUE] < 10
-
-
-def pixel_walkable(pixel, x, y):
-    """returns True if the pixel is walkable."""
-    return any([p > 50 for p in pixel])  # darker pixel are not walkable
+COLOR_START = (0, 255, 0)  # green
+COLOR_END = (255, 0, 0)  # red
+COLOR_PATH = (255, 165, 0)  # orange
+# max. difference of every color channel to the marker colors
+MARKER_TOLERANCE = 5
 
 
 def main(filename_map: str = MAP_FILE, filename_out: str = OUT_FILE, diagonal_movement: bool = False):
-    nodes = []
     if not Path(filename_map).exists():
         print(f'File {filename_map} does not exist.')
         return
 
     print('Parsing map..')
-    with Image.open(filename_map) as im:
-        width, height = im.size
-        for y in range(height):
-            nodes.append([])
-            for x in range(width):
-                pixel = im.getpixel((x, y))
-                node = pixel_walkable(pixel[:3], x, y)
-                nodes[y].append(node)
-                if red(pixel):
-                    _goal = (x, y)
-                if green(pixel):
-                    _start = (x, y)
-        grid = Grid(matrix=nodes)
-        end = grid.node(*_goal)
-        start = grid.node(*_start)
-
-        print('Finding optimal path..')
-        finder = AStarFinder(diagonal_movement=DiagonalMovement.always if diagonal_movement else DiagonalMovement.never)
-        path, runs = finder.find_path(start, end, grid)
-
-        # print(grid.grid_str(path=path, end=end, start=start))
-        print(f'iterations: {runs:_} path length: {len(path):_}')
-
-        print('Saving image..')
-        out = im.copy()
-        for p in path[1:-1]:
-            out.putpixel((p.x, p.y), (255, 165, 0))
-        out.save(filename_out)
+    pixels = load_image(filename_map)
+    # darker pixel are not walkable
+    walkable = (pixels > 50).any(axis=-1)
+    grid = Grid(matrix=walkable)
+    start = grid.node(*find_color(pixels, COLOR_START, MARKER_TOLERANCE)[0])
+    end = grid.node(*find_color(pixels, COLOR_END, MARKER_TOLERANCE)[0])
+
+    print('Finding optimal path..')
+    finder = AStarFinder(diagonal_movement=DiagonalMovement.always if diagonal_movement else DiagonalMovement.never)
+    path, runs = finder.find_path(start, end, grid)
+
+    # print(grid.grid_str(path=path, end=end, start=start))
+    print(f'iterations: {runs:_} path length: {len(path):_}')
+
+    print('Saving image..')
+    Image.fromarray(draw_path(pixels, path[1:-1], COLOR_PATH)).save(filename_out)
 
 
 if __name__ == '__main__':
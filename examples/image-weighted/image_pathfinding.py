@@ -2,15 +2,16 @@
 import os
 from pathlib import Path
 import argparse
-from random import uniform as random_float
 
 # Pillow
 from PIL import Image
+import numpy as np
 
 # pathfinding
 from pathfinding.core.diagonal_movement import DiagonalMovement
 from pathfinding.core.grid import Grid
 from pathfinding.finder.a_star import AStarFinder
+from pathfinding.io.image import color_weights, draw_path, find_color, load_image
 
 
 # image file with the map
@@ -40,46 +41,29 @@ def main(
         filename_map: str = MAP_FILE, filename_out: str = OUT_FILE,
         weight_randomization: float = 0, diagonal_movement: bool = False,
 ):
-    nodes = []
     if not Path(filename_map).exists():
         print(f'File {filename_map} does not exist.')
         return
 
     print('Parsing map..')
-    with Image.open(filename_map) as im:
-        width, height = im.size
-        for y in range(height):
-            nodes.append([])
-            for x in range(width):
-                pixel = im.getpixel((x, y))
-                weight = COLOR_WEIGHT_MAPPING.get(pixel, 1)
+    pixels = load_image(filename_map)
+    weights = color_weights(pixels, COLOR_WEIGHT_MAPPING, default=1)
+    if weight_randomization != 0:
+        weights += np.random.uniform(0, weight_randomization, weights.shape)
 
-                if weight_randomization != 0:
-                    weight += random_float(0, weight_randomization)
+    grid = Grid(matrix=weights)
+    start = grid.node(*find_color(pixels, COLOR_START)[0])
+    end = grid.node(*find_color(pixels, COLOR_END)[0])
 
-                nodes[y].append(weight)
+    print('Finding optimal path..')
+    finder = AStarFinder(diagonal_movement=DiagonalMovement.always if diagonal_movement else DiagonalMovement.never)
+    path, runs = finder.find_path(start, end, grid)
 
-                if pixel == COLOR_END:
-                    _goal = (x, y)
-                elif pixel == COLOR_START:
-                    _start = (x, y)
+    # print(grid.grid_str(path=path, end=end, start=start))
+    print(f'iterations: {runs:_} path length: {len(path):_}')
 
-        grid = Grid(matrix=nodes)
-        end = grid.node(*_goal)
-        start = grid.node(*_start)
-
-        print('Finding optimal path..')
-        finder = AStarFinder(diagonal_movement=DiagonalMovement.always if diagonal_movement else DiagonalMovement.never)
-        path, runs = finder.find_path(start, end, grid)
-
-        # print(grid.grid_str(path=path, end=end, start=start))
-        print(f'iterations: {runs:_} path length: {len(path):_}')
-
-        print('Saving image..')
-        out = im.copy()
-        for p in path[1:-1]:
-            out.putpixel((p.x, p.y), COLOR_PATH)
-        out.save(filename_out)
+    print('Saving image..')
+    Image.fromarray(draw_path(pixels, path[1:-1], COLOR_PATH)).save(filename_out)
 
 
 if __name__ == '__main__':
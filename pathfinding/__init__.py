@@ -1 +1 @@
-__all__ = ['core', 'finder']
+__all__ = ['core', 'finder', 'io']
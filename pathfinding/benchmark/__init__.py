@@ -0,0 +1 @@
+__all__ = ['runner', 'scenarios']
@@ -0,0 +1,71 @@
+"""
+Run the benchmark suite and store the results as JSON:
+
+    python -m pathfinding.benchmark -o results.json
+
+Compare the results of two versions:
+
+    python -m pathfinding.benchmark --compare old.json new.json
+"""
+import argparse
+import json
+import sys
+
+from .runner import (
+    all_finders, compare, format_comparison, run_benchmark)
+from .scenarios import default_scenarios
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m pathfinding.benchmark',
+        description='benchmark the finders of python-pathfinding')
+    parser.add_argument(
+        '-o', '--output', help='write results as JSON to this file')
+    parser.add_argument(
+        '--size', type=int, default=64, help='size of the maps')
+    parser.add_argument(
+        '--repeat', type=int, default=3, help='timed runs per finder')
+    parser.add_argument(
+        '--time-limit', type=float, default=10,
+        help='time limit per search in seconds')
+    parser.add_argument(
+        '--finder', action='append',
+        help='only run this finder (class name, can be repeated)')
+    parser.add_argument(
+        '--scenario', action='append',
+        help='only run this scenario (can be repeated)')
+    parser.add_argument(
+        '--compare', nargs=2, metavar=('OLD', 'NEW'),
+        help='compare two JSON results instead of running the benchmark')
+    parser.add_argument(
+        '--threshold', type=float, default=0.1,
+        help='relative change that counts as regression')
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        with open(args.compare[0], encoding='utf-8') as f:
+            old = json.load(f)
+        with open(args.compare[1], encoding='utf-8') as f:
+            new = json.load(f)
+        rows = compare(old, new, args.threshold)
+        print(format_comparison(rows))
+        return 1 if any(row['regression'] for row in rows) else 0
+
+    scenarios = default_scenarios(args.size)
+    if args.scenario:
+        scenarios = [s for s in scenarios if s.name in args.scenario]
+    finders = all_finders()
+    if args.finder:
+        finders = [f for f in finders if f.__name__ in args.finder]
+    results = run_benchmark(
+        scenarios, finders, repeat=args.repeat, time_limit=args.time_limit,
+        size=args.size, verbose=True)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,225 @@
+"""Run finders over benchmark scenarios and compare results.
+
+Results are plain dicts (one per scenario and finder) so they can be stored
+as JSON and compared with the results of another version.
+"""
+import importlib
+import inspect
+import math
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from .. import finder as finder_package
+from ..core.diagonal_movement import DiagonalMovement
+from ..core.grid import Grid
+from ..core.line_of_sight import line_cells
+from ..finder.finder import Finder
+from .scenarios import default_scenarios
+
+
+def all_finders():
+    """
+    all finder classes in pathfinding/finder/ (sorted by name)
+    """
+    finders = {}
+    for module_name in finder_package.__all__:
+        module = importlib.import_module(
+            f'{finder_package.__name__}.{module_name}')
+        for _, cls in inspect.getmembers(module, inspect.isclass):
+            if issubclass(cls, Finder) and cls is not Finder and \
+                    cls.__module__ == module.__name__:
+                finders[cls.__name__] = cls
+    return [finders[name] for name in sorted(finders)]
+
+
+def step_cost(grid, node_a, node_b):
+    """
+    cost of a step including weights, steps of any-angle paths that are not
+    between neighbors cost their euclidean length (see finder/theta_star.py).
+    None if such a step crosses weighted cells, the any-angle finders ignore
+    the weights, so the cost can't be compared with other paths.
+    """
+    if isinstance(grid, Grid) and node_b not in grid.neighbors(
+            node_a, DiagonalMovement.always):
+        if any(grid.node(x, y).weight != 1 for x, y in line_cells(
+                node_a.x, node_a.y, node_b.x, node_b.y)):
+            return None
+        return math.hypot(node_a.x - node_b.x, node_a.y - node_b.y)
+    return grid.calc_cost(node_a, node_b, True)
+
+
+def path_cost(grid, path):
+    """
+    cost of the path including weights (None if it can't be compared, see
+    step_cost)
+    """
+    cost = 0
+    for node_a, node_b in zip(path, path[1:]):
+        step = step_cost(grid, node_a, node_b)
+        if step is None:
+            return None
+        cost += step
+    return cost
+
+
+def run_single(scenario, finder_class, repeat=3, time_limit=10):
+    """
+    benchmark one finder on one scenario.
+
+    Time is the best of repeat runs without tracemalloc, peak memory is
+    measured with tracemalloc in an extra run. The grid is created before
+    each run and is not part of the measurement.
+
+    :return: dict with scenario, finder, time (seconds), runs (nodes
+        expanded), peak_memory (bytes), cost and length of the path and
+        error (name of the exception if the finder failed)
+    """
+    result = {
+        'scenario': scenario.name,
+        'finder': finder_class.__name__,
+        'time': None,
+        'runs': None,
+        'peak_memory': None,
+        'cost': None,
+        'length': None,
+        'error': None,
+    }
+
+    def search():
+        grid, start, end = scenario.build()
+        finder = finder_class(
+            diagonal_movement=scenario.diagonal_movement,
+            time_limit=time_limit)
+        return grid, finder, start, end
+
+    try:
+        best = float('inf')
+        for _ in range(repeat):
+            grid, finder, start, end = search()
+            start_time = time.perf_counter()
+            path, runs = finder.find_path(start, end, grid)
+            best = min(best, time.perf_counter() - start_time)
+        result['time'] = best
+        result['runs'] = runs
+        result['length'] = len(path)
+        result['cost'] = path_cost(grid, list(path)) if path else None
+
+        grid, finder, start, end = search()
+        tracemalloc.start()
+        try:
+            finder.find_path(start, end, grid)
+            result['peak_memory'] = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+    except Exception as e:  # e.g. time limit or unsupported grid type
+        result['error'] = e.__class__.__name__
+    return result
+
+
+def run_benchmark(scenarios=None, finders=None, repeat=3, time_limit=10,
+                  size=64, verbose=False):
+    """
+    run all finders over all scenarios
+
+    :param scenarios: list of Scenario (defaults to default_scenarios)
+    :param finders: list of finder classes (defaults to all_finders)
+    :param repeat: number of timed runs, the fastest one is used
+    :param time_limit: time limit of the finders in seconds
+    :param size: size of the default scenarios
+    :param verbose: print every result
+    :return: dict with meta information and results (JSON serializable)
+    """
+    if scenarios is None:
+        scenarios = default_scenarios(size)
+    if finders is None:
+        finders = all_finders()
+    results = []
+    for scenario in scenarios:
+        for finder_class in finders:
+            result = run_single(scenario, finder_class, repeat, time_limit)
+            if verbose:
+                print(format_result(result))
+            results.append(result)
+    return {
+        'meta': {
+            'python': sys.version,
+            'platform': platform.platform(),
+            'date': datetime.now(timezone.utc).isoformat(),
+            'size': size,
+            'repeat': repeat,
+        },
+        'results': results,
+    }
+
+
+def format_result(result):
+    if result['error']:
+        return f"{result['scenario']:<18} {result['finder']:<22} " \
+            f"{result['error']}"
+    return f"{result['scenario']:<18} {result['finder']:<22} " \
+        f"{result['time']:8.4f}s {result['runs']:>8} runs " \
+        f"{result['peak_memory'] / 1024:10.1f} KiB cost {result['cost']}"
+
+
+def compare(old, new, threshold=0.1):
+    """
+    compare two benchmark results (as returned by run_benchmark)
+
+    :param threshold: relative change of time or memory that counts as
+        regression (0.1 = 10% slower/bigger)
+    :return: list of dicts with scenario, finder, old and new values and
+        their ratio (new / old), regression is True if the new version is
+        worse than the threshold or the path cost changed
+    """
+    old_results = {
+        (result['scenario'], result['finder']): result
+        for result in old['results']}
+    rows = []
+    for result in new['results']:
+        key = (result['scenario'], result['finder'])
+        if key not in old_results:
+            continue
+        old_result = old_results[key]
+        row = {'scenario': key[0], 'finder': key[1], 'regression': False}
+        for field in ('time', 'runs', 'peak_memory', 'cost'):
+            old_value, new_value = old_result[field], result[field]
+            ratio = None
+            if old_value and new_value is not None:
+                ratio = new_value / old_value
+            row[field] = {'old': old_value, 'new': new_value, 'ratio': ratio}
+        if result['error'] != old_result['error']:
+            row['regression'] = result['error'] is not None
+        for field in ('time', 'peak_memory'):
+            ratio = row[field]['ratio']
+            if ratio is not None and ratio > 1 + threshold:
+                row['regression'] = True
+        old_cost, new_cost = row['cost']['old'], row['cost']['new']
+        if result['error'] is None and old_result['error'] is None and (
+                (old_cost is None) != (new_cost is None) or
+                old_cost is not None and abs(old_cost - new_cost) > 1e-9):
+            # also if no path is found anymore (or one that wasn't before)
+            row['regression'] = True
+        rows.append(row)
+    return rows
+
+
+def format_comparison(rows):
+    lines = []
+    for row in rows:
+        changes = []
+        for field in ('time', 'runs', 'peak_memory'):
+            ratio = row[field]['ratio']
+            changes.append(
+                f'{field} {ratio:6.2f}x' if ratio is not None
+                else f'{field}     -')
+        if row['cost']['old'] != row['cost']['new']:
+            changes.append(
+                f"cost {row['cost']['old']} -> {row['cost']['new']}")
+        flag = ' REGRESSION' if row['regression'] else ''
+        lines.append(
+            f"{row['scenario']:<18} {row['finder']:<22} "
+            f"{'  '.join(changes)}{flag}")
+    return '\n'.join(lines)
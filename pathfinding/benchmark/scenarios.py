@@ -0,0 +1,163 @@
+"""Standard maps for benchmarking the finders.
+
+Every scenario creates a fresh grid (or graph/world) with its start and end
+node when build is called, so searches don't influence each other. All
+random maps use a fixed seed and are the same on every run.
+"""
+import dataclasses
+import random
+from typing import Callable
+
+from ..core.diagonal_movement import DiagonalMovement
+from ..core.graph import Graph
+from ..core.grid import Grid
+from ..core.world import World
+
+
+@dataclasses.dataclass
+class Scenario:
+    name: str
+    # creates (grid, start, end)
+    build: Callable
+    diagonal_movement: int = DiagonalMovement.never
+    # weights are used in the scenario
+    weighted: bool = False
+
+
+def open_field(size):
+    grid = Grid(size, size)
+    return grid, grid.node(0, 0), grid.node(size - 1, size - 1)
+
+
+def maze(size):
+    """
+    perfect maze created by a randomized depth-first search
+    """
+    rnd = random.Random(1)
+    # cells are on odd positions, walls in between
+    cells = (size - 1) // 2
+    matrix = [[0] * size for _ in range(size)]
+    stack = [(0, 0)]
+    matrix[1][1] = 1
+    while stack:
+        x, y = stack[-1]
+        options = [
+            (x + dx, y + dy) for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1))
+            if 0 <= x + dx < cells and 0 <= y + dy < cells and
+            not matrix[(y + dy) * 2 + 1][(x + dx) * 2 + 1]]
+        if not options:
+            stack.pop()
+            continue
+        nx, ny = rnd.choice(options)
+        matrix[y + ny + 1][x + nx + 1] = 1
+        matrix[ny * 2 + 1][nx * 2 + 1] = 1
+        stack.append((nx, ny))
+    grid = Grid(matrix=matrix)
+    end = (cells - 1) * 2 + 1
+    return grid, grid.node(1, 1), grid.node(end, end)
+
+
+def rooms(size, room_size=10):
+    """
+    rooms separated by walls with one door to the right and one to the
+    bottom of every room
+    """
+    rnd = random.Random(2)
+    matrix = [[1] * size for _ in range(size)]
+    for wall in range(room_size, size, room_size):
+        for i in range(size):
+            matrix[wall][i] = 0
+            matrix[i][wall] = 0
+    for top in range(0, size, room_size):
+        for left in range(0, size, room_size):
+            bottom = min(top + room_size, size)
+            right = min(left + room_size, size)
+            # all rooms but the first ones start behind a wall
+            inner_top = top + 1 if top else top
+            inner_left = left + 1 if left else left
+            if right < size:
+                matrix[rnd.randrange(inner_top, bottom)][right] = 1
+            if bottom < size:
+                matrix[bottom][rnd.randrange(inner_left, right)] = 1
+    grid = Grid(matrix=matrix)
+    return grid, grid.node(0, 0), grid.node(size - 1, size - 1)
+
+
+def weighted_terrain(size):
+    rnd = random.Random(3)
+    matrix = [[rnd.randint(1, 9) for _ in range(size)] for _ in range(size)]
+    grid = Grid(matrix=matrix)
+    return grid, grid.node(0, 0), grid.node(size - 1, size - 1)
+
+
+def wrapped_borders(size):
+    """
+    a wall in the middle of the map, the shortest path leads over the
+    passable borders
+    """
+    matrix = [[1] * size for _ in range(size)]
+    for y in range(size):
+        matrix[y][size // 2] = 0
+    grid = Grid(matrix=matrix)
+    grid.set_passable_left_right_border()
+    grid.set_passable_up_down_border()
+    return grid, grid.node(size // 4, size // 2), \
+        grid.node(size * 3 // 4, size // 2)
+
+
+def large_graph(size):
+    """
+    graph shaped like a grid with random costs, size * size nodes
+    """
+    rnd = random.Random(4)
+    edges = []
+    for y in range(size):
+        for x in range(size):
+            node_id = y * size + x
+            if x + 1 < size:
+                edges.append([node_id, node_id + 1, rnd.randint(1, 9)])
+            if y + 1 < size:
+                edges.append([node_id, node_id + size, rnd.randint(1, 9)])
+    graph = Graph(edges=edges, bi_directional=True)
+    return graph, graph.node(0), graph.node(size * size - 1)
+
+
+def multi_grid_world(size, levels=3):
+    """
+    levels on top of each other, connected by a stair in alternating
+    corners, each level has a wall with a gap on the other side
+    """
+    grids = {}
+    for level in range(levels):
+        matrix = [[1] * size for _ in range(size)]
+        for x in range(size - 1):
+            matrix[size // 2][x if level % 2 else x + 1] = 0
+        grids[level] = Grid(matrix=matrix, grid_id=level)
+    for level in range(levels - 1):
+        x = size - 1 if level % 2 == 0 else 0
+        lower = grids[level].node(x, size - 1)
+        upper = grids[level + 1].node(x, size - 1)
+        lower.connect(upper)
+        upper.connect(lower)
+    world = World(grids)
+    return world, grids[0].node(0, 0), grids[levels - 1].node(size - 1, 0)
+
+
+def default_scenarios(size=64):
+    """
+    all standard scenarios, grids are size x size cells
+    """
+    return [
+        Scenario('open_field', lambda: open_field(size),
+                 DiagonalMovement.always),
+        Scenario('maze', lambda: maze(size | 1), DiagonalMovement.never),
+        Scenario('rooms', lambda: rooms(size),
+                 DiagonalMovement.only_when_no_obstacle),
+        Scenario('weighted_terrain', lambda: weighted_terrain(size),
+                 DiagonalMovement.always, weighted=True),
+        Scenario('wrapped_borders', lambda: wrapped_borders(size),
+                 DiagonalMovement.never),
+        Scenario('large_graph', lambda: large_graph(size), weighted=True),
+        Scenario('multi_grid_world', lambda: multi_grid_world(size),
+                 DiagonalMovement.never),
+    ]
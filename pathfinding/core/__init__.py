@@ -1 +1,2 @@
-__all__ = ['diagonal_movement', 'graph', 'grid', 'heuristic', 'node', 'util']
+__all__ = ['compact_grid', 'diagonal_movement', 'graph', 'grid', 'heuristic',
+           'landmarks', 'line_of_sight', 'node', 'search_context', 'util']
@@ -0,0 +1,224 @@
+from array import array
+from .grid import Grid, USE_NUMPY, numpy_cells
+from .node import CompactGridNode
+if USE_NUMPY:
+    import numpy as np
+
+
+def _zeros(typecode, size):
+    """
+    flat array of zeros, numpy only allocates the memory when it gets used
+    """
+    if USE_NUMPY:
+        return memoryview(np.zeros(size, dtype=typecode))
+    return array(typecode, bytes(array(typecode).itemsize * size))
+
+
+class _NodeRow:
+    """one row of nodes of a CompactGrid, nodes get created on access."""
+    def __init__(self, grid, y):
+        self.grid = grid
+        self.y = y
+
+    def __len__(self):
+        return self.grid.width
+
+    def __getitem__(self, x):
+        if x < 0:
+            x += self.grid.width
+        return self.grid.node(x, self.y)
+
+    def __iter__(self):
+        for x in range(self.grid.width):
+            yield self.grid.node(x, self.y)
+
+
+class _NodeRows:
+    """
+    2D-list like view on the nodes of a CompactGrid, so code that accesses
+    grid.nodes[y][x] keeps working.
+    """
+    def __init__(self, grid):
+        self.grid = grid
+
+    def __len__(self):
+        return self.grid.height
+
+    def __getitem__(self, y):
+        if y < 0:
+            y += self.grid.height
+        if not 0 <= y < self.grid.height:
+            raise IndexError('row index out of range')
+        return _NodeRow(self.grid, y)
+
+    def __iter__(self):
+        for y in range(self.grid.height):
+            yield _NodeRow(self.grid, y)
+
+
+class CompactGrid(Grid):
+    def __init__(
+            self, width=0, height=0, matrix=None, grid_id=None,
+            inverse=False):
+        """
+        a grid that keeps walkability, weight and the values calculated by
+        the finders in flat arrays (indexed by y * width + x) instead of
+        creating a GridNode for every cell. Nodes are only created on demand
+        (e.g. by grid.node or grid.neighbors) and can be thrown away after
+        use, which allows for much bigger maps than the normal Grid.
+        """
+        self.width = width
+        self.height = height
+        self.grid_id = grid_id
+        # set by the finders once the grid has been used for a search
+        self.dirty = False
+        self.passable_left_right_border = False
+        self.passable_up_down_border = False
+        # neighbor table for every diagonal movement, created on demand
+        self._neighbor_tables = {}
+        # neighbors function for every diagonal movement (see
+        # neighbor_function)
+        self._neighbor_functions = {}
+        # connected components for every diagonal movement (see components)
+        self._components = {}
+        # cells of every component (see _ComponentCells)
+        self._component_cells = {}
+        # number of labels handed out by update_node (see _new_labels)
+        self._label_count = 0
+        # number of walkable cells for every weight (see Grid._change_weights)
+        self._weight_counts = None
+        # callbacks that get called when cells change (see subscribe)
+        self._listeners = []
+        # increased with every change of the cells (see notify)
+        self.version = 0
+        use_matrix = isinstance(matrix, (tuple, list)) or (
+                USE_NUMPY and isinstance(matrix, np.ndarray) and (
+                    matrix.size > 0))
+        if use_matrix:
+            self.height = len(matrix)
+            self.width = len(matrix[0]) if self.height > 0 else 0
+
+        size = self.width * self.height
+        # connections to other nodes (see GridNode.connect), by index
+        self._connections = {}
+        if use_matrix and not isinstance(matrix, (tuple, list)):
+            weights, walkable, min_weight = numpy_cells(matrix, inverse)
+            self._set_arrays(walkable, weights, min_weight)
+            self.nodes = _NodeRows(self)
+            return
+
+        self._walkable = array('B', bytes(size))
+        self._weight = array('d', bytes(8 * size))
+        self._min_weight = float('inf')
+
+        index = 0
+        for y in range(self.height):
+            for x in range(self.width):
+                # same rules as in build_nodes
+                weight = float(matrix[y][x]) if use_matrix else 1.0
+                walkable = weight <= 0.0 if inverse else weight > 0
+                if walkable and weight < self._min_weight:
+                    self._min_weight = weight
+                self._walkable[index] = walkable
+                self._weight[index] = weight
+                index += 1
+
+        self.nodes = _NodeRows(self)
+        self.cleanup()
+
+    def _set_arrays(self, walkable, weights, min_weight):
+        """
+        use numpy arrays for walkability and weights. A writeable
+        C-contiguous float64 array of weights is not copied, the
+        grid keeps working on it (so update_node changes the array and
+        changes of the array change the weights of the grid).
+        """
+        if weights.dtype != np.float64 or not weights.flags.c_contiguous or \
+                not weights.flags.writeable:
+            weights = np.array(weights, dtype=np.float64)
+        self._weight = memoryview(weights.reshape(-1))
+        self._walkable = memoryview(np.ascontiguousarray(
+            walkable, dtype=bool).view(np.uint8).reshape(-1))
+        self._min_weight = min_weight
+        self._weight_counts = None
+        self.cleanup()
+
+    def __getstate__(self):
+        # memoryviews (see _set_arrays and _zeros) can't be pickled
+        state = super().__getstate__()
+        for name, value in state.items():
+            if isinstance(value, memoryview):
+                state[name] = array(value.format, value.tobytes())
+        return state
+
+    def node(self, x, y) -> CompactGridNode:
+        """
+        get node at position
+        :param x: x pos
+        :param y: y pos
+        :return:
+        """
+        if not self.inside(x, y):
+            raise IndexError(f'position {x}:{y} is outside of the grid')
+        return CompactGridNode(self, x, y)
+
+    def node_at(self, index) -> CompactGridNode:
+        """
+        get node by its index in the flat arrays (y * width + x)
+        """
+        return CompactGridNode(self, index % self.width, index // self.width)
+
+    def _cell_connections(self):
+        return list(self._connections.items())
+
+    def _owns(self, node) -> bool:
+        return isinstance(node, CompactGridNode) and node.grid is self
+
+    def walkable(self, x, y) -> bool:
+        """
+        check, if the tile is inside grid and if it is set as walkable
+        """
+        return 0 <= x < self.width and 0 <= y < self.height and \
+            self._walkable[y * self.width + x] == 1
+
+    def _walkable_mask(self):
+        """
+        walkability of all cells as 2D boolean numpy array
+        """
+        return np.frombuffer(self._walkable, dtype=np.uint8).reshape(
+            self.height, self.width).astype(bool)
+
+    def _weight_matrix(self):
+        """
+        weights of all cells as 2D float64 numpy array
+        """
+        return np.frombuffer(self._weight, dtype=np.float64).reshape(
+            self.height, self.width)
+
+    def _read_cells(self, indices):
+        walkable = np.frombuffer(self._walkable, dtype=np.uint8)
+        weights = np.frombuffer(self._weight, dtype=np.float64)
+        return walkable[indices].astype(bool), weights[indices]
+
+    def _write_cells(self, indices, walkable, weights):
+        np.frombuffer(self._walkable, dtype=np.uint8)[indices] = walkable
+        np.frombuffer(self._weight, dtype=np.float64)[indices] = weights
+
+    def cleanup(self):
+        """
+        reset all values the finders calculated, this only reallocates the
+        arrays and does not need to touch every node.
+        """
+        size = self.width * self.height
+        self._h = _zeros('d', size)
+        self._g = _zeros('d', size)
+        self._f = _zeros('d', size)
+        self._opened = _zeros('b', size)
+        self._closed = _zeros('B', size)
+        # index of the parent + 1 (0: no parent, -1: parent of another grid)
+        self._parent = _zeros('q', size)
+        self._search_id = _zeros('Q', size)
+        # parents that are not part of this grid (see GridNode.connect)
+        self._foreign_parents = {}
+        self._retain_count = {}
+        self._tested = set()
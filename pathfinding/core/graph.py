@@ -1,4 +1,4 @@
-from typing import Dict, List, Set
+from typing import Dict, List
 from .node import GraphNode
 
 
@@ -10,28 +10,49 @@ class Graph:
         self.edges = edges if edges else []
         self.nodes = nodes if nodes else {}
         self.bi_directional = bi_directional
-        # we will call cleanup automatically if dirty is True
+        # set by the finders once the graph has been used for a search
         self.dirty = False
+        # increased with every change of the edges
+        self.version = 0
+        # version and labels of the connected components (see components)
+        self._components = None
         self.edge_node_items()
         if not nodes:
             self.generate_nodes()
+        self.build_index()
+
+    @property
+    def edges(self):
+        """
+        list of all edges as [node-from, node-to, cost], the removed edges
+        are dropped from it when it is used the next time
+        """
+        if self._removed_pairs:
+            self._edges = [
+                edge for edge in self._edges
+                if (edge[0].node_id, edge[1].node_id)
+                not in self._removed_pairs]
+            self._removed_pairs = set()
+        return self._edges
+
+    @edges.setter
+    def edges(self, edges):
+        self._edges = edges
+        # (from id, to id) of the edges removed from the index, but not
+        # from the list yet (see remove_edges)
+        self._removed_pairs = set()
 
     def edge_node_items(self):
         for edge in self.edges:
-            node = edge[0]
+            self._edge_node_item(edge)
+
+    def _edge_node_item(self, edge):
+        for i in range(2):
+            node = edge[i]
             if isinstance(node, (int, float, str)):
-                if node in self.nodes:
-                    edge[0] = self.nodes[node]
-                else:
+                if node not in self.nodes:
                     self.nodes[node] = GraphNode(node_id=node)
-                    edge[0] = self.nodes[node]
-            node = edge[1]
-            if isinstance(edge[1], (int, float, str)):
-                if node in self.nodes:
-                    edge[1] = self.nodes[node]
-                else:
-                    self.nodes[node] = GraphNode(node_id=node)
-                    edge[1] = self.nodes[node]
+                edge[i] = self.nodes[node]
 
     def generate_nodes(self):
         for edge in self.edges:
@@ -39,26 +60,159 @@ class Graph:
             self.nodes[from_node.node_id] = from_node
             self.nodes[to_node.node_id] = to_node
 
+    def build_index(self):
+        """
+        (re)build the adjacency index, so neighbors and costs of a node can
+        be looked up without looking at all edges.
+        """
+        self.version += 1
+        # node id -> {node id of the neighbor: (neighbor, cost)}
+        # for all edges going out of the node
+        self.successors = {}
+        # same for all edges going into the node (used if bi_directional)
+        self.predecessors = {}
+        for edge in self.edges:
+            self._index_edge(edge)
+
+    def _index_edge(self, edge):
+        from_node, to_node, cost = edge
+        from_id = from_node.node_id
+        to_id = to_node.node_id
+        # if there are multiple edges between two nodes use the cheapest one
+        outgoing = self.successors.setdefault(from_id, {})
+        if to_id not in outgoing or cost < outgoing[to_id][1]:
+            outgoing[to_id] = (to_node, cost)
+        incoming = self.predecessors.setdefault(to_id, {})
+        if from_id not in incoming or cost < incoming[from_id][1]:
+            incoming[from_id] = (from_node, cost)
+
+    def add_edge(self, node_from, node_to, cost):
+        """
+        add an edge to the graph and update the adjacency index
+
+        :param node_from: start of the edge (GraphNode or node id)
+        :param node_to: end of the edge (GraphNode or node id)
+        :param cost: cost to move along the edge
+        """
+        edge = [node_from, node_to, cost]
+        self._edge_node_item(edge)
+        for node in edge[:2]:
+            self.nodes.setdefault(node.node_id, node)
+        if (edge[0].node_id, edge[1].node_id) in self._removed_pairs:
+            # drop the removed edges first, they have the same nodes
+            self.edges.append(edge)
+        else:
+            self._edges.append(edge)
+        self._index_edge(edge)
+        self.version += 1
+
+    def remove_edge(self, node_from, node_to):
+        """
+        remove all edges from node_from to node_to (not the other way around,
+        even if the graph is bi-directional) and update the adjacency index
+
+        :param node_from: start of the edge (GraphNode or node id)
+        :param node_to: end of the edge (GraphNode or node id)
+        """
+        self.remove_edges([(node_from, node_to)])
+
+    def remove_edges(self, pairs):
+        """
+        remove all edges between the given (node_from, node_to) pairs, only
+        the adjacency index is updated right away, the edges are dropped from
+        the list of edges when it is used the next time (see edges).
+
+        :param pairs: iterable of (node_from, node_to) (GraphNode or node id)
+        """
+        pairs = {(getattr(node_from, 'node_id', node_from),
+                  getattr(node_to, 'node_id', node_to))
+                 for node_from, node_to in pairs}
+        if not pairs:
+            return
+        self._removed_pairs.update(pairs)
+        for from_id, to_id in pairs:
+            self.successors.get(from_id, {}).pop(to_id, None)
+            self.predecessors.get(to_id, {}).pop(from_id, None)
+        self.version += 1
+
+    def remove_node(self, node):
+        """
+        remove the node and all edges from and to it
+
+        :param node: GraphNode or node id
+        """
+        node_id = getattr(node, 'node_id', node)
+        pairs = [(node_id, other_id)
+                 for other_id in self.successors.get(node_id, ())]
+        pairs += [(other_id, node_id)
+                  for other_id in self.predecessors.get(node_id, ())]
+        self.remove_edges(pairs)
+        self.successors.pop(node_id, None)
+        self.predecessors.pop(node_id, None)
+        self.nodes.pop(node_id, None)
+        self.version += 1
+
     def neighbors(self, node: GraphNode, **kwargs):
-        nodes = [
-            edge[1] for edge in self.edges
-            if edge[0] == node]
+        node_id = node.node_id
+        outgoing = self.successors.get(node_id)
+        nodes = [entry[0] for entry in outgoing.values()] if outgoing else []
         if self.bi_directional:
-            nodes += [
-                edge[0] for edge in self.edges
-                if edge[1] == node]
+            incoming = self.predecessors.get(node_id)
+            if incoming:
+                nodes += [
+                    entry[0] for other_id, entry in incoming.items()
+                    if not outgoing or other_id not in outgoing]
         return nodes
 
     def calc_cost(self, node_a, node_b, _weighted=False):
-        for edge in self.edges:
-            if edge[0].node_id == node_a.node_id and \
-                    edge[1].node_id == node_b.node_id:
-                return edge[2]
-            if self.bi_directional and \
-                    edge[1].node_id == node_a.node_id and \
-                    edge[0].node_id == node_b.node_id:
-                return edge[2]
-        raise RuntimeError('not connected')
+        entry = self.successors.get(node_a.node_id, {}).get(node_b.node_id)
+        if self.bi_directional:
+            reverse = self.predecessors.get(
+                node_a.node_id, {}).get(node_b.node_id)
+            if entry is None or (
+                    reverse is not None and reverse[1] < entry[1]):
+                entry = reverse
+        if entry is None:
+            raise RuntimeError('not connected')
+        return entry[1]
+
+    def components(self):
+        """
+        label of the weakly connected component (ignoring the direction of
+        the edges) for the id of every node that has edges, a node can only
+        reach nodes with the same label. Created again when the edges
+        changed (see version).
+        """
+        if self._components is None or self._components[0] != self.version:
+            parent = {}
+
+            def find(node_id):
+                root = node_id
+                while parent.setdefault(root, root) != root:
+                    root = parent[root]
+                while node_id != root:
+                    parent[node_id], node_id = root, parent[node_id]
+                return root
+
+            for from_id, outgoing in self.successors.items():
+                for to_id in outgoing:
+                    root_a, root_b = find(from_id), find(to_id)
+                    if root_a != root_b:
+                        parent[root_b] = root_a
+            labels = {node_id: find(node_id) for node_id in parent}
+            self._components = (self.version, labels)
+        return self._components[1]
+
+    def connected(self, node_a, node_b, diagonal_movement=None) -> bool:
+        """
+        check if there might be a path from node_a to node_b, False if they
+        are in different connected components (see components)
+        """
+        if node_a.node_id == node_b.node_id:
+            return True
+        labels = self.components()
+        label_a = labels.get(node_a.node_id)
+        return label_a is not None and label_a == labels.get(node_b.node_id)
 
     def node(self, node_id):
         return self.nodes[node_id]
@@ -1,3 +1,5 @@
+import collections
+import weakref
 from typing import List
 from .diagonal_movement import DiagonalMovement
 from .node import GridNode
@@ -9,6 +11,119 @@ except ImportError:
     USE_NUMPY = False
 
 
+# bits of the direction masks in the neighbor tables (see Grid.neighbors)
+NORTH = 1
+EAST = 2
+SOUTH = 4
+WEST = 8
+NORTH_WEST = 16
+NORTH_EAST = 32
+SOUTH_EAST = 64
+SOUTH_WEST = 128
+
+# direction bits with their offsets, in the order of Grid.neighbors
+STRAIGHTS = ((NORTH, 0, -1), (EAST, 1, 0), (SOUTH, 0, 1), (WEST, -1, 0))
+DIAGONALS = ((NORTH_WEST, -1, -1), (NORTH_EAST, 1, -1),
+             (SOUTH_EAST, 1, 1), (SOUTH_WEST, -1, 1))
+
+# offsets of all walkable neighbors for every 4-bit part of a mask
+STRAIGHT_OFFSETS = [
+    tuple((dx, dy) for bit, dx, dy in STRAIGHTS if mask & bit)
+    for mask in range(16)]
+DIAGONAL_OFFSETS = [
+    tuple((dx, dy) for bit, dx, dy in DIAGONALS if (mask << 4) & bit)
+    for mask in range(16)]
+
+# walkability changes of more cells than this (see Grid.update_mask) are
+# applied at once, the neighbor tables are built again and the connected
+# components are labeled again when they are needed
+BULK_UPDATE_CELLS = 256
+
+# max. number of cells searched when a cell of a connected component gets
+# blocked, the whole component is labeled again if the search gets bigger
+# (see Grid.components)
+COMPONENT_SEARCH_LIMIT = 4096
+
+
+def numpy_cells(matrix, inverse=False):
+    """
+    weights, walkability and minimum weight of all cells of a numpy matrix,
+    calculated in bulk with the same rules as build_nodes.
+
+    :param matrix: 2D numpy array
+    :param inverse: values bigger than 0 are obstacles
+    :return: weights (float64, the matrix itself if it already is a float64
+        array), walkable (bool array) and the minimum weight of the walkable
+        cells
+    """
+    weights = np.asarray(matrix, dtype=np.float64)
+    walkable = weights <= 0.0 if inverse else weights > 0
+    min_weight = float(np.min(weights, where=walkable, initial=np.inf))
+    return weights, walkable, min_weight
+
+
+def array_nodes(walkable, weights, grid_id=None) -> List[List[GridNode]]:
+    """
+    create nodes from a 2D boolean numpy array of walkable cells and a 2D
+    numpy array of weights
+    """
+    # python lists are much faster to iterate than numpy arrays
+    return [
+        [GridNode(x=x, y=y, walkable=cell_walkable, weight=weight,
+                  grid_id=grid_id)
+         for x, (cell_walkable, weight) in enumerate(zip(
+             walkable_row, weight_row))]
+        for y, (walkable_row, weight_row) in enumerate(zip(
+            np.asarray(walkable, dtype=bool).tolist(),
+            np.asarray(weights, dtype=np.float64).tolist()))]
+
+
+def label_cells(masks, cells, width, height):
+    """
+    label the connected components of the given cells with numpy (union-find
+    with hooking and pointer jumping), two cells are connected if the
+    neighbor table (see Grid.neighbors) allows a step between them.
+
+    :param masks: neighbor table as uint8 numpy array
+    :param cells: indices (y * width + x) of the cells, all walkable
+        neighbors of the cells have to be part of it
+    :return: array with the label of every cell at its index (the smallest
+        index of its component), other values are undefined
+    """
+    parent = np.arange(width * height)
+    x = cells % width
+    y = cells // width
+    # the steps are symmetric, so half of the directions are enough
+    starts, ends = [], []
+    for bit, dx, dy in ((EAST, 1, 0), (SOUTH, 0, 1),
+                        (SOUTH_EAST, 1, 1), (SOUTH_WEST, -1, 1)):
+        step = (masks[cells] & bit) != 0
+        starts.append(cells[step])
+        ends.append(((y[step] + dy) % height) * width +
+                    (x[step] + dx) % width)
+    starts = np.concatenate(starts)
+    ends = np.concatenate(ends)
+    while True:
+        roots_a = parent[starts]
+        roots_b = parent[ends]
+        different = roots_a != roots_b
+        if not different.any():
+            return parent
+        starts = starts[different]
+        ends = ends[different]
+        roots_a = roots_a[different]
+        roots_b = roots_b[different]
+        # hook the bigger root to the smaller one
+        np.minimum.at(parent, np.maximum(roots_a, roots_b),
+                      np.minimum(roots_a, roots_b))
+        while True:
+            roots = parent[cells]
+            grandparents = parent[roots]
+            if (roots == grandparents).all():
+                break
+            parent[cells] = grandparents
+
+
 def build_nodes(
         width, height, matrix=None, inverse=False,
         grid_id=None) -> List[List[GridNode]]:
@@ -16,9 +131,12 @@ def build_nodes(
     create nodes according to grid size. If a matrix is given it
     will be used to determine what nodes are walkable.
     """
+    if USE_NUMPY and isinstance(matrix, np.ndarray) and matrix.size > 0:
+        weights, walkable, min_weight = numpy_cells(matrix, inverse)
+        return array_nodes(walkable, weights, grid_id), min_weight
+
     nodes = []
-    use_matrix = (isinstance(matrix, (tuple, list))) or \
-        (USE_NUMPY and isinstance(matrix, np.ndarray) and matrix.size > 0)
+    use_matrix = isinstance(matrix, (tuple, list))
 
     min_weight = float("inf")
     for y in range(height):
@@ -42,6 +160,117 @@ def build_nodes(
     return nodes, min_weight
 
 
+class _ComponentCells:
+    """
+    cells of every connected component of a labels array (see
+    Grid.components), so merging two components only relabels the cells of
+    the smaller one instead of scanning all labels. The cells of a
+    component are kept as chunks of index arrays, cells that left the
+    component are dropped when its chunks get compacted.
+    """
+    def __init__(self, labels):
+        self.labels = labels
+        cells = np.flatnonzero(labels >= 0)
+        cells = cells[np.argsort(labels[cells], kind='stable')]
+        values, starts, counts = np.unique(
+            labels[cells], return_index=True, return_counts=True)
+        # label -> list of index arrays, cells that left stay in them
+        self.chunks = {}
+        # label -> number of cells with the label
+        self.sizes = {}
+        # label -> number of indices in its chunks
+        self.lengths = {}
+        for label, start, count in zip(
+                values.tolist(), starts.tolist(), counts.tolist()):
+            self.chunks[label] = [cells[start:start + count]]
+            self.sizes[label] = self.lengths[label] = count
+
+    def cells(self, label):
+        """
+        indices of all cells with the label (compacts its chunks)
+        """
+        chunks = self.chunks[label]
+        if len(chunks) == 1:
+            cells = chunks[0]
+        else:
+            # a cell that left and came back is in more than one chunk
+            cells = np.sort(np.concatenate(chunks))
+            cells = cells[np.append(True, cells[1:] != cells[:-1])]
+        cells = cells[self.labels[cells] == label]
+        self.chunks[label] = [cells]
+        self.lengths[label] = len(cells)
+        return cells
+
+    def _shrink(self, label, count):
+        self.sizes[label] -= count
+        if self.sizes[label] <= 0:
+            del self.chunks[label], self.sizes[label], self.lengths[label]
+        elif self.lengths[label] > 2 * self.sizes[label] + 64:
+            self.cells(label)
+
+    def add(self, label, cells, old_label=-1):
+        """
+        give the cells (index array) a new label
+        :param old_label: label of the component the cells leave (all
+            cells had the same label before)
+        """
+        if old_label >= 0:
+            self._shrink(old_label, len(cells))
+        self.labels[cells] = label
+        self.chunks[label] = [cells]
+        self.sizes[label] = self.lengths[label] = len(cells)
+
+    def remove(self, index):
+        """
+        the cell got blocked
+        """
+        label = int(self.labels[index])
+        if label >= 0:
+            self.labels[index] = -1
+            self._shrink(label, 1)
+
+    def merge(self, index_a, index_b):
+        """
+        merge the components of two cells, the cells of the smaller one get
+        the label of the bigger one
+        """
+        keep = int(self.labels[index_a])
+        drop = int(self.labels[index_b])
+        if keep < 0 or drop < 0 or keep == drop:
+            return
+        if self.sizes[keep] < self.sizes[drop]:
+            keep, drop = drop, keep
+        cells = self.cells(drop)
+        self.labels[cells] = keep
+        self.chunks[keep].append(cells)
+        self.sizes[keep] += len(cells)
+        self.lengths[keep] += len(cells)
+        del self.chunks[drop], self.sizes[drop], self.lengths[drop]
+
+
+class GridListener:
+    """
+    callback for Grid.subscribe that calls grid_changed of an object without
+    keeping it alive, it unsubscribes itself once the object is gone
+    """
+    def __init__(self, listener):
+        self.listener = weakref.ref(listener)
+
+    def __call__(self, grid, cells):
+        listener = self.listener() if self.listener else None
+        if listener is None:
+            grid.unsubscribe(self)
+        else:
+            listener.grid_changed(grid, cells)
+
+    def __getstate__(self):
+        # a copy of the grid doesn't notify the listener
+        return {}
+
+    def __setstate__(self, state):
+        self.listener = None
+
+
 class Grid:
     def __init__(
             self, width=0, height=0, matrix=None, grid_id=None,
@@ -51,10 +280,30 @@ class Grid:
         """
         self.width = width
         self.height = height
-        # we will call cleanup automatically if dirty is True
+        self.grid_id = grid_id
+        # set by the finders once the grid has been used for a search
         self.dirty = False
         self.passable_left_right_border = False
         self.passable_up_down_border = False
+        # neighbor table for every diagonal movement, created on demand
+        self._neighbor_tables = {}
+        # neighbors function for every diagonal movement (see
+        # neighbor_function)
+        self._neighbor_functions = {}
+        # connected components for every diagonal movement (see components)
+        self._components = {}
+        # cells of every component (see _ComponentCells), created by the
+        # first update of the components
+        self._component_cells = {}
+        # number of labels handed out by update_node (see _new_labels)
+        self._label_count = 0
+        # number of walkable cells for every weight, created when the
+        # minimum weight might get bigger (see _change_weights)
+        self._weight_counts = None
+        # callbacks that get called when cells change (see subscribe)
+        self._listeners = []
+        # increased with every change of the cells (see notify)
+        self.version = 0
         if isinstance(matrix, (tuple, list)) or (
                 USE_NUMPY and isinstance(matrix, np.ndarray) and (
                 matrix.size > 0)):
@@ -67,11 +316,49 @@ class Grid:
             self.nodes = [[]]
             self._min_weight = float("inf")
 
+    @classmethod
+    def from_arrays(cls, walkable, weights, grid_id=None, min_weight=None):
+        """
+        create a grid from numpy arrays (e.g. numpy.memmap, see
+        pathfinding.io.grid_file), walkability and weight can be set
+        independently this way.
+
+        :param walkable: 2D boolean array (height, width)
+        :param weights: 2D array of weights (height, width)
+        :param grid_id: id of the grid
+        :param min_weight: minimum weight of the walkable cells (calculated
+            if not given)
+        """
+        if walkable.shape != weights.shape or len(weights.shape) != 2:
+            raise ValueError(
+                'walkable and weights need to be 2D arrays of the same shape')
+        grid = cls(grid_id=grid_id)
+        grid.height, grid.width = weights.shape
+        if min_weight is None:
+            min_weight = float(np.min(
+                weights, where=walkable, initial=np.inf))
+        grid._set_arrays(walkable, weights, min_weight)
+        return grid
+
+    def _set_arrays(self, walkable, weights, min_weight):
+        self.nodes = array_nodes(walkable, weights, self.grid_id)
+        self._neighbor_functions.clear()
+        self._min_weight = min_weight
+        self._weight_counts = None
+
+    def __getstate__(self):
+        # the neighbor functions (see neighbor_function) can't be pickled
+        state = self.__dict__.copy()
+        state['_neighbor_functions'] = {}
+        return state
+
     def set_passable_left_right_border(self):
         self.passable_left_right_border = True
+        self.invalidate_neighbor_tables()
 
     def set_passable_up_down_border(self):
         self.passable_up_down_border = True
+        self.invalidate_neighbor_tables()
 
     def node(self, x, y) -> GridNode:
         """
@@ -122,55 +409,101 @@ class Grid:
         get all neighbors of one node
         :param node: node
         """
-        x = node.x
-        y = node.y
-        neighbors = []
-        north = nw = east = ne = south = se = west = sw = False
+        neighbors = self._neighbor_functions.get(diagonal_movement)
+        if neighbors is None:
+            neighbors = self.neighbor_function(diagonal_movement)
+        return neighbors(node)
 
-        # ↑
-        if y == 0 and self.passable_up_down_border:
-            north_y = self.height - 1
-        else:
-            north_y = y - 1
+    def neighbor_function(self, diagonal_movement: DiagonalMovement):
+        """
+        returns a function that gets all neighbors of a node (see neighbors).
+        The type of the grid and its borders are only checked once here
+        instead of for every node, the function is kept until
+        invalidate_neighbor_tables is called.
+        :param diagonal_movement: diagonal movement of the neighbors
+        """
+        tables = self._neighbor_tables
+        build_table = self._build_neighbor_table
+        width = self.width
+        height = self.height
 
-        if self.walkable(x, north_y):
-            neighbors.append(self.nodes[north_y][x])
-            north = True
+        if type(self).node is Grid.node and not (
+                self.passable_left_right_border or
+                self.passable_up_down_border):
+            # the table only contains steps inside the grid, so we can
+            # take the nodes from the rows directly
+            rows = self.nodes
 
-        # →
-        if x == self.width - 1 and self.passable_left_right_border:
-            east_x = 0
-        else:
-            east_x = x + 1
+            def neighbors(node):
+                table = tables.get(diagonal_movement)
+                if table is None:
+                    table = build_table(diagonal_movement)
+                x = node.x
+                y = node.y
+                mask = table[y * width + x]
 
-        if self.walkable(east_x, y):
-            neighbors.append(self.nodes[y][east_x])
-            east = True
+                # ↑ → ↓ ←
+                result = [rows[y + dy][x + dx]
+                          for dx, dy in STRAIGHT_OFFSETS[mask & 15]]
 
-        # ↓
-        if y == self.height - 1 and self.passable_up_down_border:
-            south_y = 0
-        else:
-            south_y = y + 1
-        if self.walkable(x, south_y):
-            neighbors.append(self.nodes[south_y][x])
-            south = True
-
-        # ←
-        if x == 0 and self.passable_left_right_border:
-            west_x = self.width - 1
+                # check for connections to other grids
+                if node.connections:
+                    result.extend(node.connections)
+
+                # ↖ ↗ ↘ ↙
+                if mask > 15:
+                    result += [rows[y + dy][x + dx]
+                               for dx, dy in DIAGONAL_OFFSETS[mask >> 4]]
+                return result
         else:
-            west_x = x - 1
-        if self.walkable(west_x, y):
-            neighbors.append(self.nodes[y][west_x])
-            west = True
+            node_at = self.node
+
+            def neighbors(node):
+                table = tables.get(diagonal_movement)
+                if table is None:
+                    table = build_table(diagonal_movement)
+                x = node.x
+                y = node.y
+                mask = table[y * width + x]
+
+                # ↑ → ↓ ←
+                result = [node_at((x + dx) % width, (y + dy) % height)
+                          for dx, dy in STRAIGHT_OFFSETS[mask & 15]]
 
-        # check for connections to other grids
-        if node.connections:
-            neighbors.extend(node.connections)
+                # check for connections to other grids
+                if node.connections:
+                    result.extend(node.connections)
 
-        if diagonal_movement == DiagonalMovement.never:
-            return neighbors
+                # ↖ ↗ ↘ ↙
+                if mask > 15:
+                    result += [node_at((x + dx) % width, (y + dy) % height)
+                               for dx, dy in DIAGONAL_OFFSETS[mask >> 4]]
+                return result
+
+        self._neighbor_functions[diagonal_movement] = neighbors
+        return neighbors
+
+    def _wrapped_walkable(self, x, y) -> bool:
+        """
+        check if the tile is walkable, positions outside of the grid wrap
+        around if the border is passable
+        """
+        if self.passable_left_right_border:
+            x %= self.width
+        if self.passable_up_down_border:
+            y %= self.height
+        return self.walkable(x, y)
+
+    def _cell_mask(self, x, y, diagonal_movement) -> int:
+        """
+        calculate the direction mask of a single cell (see neighbor_table)
+        """
+        walkable = self._wrapped_walkable
+        north = walkable(x, y - 1)
+        east = walkable(x + 1, y)
+        south = walkable(x, y + 1)
+        west = walkable(x - 1, y)
+        mask = north * NORTH | east * EAST | south * SOUTH | west * WEST
 
         if diagonal_movement == DiagonalMovement.only_when_no_obstacle:
             nw = north and west
@@ -184,60 +517,381 @@ class Grid:
             sw = south or west
         elif diagonal_movement == DiagonalMovement.always:
             nw = ne = se = sw = True
+        else:
+            return mask
 
-        # ↖
-        if nw:
-            if x == 0 and self.passable_left_right_border:
-                nw_x = self.width - 1
-            else:
-                nw_x = x - 1
-            if y == 0 and self.passable_up_down_border:
-                nw_y = self.height - 1
-            else:
-                nw_y = y - 1
-            if self.walkable(nw_x, nw_y):
-                neighbors.append(self.nodes[nw_y][nw_x])
-
-        # ↗
-        if ne:
-            if x == self.width - 1 and self.passable_left_right_border:
-                ne_x = 0
-            else:
-                ne_x = x + 1
-            if y == 0 and self.passable_up_down_border:
-                ne_y = self.height - 1
-            else:
-                ne_y = y - 1
-            if self.walkable(ne_x, ne_y):
-                neighbors.append(self.nodes[ne_y][ne_x])
-
-        # ↘
-        if se:
-            if x == self.width - 1 and self.passable_left_right_border:
-                se_x = 0
-            else:
-                se_x = x + 1
-            if y == self.height - 1 and self.passable_up_down_border:
-                se_y = 0
-            else:
-                se_y = y + 1
-            if self.walkable(se_x, se_y):
-                neighbors.append(self.nodes[se_y][se_x])
-
-        # ↙
-        if sw:
-            if x == 0 and self.passable_left_right_border:
-                sw_x = self.width - 1
-            else:
-                sw_x = x - 1
-            if y == self.height - 1 and self.passable_up_down_border:
-                sw_y = 0
+        if nw and walkable(x - 1, y - 1):
+            mask |= NORTH_WEST
+        if ne and walkable(x + 1, y - 1):
+            mask |= NORTH_EAST
+        if se and walkable(x + 1, y + 1):
+            mask |= SOUTH_EAST
+        if sw and walkable(x - 1, y + 1):
+            mask |= SOUTH_WEST
+        return mask
+
+    def _walkable_mask(self):
+        """
+        walkability of all cells as 2D boolean numpy array
+        """
+        return np.array(
+            [[node.walkable for node in row] for row in self.nodes],
+            dtype=bool).reshape(self.height, self.width)
+
+    def _weight_matrix(self):
+        """
+        weights of all cells as 2D float64 numpy array
+        """
+        return np.array(
+            [[node.weight for node in row] for row in self.nodes],
+            dtype=np.float64).reshape(self.height, self.width)
+
+    def _read_cells(self, indices):
+        """
+        walkability and weights of the cells as numpy arrays
+
+        :param indices: numpy array of cell indices (y * width + x)
+        """
+        nodes = [self.nodes[index // self.width][index % self.width]
+                 for index in indices.tolist()]
+        return (np.array([node.walkable for node in nodes], dtype=bool),
+                np.array([node.weight for node in nodes], dtype=np.float64))
+
+    def _write_cells(self, indices, walkable, weights):
+        """
+        set walkability and weights of the cells without updating anything
+        else (see update_mask)
+        """
+        width = self.width
+        for index, cell_walkable, weight in zip(
+                indices.tolist(), walkable.tolist(), weights.tolist()):
+            node = self.nodes[index // width][index % width]
+            node.walkable = cell_walkable
+            node.weight = weight
+
+    def _numpy_neighbor_table(self, diagonal_movement) -> bytearray:
+        walkable = self._walkable_mask()
+
+        def shifted(dx, dy):
+            # value of the cell at x + dx, y + dy for every cell
+            mask = walkable
+            for shift, axis, passable in (
+                    (dx, 1, self.passable_left_right_border),
+                    (dy, 0, self.passable_up_down_border)):
+                if not shift:
+                    continue
+                if passable:
+                    mask = np.roll(mask, -shift, axis=axis)
+                    continue
+                moved = np.zeros_like(mask)
+                target = [slice(None), slice(None)]
+                source = [slice(None), slice(None)]
+                if shift > 0:
+                    target[axis] = slice(None, -shift)
+                    source[axis] = slice(shift, None)
+                else:
+                    target[axis] = slice(-shift, None)
+                    source[axis] = slice(None, shift)
+                moved[tuple(target)] = mask[tuple(source)]
+                mask = moved
+            return mask
+
+        north = shifted(0, -1)
+        east = shifted(1, 0)
+        south = shifted(0, 1)
+        west = shifted(-1, 0)
+        table = north * NORTH | east * EAST | south * SOUTH | west * WEST
+
+        if diagonal_movement == DiagonalMovement.only_when_no_obstacle:
+            diagonals = (north & west, north & east,
+                         south & east, south & west)
+        elif diagonal_movement == DiagonalMovement.if_at_most_one_obstacle:
+            diagonals = (north | west, north | east,
+                         south | east, south | west)
+        elif diagonal_movement == DiagonalMovement.always:
+            diagonals = (True, True, True, True)
+        else:
+            diagonals = None
+
+        if diagonals:
+            for allowed, (bit, dx, dy) in zip(diagonals, DIAGONALS):
+                table |= (allowed & shifted(dx, dy)) * bit
+        return bytearray(table.astype(np.uint8).tobytes())
+
+    def _build_neighbor_table(self, diagonal_movement) -> bytearray:
+        """
+        create the neighbor table for a diagonal movement, it stores an 8-bit
+        mask of walkable directions for every cell (indexed by
+        y * width + x), the passable borders are already taken into account.
+        """
+        if USE_NUMPY and self.width > 0 and self.height > 0:
+            table = self._numpy_neighbor_table(diagonal_movement)
+        else:
+            table = bytearray(
+                self._cell_mask(x, y, diagonal_movement)
+                for y in range(self.height) for x in range(self.width))
+        self._neighbor_tables[diagonal_movement] = table
+        return table
+
+    def invalidate_neighbor_tables(self):
+        """
+        drop all neighbor tables and connected components, they get rebuilt
+        when they are needed again. Only needed if walkable is changed on the
+        nodes directly instead of using update_node or if nodes get connected
+        (see GridNode.connect) after a search.
+        """
+        self._neighbor_tables.clear()
+        self._neighbor_functions.clear()
+        self._components.clear()
+        self._component_cells.clear()
+        self.notify(None)
+
+    def _cell_connections(self):
+        """
+        index and connected nodes of all cells that are connected to other
+        nodes (see GridNode.connect)
+        """
+        return [(node.y * self.width + node.x, node.connections)
+                for row in self.nodes for node in row if node.connections]
+
+    def _owns(self, node) -> bool:
+        return self.inside(node.x, node.y) and \
+            self.nodes[node.y][node.x] is node
+
+    def components(self, diagonal_movement=DiagonalMovement.never):
+        """
+        label of the connected component of every cell (indexed by
+        y * width + x, -1 for blocked cells), a cell can only reach cells
+        with the same label. Created on demand and kept up to date by
+        update_node. None if cells are connected to other grids, then the
+        grid alone can't tell which cells are reachable.
+        """
+        if diagonal_movement not in self._components:
+            self._component_cells.pop(diagonal_movement, None)
+            self._components[diagonal_movement] = self._build_components(
+                diagonal_movement)
+        return self._components[diagonal_movement]
+
+    def connected(self, node_a, node_b,
+                  diagonal_movement=DiagonalMovement.never) -> bool:
+        """
+        check if there might be a path from node_a to node_b, False if they
+        are in different connected components (see components)
+        """
+        labels = self.components(diagonal_movement)
+        if labels is None:
+            return True
+        label_a = labels[node_a.y * self.width + node_a.x]
+        label_b = labels[node_b.y * self.width + node_b.x]
+        if label_a < 0:
+            # the finders still step from a blocked start to its neighbors
+            return label_b >= 0 or (node_a.x, node_a.y) == (
+                node_b.x, node_b.y)
+        return label_a == label_b
+
+    def _build_components(self, diagonal_movement):
+        table = self._neighbor_tables.get(diagonal_movement)
+        if table is None:
+            table = self._build_neighbor_table(diagonal_movement)
+        width, height = self.width, self.height
+        connections = self._cell_connections()
+        if any(not self._owns(other)
+               for _, nodes in connections for other in nodes):
+            return None
+        # connections don't follow the neighbor table, if there are any the
+        # labels are created again when a cell gets blocked, a cell that gets
+        # walkable is merged with the cells it is connected with
+        self._connected_cells = collections.defaultdict(list)
+        for index, nodes in connections:
+            for other in nodes:
+                other_index = other.y * width + other.x
+                self._connected_cells[index].append(other_index)
+                self._connected_cells[other_index].append(index)
+
+        if USE_NUMPY and width and height:
+            cells = np.flatnonzero(self._walkable_mask())
+            labels = np.full(width * height, -1, dtype=np.int64)
+            labels[cells] = label_cells(
+                np.frombuffer(table, dtype=np.uint8), cells,
+                width, height)[cells]
+        else:
+            labels = [-1] * (width * height)
+            for index in range(width * height):
+                if labels[index] >= 0 or \
+                        not self.walkable(index % width, index // width):
+                    continue
+                labels[index] = index
+                queue = [index]
+                while queue:
+                    cell = queue.pop()
+                    x, y = cell % width, cell // width
+                    mask = table[cell]
+                    for dx, dy in STRAIGHT_OFFSETS[mask & 15] + \
+                            DIAGONAL_OFFSETS[mask >> 4]:
+                        neighbor = (y + dy) % height * width + (x + dx) % width
+                        if labels[neighbor] < 0:
+                            labels[neighbor] = index
+                            queue.append(neighbor)
+
+        if connections and isinstance(labels, np.ndarray if USE_NUMPY else ()):
+            cells = self._component_cells[diagonal_movement] = \
+                _ComponentCells(labels)
+            merge = cells.merge
+        else:
+            def merge(index_a, index_b):
+                _merge_labels(labels, index_a, index_b)
+        for index, nodes in connections:
+            for other in nodes:
+                merge(index, other.y * width + other.x)
+        return labels
+
+    def _new_labels(self, count):
+        """
+        reserve count labels that were never used for a component before
+        (bigger than all cell indices)
+        """
+        first = self.width * self.height + self._label_count
+        self._label_count += count
+        return first
+
+    def _update_components(self, x, y):
+        """
+        update the connected components after the cell (x, y) got walkable
+        (the components around it are merged) or blocked (see
+        _split_component)
+        """
+        index = y * self.width + x
+        walkable = self.walkable(x, y)
+        for diagonal_movement, labels in list(self._components.items()):
+            if labels is None:
+                continue
+            if not isinstance(labels, np.ndarray if USE_NUMPY else ()) or (
+                    not walkable and self._connected_cells):
+                # created again when needed
+                del self._components[diagonal_movement]
+                self._component_cells.pop(diagonal_movement, None)
+                continue
+            cells = self._component_cells.get(diagonal_movement)
+            if cells is None:
+                cells = self._component_cells[diagonal_movement] = \
+                    _ComponentCells(labels)
+            table = self._neighbor_tables[diagonal_movement]
+            neighbors = [
+                (y + dy) % self.height * self.width + (x + dx) % self.width
+                for dx, dy in STRAIGHT_OFFSETS[table[index] & 15] +
+                DIAGONAL_OFFSETS[table[index] >> 4]]
+            if walkable:
+                cells.add(self._new_labels(1), np.array([index]))
+                for neighbor in neighbors + self._connected_cells.get(
+                        index, []):
+                    cells.merge(index, neighbor)
             else:
-                sw_y = y + 1
-            if self.walkable(sw_x, sw_y):
-                neighbors.append(self.nodes[sw_y][sw_x])
+                label = int(labels[index])
+                cells.remove(index)
+                self._split_component(cells, table, label, neighbors)
 
-        return neighbors
+    def _split_component(self, component_cells, table, label, neighbors):
+        """
+        the component with the label lost a cell, search from its former
+        neighbors at the same time to find parts that are not connected
+        anymore. Searches that meet are joined, a search that runs out of
+        cells found a separated part and gives it a new label. If the
+        searches get too big the whole component is labeled again.
+        """
+        labels = component_cells.labels
+        width, height = self.width, self.height
+        starts = dict.fromkeys(
+            cell for cell in neighbors if labels[cell] == label)
+        # search -> (cells, queue) and the search that found a cell
+        searches = {cell: ({cell}, collections.deque([cell]))
+                    for cell in starts}
+        owner = {cell: cell for cell in starts}
+        while len(searches) > 1:
+            if len(owner) > COMPONENT_SEARCH_LIMIT:
+                cells = component_cells.cells(label)
+                roots = label_cells(np.frombuffer(table, dtype=np.uint8),
+                                    cells, width, height)[cells]
+                roots, parts = np.unique(roots, return_inverse=True)
+                first = self._new_labels(len(roots))
+                order = np.argsort(parts, kind='stable')
+                ends = np.cumsum(np.bincount(parts)).tolist()
+                for part, (start, end) in enumerate(zip([0] + ends, ends)):
+                    component_cells.add(
+                        first + part, cells[order[start:end]], label)
+                return
+            for search in list(searches):
+                if search not in searches:
+                    # joined with another search
+                    continue
+                cells, queue = searches[search]
+                if not queue:
+                    component_cells.add(
+                        self._new_labels(1), np.fromiter(cells, np.int64),
+                        label)
+                    del searches[search]
+                    continue
+                cell = queue.popleft()
+                x, y = cell % width, cell // width
+                mask = table[cell]
+                for dx, dy in STRAIGHT_OFFSETS[mask & 15] + \
+                        DIAGONAL_OFFSETS[mask >> 4]:
+                    neighbor = (y + dy) % height * width + (x + dx) % width
+                    other = owner.setdefault(neighbor, search)
+                    if other == search:
+                        if neighbor not in cells:
+                            cells.add(neighbor)
+                            queue.append(neighbor)
+                    else:
+                        other_cells, other_queue = searches.pop(other)
+                        for other_cell in other_cells:
+                            owner[other_cell] = search
+                        cells |= other_cells
+                        queue.extend(other_queue)
+
+    def subscribe(self, callback):
+        """
+        call the callback when cells of the grid change (e.g. by
+        update_node), so data that depends on the grid can be updated.
+
+        :param callback: function that gets the grid and a list of changed
+            cells as (x, y) tuples, or None if the whole grid might have
+            changed
+        """
+        self._listeners.append(callback)
+
+    def unsubscribe(self, callback):
+        self._listeners.remove(callback)
+
+    def notify(self, cells):
+        """
+        inform all subscribers that cells of the grid changed
+
+        :param cells: list of (x, y) tuples or None for the whole grid
+        """
+        self.version += 1
+        for callback in list(self._listeners):
+            callback(self, cells)
+
+    def _update_neighbor_tables(self, x, y):
+        """
+        update the neighbor tables for the cell and the cells around it
+        """
+        if not self._neighbor_tables:
+            return
+        cells = set()
+        for dy in (-1, 0, 1):
+            for dx in (-1, 0, 1):
+                nx, ny = x + dx, y + dy
+                if self.passable_left_right_border:
+                    nx %= self.width
+                if self.passable_up_down_border:
+                    ny %= self.height
+                if self.inside(nx, ny):
+                    cells.add((nx, ny))
+        for diagonal_movement, table in self._neighbor_tables.items():
+            for nx, ny in cells:
+                table[ny * self.width + nx] = self._cell_mask(
+                    nx, ny, diagonal_movement)
 
     def cleanup(self):
         for y_nodes in self.nodes:
@@ -275,7 +929,7 @@ class Grid:
         # create the output string
         data = ''
         if border:
-            data = f'+{"-" * len(self.nodes[0])}+'
+            data = f'+{"-" * self.width}+'
         for y, _ in enumerate(self.nodes):
             line = ''
             for x, _ in enumerate(self.nodes[y]):
@@ -303,7 +957,7 @@ class Grid:
                 data += '\n'
             data += line
         if border:
-            data += f'\n+{"-" * len(self.nodes[0])}+'
+            data += f'\n+{"-" * self.width}+'
         return data
 
     def __repr__(self):
@@ -317,6 +971,51 @@ class Grid:
     def min_weight(self) -> float:
         return self._min_weight
 
+    def _count_weights(self):
+        """
+        number of walkable cells for every weight
+        """
+        if USE_NUMPY and self.width and self.height:
+            weights, counts = np.unique(
+                self._weight_matrix()[self._walkable_mask()],
+                return_counts=True)
+            return collections.Counter(
+                dict(zip(weights.tolist(), counts.tolist())))
+        return collections.Counter(
+            node.weight for row in self.nodes for node in row
+            if node.walkable)
+
+    def _change_weights(self, removed, added):
+        """
+        keep the minimum weight exact after walkable cells were changed
+
+        :param removed: Counter of the weights of the walkable cells before
+            the change
+        :param added: Counter of the weights of the walkable cells after the
+            change
+        """
+        inf = float("inf")
+        min_weight = self._min_weight
+        counts = self._weight_counts
+        if counts is None:
+            if not removed.get(min_weight):
+                self._min_weight = min(min_weight, min(added, default=inf))
+                return
+            # the minimum might get bigger, count the weights of all cells
+            # (they are already changed)
+            counts = self._weight_counts = self._count_weights()
+            self._min_weight = min(counts, default=inf)
+            return
+        counts.subtract(removed)
+        counts.update(added)
+        for weight in removed:
+            if counts[weight] <= 0:
+                del counts[weight]
+        if min_weight in counts:
+            self._min_weight = min(min_weight, min(added, default=inf))
+        else:
+            self._min_weight = min(counts, default=inf)
+
     def update_node(self, x, y, *, weight=None, walkable=None):
         node = self.node(x, y)
 
@@ -326,11 +1025,132 @@ class Grid:
         if walkable is None:
             walkable = node.walkable
 
-        if walkable:
-            if weight <= 0:
-                raise ValueError("Weight of a walkable node must be positive")
-            if weight < self._min_weight:
-                self._min_weight = weight
+        if walkable and weight <= 0:
+            raise ValueError("Weight of a walkable node must be positive")
 
+        if weight == node.weight and walkable == node.walkable:
+            return
+        removed = collections.Counter([node.weight] if node.walkable else [])
         node.weight = weight
-        node.walkable = walkable
+        if walkable != node.walkable:
+            node.walkable = walkable
+            self._update_neighbor_tables(x, y)
+            self._update_components(x, y)
+        self._change_weights(
+            removed, collections.Counter([weight] if walkable else []))
+        self.notify([(x, y)])
+
+    def update_mask(self, mask, *, weight=None, walkable=None):
+        """
+        change weight and/or walkability of all cells where the mask is True
+        in one call, the subscribers are notified once for all changed cells
+        (see subscribe). Needs numpy.
+
+        :param mask: 2D boolean array (height, width) of the cells to change
+        :param weight: new weight, a number or a 2D array (height, width)
+            (only the values of the masked cells are used)
+        :param walkable: new walkability, a bool or a 2D boolean array
+            (height, width)
+        """
+        if not USE_NUMPY:
+            raise ImportError('numpy is required for bulk updates')
+        mask = np.asarray(mask, dtype=bool)
+        if mask.shape != (self.height, self.width):
+            raise ValueError(
+                f'mask needs the shape {(self.height, self.width)}, '
+                f'not {mask.shape}')
+        indices = np.flatnonzero(mask)
+        old_walkable, old_weights = self._read_cells(indices)
+        new_walkable = _masked_values(walkable, mask, old_walkable, bool)
+        new_weights = _masked_values(weight, mask, old_weights, np.float64)
+        if np.any(new_walkable & (new_weights <= 0)):
+            raise ValueError("Weight of a walkable node must be positive")
+
+        changed = (new_walkable != old_walkable) | (new_weights != old_weights)
+        if not changed.any():
+            return
+        indices = indices[changed]
+        old_walkable, old_weights = old_walkable[changed], old_weights[changed]
+        new_walkable, new_weights = new_walkable[changed], new_weights[changed]
+
+        switched = new_walkable != old_walkable
+        if switched.sum() > BULK_UPDATE_CELLS:
+            self._write_cells(indices, new_walkable, new_weights)
+            for diagonal_movement, table in self._neighbor_tables.items():
+                table[:] = self._numpy_neighbor_table(diagonal_movement)
+            self._components.clear()
+            self._component_cells.clear()
+        else:
+            # weights first, then cell by cell to keep the neighbor tables
+            # and connected components up to date
+            self._write_cells(indices, old_walkable, new_weights)
+            for index in indices[switched].tolist():
+                x, y = index % self.width, index // self.width
+                self.node(x, y).walkable = not self.walkable(x, y)
+                self._update_neighbor_tables(x, y)
+                self._update_components(x, y)
+        self._change_weights(_count_values(old_weights[old_walkable]),
+                             _count_values(new_weights[new_walkable]))
+        self.notify(list(zip((indices % self.width).tolist(),
+                             (indices // self.width).tolist())))
+
+    def update_region(self, region, *, weight=None, walkable=None):
+        """
+        change weight and/or walkability of a region of cells in one call
+        (see update_mask)
+
+        :param region: index of the cells in numpy order (y, x), e.g.
+            numpy.s_[2:5, 10:20] for the rows 2 to 4 and the columns 10 to
+            19
+        :param weight: new weight, a number or an array with the shape of the
+            region
+        :param walkable: new walkability, a bool or a boolean array with the
+            shape of the region
+        """
+        if not USE_NUMPY:
+            raise ImportError('numpy is required for bulk updates')
+        shape = (self.height, self.width)
+        mask = np.zeros(shape, dtype=bool)
+        mask[region] = True
+        if np.ndim(weight):
+            weights = np.zeros(shape, dtype=np.float64)
+            weights[region] = weight
+            weight = weights
+        if np.ndim(walkable):
+            walkables = np.zeros(shape, dtype=bool)
+            walkables[region] = walkable
+            walkable = walkables
+        self.update_mask(mask, weight=weight, walkable=walkable)
+
+
+def _merge_labels(labels, index_a, index_b):
+    """
+    merge the connected components of two cells of a labels list (see
+    Grid.components, numpy labels are merged by _ComponentCells)
+    """
+    label_a = labels[index_a]
+    label_b = labels[index_b]
+    if label_a < 0 or label_b < 0 or label_a == label_b:
+        return
+    keep, drop = min(label_a, label_b), max(label_a, label_b)
+    for index, label in enumerate(labels):
+        if label == drop:
+            labels[index] = keep
+
+
+def _masked_values(value, mask, default, dtype):
+    """
+    values of the masked cells for update_mask: default if value is None,
+    the masked values of a 2D array or a single value for all cells
+    """
+    if value is None:
+        return default
+    value = np.asarray(value, dtype=dtype)
+    if value.ndim == 2:
+        return value[mask]
+    return np.full(len(default), value, dtype=dtype)
+
+
+def _count_values(values):
+    values, counts = np.unique(values, return_counts=True)
+    return collections.Counter(dict(zip(values.tolist(), counts.tolist())))
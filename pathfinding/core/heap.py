@@ -1,38 +1,96 @@
-"""Simple heap with ordering and removal."""
+"""Open lists (priority queues) for the finders.
+
+All open lists share the same interface: they are created with the start
+node and the grid, nodes get added with push_node and the node with the
+lowest f value is returned by pop_node. If the f value of a node in the
+open list changes, update_node moves it to its new position. Nodes with
+the same f value are returned in the order given by the tie-breaking policy
+(see TieBreaking, by default in the order they were pushed), so the finders
+expand the nodes in the same order with every open list.
+"""
 import heapq
 from .graph import Graph
 from .grid import Grid
 from .world import World
 
 
+class TieBreaking:
+    """
+    order of the nodes with the same f value in an open list
+    """
+    fifo = 1  # first pushed, first popped
+    lifo = 2  # last pushed, first popped
+    high_g = 3  # highest g first, then first pushed
+    low_h = 4  # lowest h first, then first pushed
+
+
+def tie_breaking_function(tie_breaking):
+    """
+    returns a function that calculates the value nodes with the same f value
+    are ordered by (before the push order) or None if only the push order
+    is used (see TieBreaking)
+    """
+    if tie_breaking == TieBreaking.high_g:
+        return lambda node: -node.g
+    elif tie_breaking == TieBreaking.low_h:
+        return lambda node: node.h
+    elif tie_breaking in (TieBreaking.fifo, TieBreaking.lifo):
+        return None
+    raise ValueError(f'unknown tie-breaking policy {tie_breaking}')
+
+
+def node_key_function(grid):
+    """
+    returns a function that creates a unique, hashable key for every node
+    of the given grid (this is only checked once per open list).
+    """
+    if isinstance(grid, Graph):
+        return lambda node: node.node_id
+    elif isinstance(grid, Grid):
+        return lambda node: (node.x, node.y)
+    elif isinstance(grid, World):
+        return lambda node: (node.x, node.y, node.grid_id)
+    else:
+        assert False, "unsupported grid type grid=%s" % grid
+
+
+def node_lookup_function(grid):
+    """
+    returns a function that gets the node of the given grid by its key
+    (see node_key_function).
+    """
+    if isinstance(grid, Graph):
+        return grid.node
+    elif isinstance(grid, Grid):
+        return lambda key: grid.node(*key)
+    elif isinstance(grid, World):
+        return lambda key: grid.grids[key[2]].node(key[0], key[1])
+    else:
+        assert False, "unsupported grid type grid=%s" % grid
+
+
 class SimpleHeap:
     """Simple wrapper around open_list that keeps track of order and removed
     nodes automatically."""
 
-    def __init__(self, node, grid):
+    def __init__(self, node, grid, tie_breaking=TieBreaking.fifo):
         self.grid = grid
-        self.open_list = [self._get_node_tuple(node, 0)]
+        self.tie = tie_breaking_function(tie_breaking)
+        # -1 to pop the last pushed node first
+        self.order_step = -1 if tie_breaking == TieBreaking.lifo else 1
+        # the type of the grid is only checked once, not for every node
+        self._get_node_id = node_key_function(grid)
+        self._get_node = node_lookup_function(grid)
+        node_tuple = self._get_node_tuple(node, 0)
+        self.open_list = [node_tuple]
         self.removed_node_tuples = set()
-        self.heap_order = {}
+        # node id -> the tuple it was pushed with
+        self.heap_order = {node_tuple[3]: node_tuple}
         self.number_pushed = 0
 
     def _get_node_tuple(self, node, heap_order):
-        if isinstance(self.grid, Graph):
-            return (node.f, heap_order, node.node_id)
-        elif isinstance(self.grid, Grid):
-            return (node.f, heap_order, node.x, node.y)
-        elif isinstance(self.grid, World):
-            return (node.f, heap_order, node.x, node.y, node.grid_id)
-        else:
-            assert False, "unsupported heap node node=%s" % node
-
-    def _get_node_id(self, node):
-        if isinstance(self.grid, Graph):
-            return node.node_id
-        elif isinstance(self.grid, Grid):
-            return (node.x, node.y)
-        elif isinstance(self.grid, World):
-            return (node.x, node.y, node.grid_id)
+        tie = self.tie(node) if self.tie else 0
+        return (node.f, tie, heap_order, self._get_node_id(node))
 
     def pop_node(self):
         """
@@ -47,15 +105,7 @@ class SimpleHeap:
         while node_tuple in self.removed_node_tuples:
             node_tuple = heapq.heappop(self.open_list)
 
-        if isinstance(self.grid, Graph):
-            node = self.grid.node(node_tuple[2])
-        elif isinstance(self.grid, Grid):
-            node = self.grid.node(node_tuple[2], node_tuple[3])
-        elif isinstance(self.grid, World):
-            node = self.grid.grids[
-                node_tuple[4]].node(node_tuple[2], node_tuple[3])
-
-        return node
+        return self._get_node(node_tuple[3])
 
     def push_node(self, node):
         """
@@ -63,11 +113,10 @@ class SimpleHeap:
 
         :param node: The node to push.
         """
-        self.number_pushed = self.number_pushed + 1
+        self.number_pushed = self.number_pushed + self.order_step
         node_tuple = self._get_node_tuple(node, self.number_pushed)
-        node_id = self._get_node_id(node)
 
-        self.heap_order[node_id] = self.number_pushed
+        self.heap_order[node_tuple[3]] = node_tuple
 
         heapq.heappush(self.open_list, node_tuple)
 
@@ -82,10 +131,382 @@ class SimpleHeap:
         :param f: The old f value of the node.
         """
         node_id = self._get_node_id(node)
-        heap_order = self.heap_order[node_id]
-        node_tuple = self._get_node_tuple(node, heap_order)
-        self.removed_node_tuples.add(node_tuple)
+        self.removed_node_tuples.add(self.heap_order[node_id])
+
+    def update_node(self, node, old_f):
+        """
+        Move the node to its new position after its f value changed.
+
+        :param node: The node to update.
+        :param old_f: The f value the node was pushed with.
+        """
+        self.remove_node(node, old_f)
+        self.push_node(node)
 
     def __len__(self):
         """Returns the length of the open_list."""
         return len(self.open_list)
+
+
+class IndexedHeap:
+    """
+    Binary heap that knows the position of every node in it, so the f value
+    of a node can be changed in place (decrease-key) and nodes can be
+    removed without leaving stale entries behind.
+    """
+
+    def __init__(self, node, grid, tie_breaking=TieBreaking.fifo):
+        self.grid = grid
+        self.node_key = node_key_function(grid)
+        self.tie = tie_breaking_function(tie_breaking)
+        # -1 to pop the last pushed node first
+        self.order_step = -1 if tie_breaking == TieBreaking.lifo else 1
+        # entries are lists of [f, tie, heap order, node key, node], the
+        # heap order is unique, so nodes and keys are never compared
+        self.heap = []
+        # node key -> position of its entry in self.heap
+        self.positions = {}
+        self.number_pushed = 0
+        self.push_node(node)
+
+    def _sift_up(self, pos):
+        heap = self.heap
+        positions = self.positions
+        entry = heap[pos]
+        while pos > 0:
+            parent_pos = (pos - 1) >> 1
+            parent = heap[parent_pos]
+            if entry < parent:
+                heap[pos] = parent
+                positions[parent[3]] = pos
+                pos = parent_pos
+            else:
+                break
+        heap[pos] = entry
+        positions[entry[3]] = pos
+
+    def _sift_down(self, pos):
+        heap = self.heap
+        positions = self.positions
+        size = len(heap)
+        entry = heap[pos]
+        child_pos = 2 * pos + 1
+        while child_pos < size:
+            right_pos = child_pos + 1
+            if right_pos < size and heap[right_pos] < heap[child_pos]:
+                child_pos = right_pos
+            child = heap[child_pos]
+            if child < entry:
+                heap[pos] = child
+                positions[child[3]] = pos
+                pos = child_pos
+                child_pos = 2 * pos + 1
+            else:
+                break
+        heap[pos] = entry
+        positions[entry[3]] = pos
+
+    def push_node(self, node):
+        """
+        Push node into heap (or update it, if it is already part of it).
+
+        :param node: The node to push.
+        """
+        self.number_pushed += self.order_step
+        tie = self.tie(node) if self.tie else 0
+        key = self.node_key(node)
+        pos = self.positions.get(key)
+        if pos is not None:
+            entry = self.heap[pos]
+            entry[0] = node.f
+            entry[1] = tie
+            entry[2] = self.number_pushed
+            self._sift_down(pos)
+            self._sift_up(self.positions[key])
+            return
+        self.heap.append([node.f, tie, self.number_pushed, key, node])
+        self._sift_up(len(self.heap) - 1)
+
+    def pop_node(self):
+        """
+        Pops node off the heap. i.e. returns the one with the lowest f.
+        """
+        heap = self.heap
+        last = heap.pop()
+        if heap:
+            entry = heap[0]
+            heap[0] = last
+            self._sift_down(0)
+        else:
+            entry = last
+        del self.positions[entry[3]]
+        return entry[4]
+
+    def remove_node(self, node, f):
+        """
+        Remove the node from the heap.
+
+        :param node: The node to remove.
+        :param f: The old f value of the node (not needed here).
+        """
+        pos = self.positions.pop(self.node_key(node))
+        heap = self.heap
+        last = heap.pop()
+        if pos < len(heap):
+            heap[pos] = last
+            self._sift_down(pos)
+            self._sift_up(self.positions[last[3]])
+
+    def update_node(self, node, old_f):
+        """
+        Move the node to its new position after its f value changed.
+
+        :param node: The node to update.
+        :param old_f: The f value the node was pushed with (not needed here).
+        """
+        self.push_node(node)
+
+    def __len__(self):
+        """Returns the length of the open_list."""
+        return len(self.heap)
+
+
+class _PairingNode:
+    __slots__ = ('f', 'tie', 'order', 'node', 'child', 'sibling', 'prev')
+
+    def __init__(self, f, tie, order, node):
+        self.f = f
+        self.tie = tie
+        self.order = order
+        self.node = node
+        # first child, next sibling and previous sibling (or parent if this
+        # is the first child)
+        self.child = None
+        self.sibling = None
+        self.prev = None
+
+    def __lt__(self, other):
+        return (self.f, self.tie, self.order) < \
+            (other.f, other.tie, other.order)
+
+
+class PairingHeap:
+    """
+    Pairing heap, a self-adjusting heap with cheap push and decrease-key
+    (both O(1)), popping the smallest node is O(log n) amortized.
+    """
+
+    def __init__(self, node, grid, tie_breaking=TieBreaking.fifo):
+        self.grid = grid
+        self.node_key = node_key_function(grid)
+        self.tie = tie_breaking_function(tie_breaking)
+        # -1 to pop the last pushed node first
+        self.order_step = -1 if tie_breaking == TieBreaking.lifo else 1
+        self.root = None
+        # node key -> _PairingNode
+        self.entries = {}
+        self.number_pushed = 0
+        self.push_node(node)
+
+    @staticmethod
+    def _meld(a, b):
+        """link two heaps, the one with the bigger root becomes a child."""
+        if b < a:
+            a, b = b, a
+        b.prev = a
+        b.sibling = a.child
+        if a.child is not None:
+            a.child.prev = b
+        a.child = b
+        a.sibling = None
+        a.prev = None
+        return a
+
+    def _cut(self, entry):
+        """detach the subtree of entry from its parent."""
+        if entry.prev.child is entry:
+            entry.prev.child = entry.sibling
+        else:
+            entry.prev.sibling = entry.sibling
+        if entry.sibling is not None:
+            entry.sibling.prev = entry.prev
+        entry.prev = None
+        entry.sibling = None
+
+    def _merge_pairs(self, first):
+        """two-pass merge of a list of siblings."""
+        pairs = []
+        while first is not None:
+            a = first
+            b = a.sibling
+            if b is None:
+                a.prev = None
+                pairs.append(a)
+                break
+            first = b.sibling
+            a.sibling = b.sibling = a.prev = b.prev = None
+            pairs.append(self._meld(a, b))
+        if not pairs:
+            return None
+        root = pairs.pop()
+        while pairs:
+            root = self._meld(pairs.pop(), root)
+        return root
+
+    def push_node(self, node):
+        """
+        Push node into heap (or update it, if it is already part of it).
+
+        :param node: The node to push.
+        """
+        self.number_pushed += self.order_step
+        key = self.node_key(node)
+        if key in self.entries:
+            self.remove_node(node, None)
+        entry = _PairingNode(
+            node.f, self.tie(node) if self.tie else 0, self.number_pushed,
+            node)
+        self.entries[key] = entry
+        self.root = entry if self.root is None else \
+            self._meld(self.root, entry)
+
+    def pop_node(self):
+        """
+        Pops node off the heap. i.e. returns the one with the lowest f.
+        """
+        entry = self.root
+        del self.entries[self.node_key(entry.node)]
+        self.root = self._merge_pairs(entry.child)
+        return entry.node
+
+    def remove_node(self, node, f):
+        """
+        Remove the node from the heap.
+
+        :param node: The node to remove.
+        :param f: The old f value of the node (not needed here).
+        """
+        entry = self.entries.pop(self.node_key(node))
+        if entry is self.root:
+            self.root = self._merge_pairs(entry.child)
+            return
+        self._cut(entry)
+        subtree = self._merge_pairs(entry.child)
+        if subtree is not None:
+            self.root = self._meld(self.root, subtree)
+
+    def update_node(self, node, old_f):
+        """
+        Move the node to its new position after its f value changed.
+
+        :param node: The node to update.
+        :param old_f: The f value the node was pushed with (not needed here).
+        """
+        entry = self.entries[self.node_key(node)]
+        tie = self.tie(node) if self.tie else 0
+        if (node.f, tie) > (entry.f, entry.tie):
+            # not a decrease-key, remove and insert again
+            self.push_node(node)
+            return
+        self.number_pushed += self.order_step
+        entry.f = node.f
+        entry.tie = tie
+        entry.order = self.number_pushed
+        if entry is not self.root:
+            # decrease-key: cut the subtree and meld it with the root
+            self._cut(entry)
+            self.root = self._meld(self.root, entry)
+
+    def __len__(self):
+        """Returns the length of the open_list."""
+        return len(self.entries)
+
+
+class BucketQueue:
+    """
+    Bucket queue that keeps one bucket for every f value. Pushing, updating
+    and removing a node is O(1), popping the next node only needs to look
+    at the smallest f value. This works best if there are only a few
+    different f values, e.g. on grids with integer weights without diagonal
+    movement (or for breadth-first search where all f values are 0).
+    With TieBreaking.high_g or low_h there is a bucket for every f and tie
+    value.
+    """
+
+    def __init__(self, node, grid, tie_breaking=TieBreaking.fifo):
+        self.grid = grid
+        self.node_key = node_key_function(grid)
+        self.tie = tie_breaking_function(tie_breaking)
+        self.lifo = tie_breaking == TieBreaking.lifo
+        # f value (or f and tie value) -> dict of node key -> node (in the
+        # order they were added)
+        self.buckets = {}
+        # heap of the keys of all buckets (might contain keys of buckets
+        # that are already empty, they are skipped by pop_node)
+        self.keys = []
+        # node key -> key of its bucket
+        self.bucket_of = {}
+        self.push_node(node)
+
+    def push_node(self, node):
+        """
+        Push node into the queue (or update it, if it is already part of it).
+
+        :param node: The node to push.
+        """
+        key = self.node_key(node)
+        if key in self.bucket_of:
+            self.remove_node(node, None)
+        f = (node.f, self.tie(node)) if self.tie else node.f
+        bucket = self.buckets.get(f)
+        if bucket is None:
+            bucket = self.buckets[f] = {}
+            heapq.heappush(self.keys, f)
+        bucket[key] = node
+        self.bucket_of[key] = f
+
+    def pop_node(self):
+        """
+        Pops node off the queue. i.e. returns the one with the lowest f.
+        """
+        while self.keys[0] not in self.buckets:
+            heapq.heappop(self.keys)
+        f = self.keys[0]
+        bucket = self.buckets[f]
+        if self.lifo:
+            key, node = bucket.popitem()
+        else:
+            key = next(iter(bucket))
+            node = bucket.pop(key)
+        del self.bucket_of[key]
+        if not bucket:
+            del self.buckets[f]
+            heapq.heappop(self.keys)
+        return node
+
+    def remove_node(self, node, f):
+        """
+        Remove the node from the queue.
+
+        :param node: The node to remove.
+        :param f: The old f value of the node (not needed here).
+        """
+        key = self.node_key(node)
+        f = self.bucket_of.pop(key)
+        bucket = self.buckets[f]
+        del bucket[key]
+        if not bucket:
+            del self.buckets[f]
+
+    def update_node(self, node, old_f):
+        """
+        Move the node to its new bucket after its f value changed.
+
+        :param node: The node to update.
+        :param old_f: The f value the node was pushed with (not needed here).
+        """
+        self.push_node(node)
+
+    def __len__(self):
+        """Returns the length of the open_list."""
+        return len(self.bucket_of)
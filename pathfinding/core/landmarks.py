@@ -0,0 +1,290 @@
+import heapq
+import math
+import random
+
+from .diagonal_movement import DiagonalMovement
+from .graph import Graph
+from .grid import Grid, USE_NUMPY
+if USE_NUMPY:
+    import numpy as np
+
+
+class Landmarks:
+    """
+    ALT heuristic (A*, landmarks and triangle inequality, see Goldberg and
+    Harrelson, "Computing the Shortest Path: A* Search Meets Graph Theory",
+    2005).
+
+    The costs from and to a few landmarks are calculated for all cells of a
+    grid (or nodes of a graph) once. Because of the triangle inequality
+    d(a, b) >= d(L, b) - d(L, a) and d(a, b) >= d(a, L) - d(b, L) for every
+    landmark L, which is a much better lower bound on weighted maps than
+    the distance multiplied with the minimum weight.
+
+    Use it as heuristic of AStarFinder or BiAStarFinder. It has to be
+    created with the same diagonal movement and weighted setting as the
+    finder (BiAStarFinder doesn't use weights).
+    """
+    def __init__(self, grid, count=8,
+                 diagonal_movement=DiagonalMovement.never, weighted=True,
+                 landmarks=None, seed=None):
+        """
+        :param grid: Grid (or CompactGrid) or Graph
+        :param count: number of landmarks
+        :param diagonal_movement: if diagonal movement is allowed
+            (see enum in diagonal_movement)
+        :param weighted: use the weights of the grid
+        :param landmarks: nodes to use as landmarks (otherwise they are
+            picked as far apart from each other as possible)
+        :param seed: seed of the random first landmark
+        """
+        if not USE_NUMPY:
+            raise ImportError('numpy is required for landmarks')
+        self.grid = grid
+        self.diagonal_movement = diagonal_movement
+        self.weighted = weighted
+        self._setup_index()
+        # costs from landmarks calculated while picking them
+        self._forward = {}
+        if landmarks is None:
+            self.landmarks = self._pick_landmarks(count, seed)
+        else:
+            self.landmarks = [self._index(node) for node in landmarks]
+        self.compute()
+        if isinstance(grid, Grid):
+            grid.subscribe(self.grid_changed)
+
+    def _setup_index(self):
+        grid = self.grid
+        if isinstance(grid, Graph):
+            self.node_ids = list(grid.nodes)
+            self._ids = {
+                node_id: i for i, node_id in enumerate(self.node_ids)}
+            self.size = len(self.node_ids)
+        elif isinstance(grid, Grid):
+            self.node_ids = None
+            self.size = grid.width * grid.height
+        else:
+            raise TypeError(
+                'landmarks need a Grid or Graph, '
+                f'not {grid.__class__.__name__}')
+
+    def _index(self, node):
+        if self.node_ids is not None:
+            return self._ids[node.node_id]
+        return node.y * self.grid.width + node.x
+
+    def _node(self, index):
+        if self.node_ids is not None:
+            return self.grid.node(self.node_ids[index])
+        width = self.grid.width
+        return self.grid.node(index % width, index // width)
+
+    def _edges(self, index, reverse):
+        """
+        (neighbor index, cost) of all edges going out of the node (or into
+        it if reverse is True)
+        """
+        grid = self.grid
+        node = self._node(index)
+        if isinstance(grid, Graph):
+            if reverse:
+                neighbors = [entry[0] for entry in grid.predecessors.get(
+                    node.node_id, {}).values()]
+                if grid.bi_directional:
+                    neighbors += grid.neighbors(node)
+            else:
+                neighbors = grid.neighbors(node)
+        else:
+            neighbors = [
+                neighbor for neighbor in grid.neighbors(
+                    node, self.diagonal_movement)
+                if neighbor.grid_id == grid.grid_id]
+        for neighbor in neighbors:
+            if reverse:
+                cost = grid.calc_cost(neighbor, node, self.weighted)
+            else:
+                cost = grid.calc_cost(node, neighbor, self.weighted)
+            yield self._index(neighbor), cost
+
+    def _dijkstra(self, source, reverse=False):
+        """
+        costs from source to all nodes (or from all nodes to the source)
+        """
+        costs = [math.inf] * self.size
+        costs[source] = 0
+        open_list = [(0, source)]
+        while open_list:
+            cost, index = heapq.heappop(open_list)
+            if cost > costs[index]:
+                continue
+            for neighbor, edge_cost in self._edges(index, reverse):
+                new_cost = cost + edge_cost
+                if new_cost < costs[neighbor]:
+                    costs[neighbor] = new_cost
+                    heapq.heappush(open_list, (new_cost, neighbor))
+        return np.array(costs)
+
+    def _symmetric(self):
+        # calc_cost of a grid depends on the weight of the target cell
+        return isinstance(self.grid, Graph) and self.grid.bi_directional or \
+            isinstance(self.grid, Grid) and not self.weighted
+
+    def _pick_landmarks(self, count, seed):
+        """
+        farthest landmark selection: start with the node farthest away from
+        a random one and add the node that is farthest away from all
+        landmarks so far
+        """
+        rnd = random.Random(seed)
+        if isinstance(self.grid, Graph):
+            candidates = list(range(self.size))
+        else:
+            candidates = [
+                index for index in range(self.size)
+                if self._node(index).walkable]
+        if not candidates or count < 1:
+            return []
+        first = rnd.choice(candidates)
+        landmark = self._farthest(self._dijkstra(first), [first])
+        landmarks = [first if landmark is None else landmark]
+        nearest = np.full(self.size, math.inf)
+        while len(landmarks) < count:
+            costs = self._dijkstra(landmarks[-1])
+            # keep the costs for compute
+            self._forward[landmarks[-1]] = costs
+            nearest = np.minimum(nearest, costs)
+            landmark = self._farthest(nearest, landmarks)
+            if landmark is None:
+                break
+            landmarks.append(landmark)
+        return landmarks
+
+    def _farthest(self, costs, exclude):
+        reachable = np.where(np.isfinite(costs), costs, -1)
+        reachable[exclude] = -1
+        index = int(np.argmax(reachable))
+        return index if reachable[index] > 0 else None
+
+    def compute(self):
+        """
+        (re)calculate the costs from and to all landmarks
+        """
+        count = len(self.landmarks)
+        self.distance_from = np.empty((count, self.size))
+        self.distance_to = np.empty((count, self.size))
+        for i, landmark in enumerate(self.landmarks):
+            forward = self._forward.pop(landmark, None)
+            self.distance_from[i] = forward if forward is not None \
+                else self._dijkstra(landmark)
+            self.distance_to[i] = self.distance_from[i] if \
+                self._symmetric() else self._dijkstra(landmark, reverse=True)
+        self._forward = {}
+        self._prepare()
+
+    def _prepare(self):
+        # one row per node, the bound is the maximum of
+        # potential[b] - potential[a] over all landmarks (both directions),
+        # unreachable nodes get a huge finite cost, so the differences stay
+        # valid bounds (if a landmark reaches a but not b, a can't reach b)
+        unreachable = 1e30
+        self._potential = np.concatenate((
+            np.where(np.isfinite(self.distance_from),
+                     self.distance_from, unreachable),
+            -np.where(np.isfinite(self.distance_to),
+                      self.distance_to, unreachable))).T.copy()
+        self.stale = False
+        # end node of the last search and its potentials, set at once (the
+        # landmarks might be shared by searches in other threads)
+        self._target = None
+
+    def estimate(self, node_a, node_b) -> float:
+        """
+        lower bound of the cost from node_a to node_b
+        """
+        if self.stale or not self.landmarks:
+            return 0
+        potential = self._potential
+        target = self._target
+        if target is None or target[0] is not node_b or \
+                target[1] is not potential:
+            # the end node of a search doesn't change
+            target = self._target = (
+                node_b, potential, potential[self._index(node_b)])
+        estimate = (target[2] - potential[self._index(node_a)]).max()
+        return float(estimate) if estimate > 0 else 0
+
+    def grid_changed(self, grid, cells):
+        """
+        the costs might not be valid bounds anymore after the grid changed,
+        estimate returns 0 until compute is called again
+        """
+        self.stale = True
+
+    def close(self):
+        """
+        stop listening to changes of the grid
+        """
+        if isinstance(self.grid, Grid):
+            self.grid.unsubscribe(self.grid_changed)
+
+    def save(self, file):
+        """
+        save the landmarks and their costs to a .npz file
+
+        :param file: file name or file object
+        """
+        arrays = {
+            'landmarks': np.array(self.landmarks, dtype=np.int64),
+            'distance_from': self.distance_from,
+            'distance_to': self.distance_to,
+            'diagonal_movement': np.array(self.diagonal_movement),
+            'weighted': np.array(self.weighted),
+        }
+        if self.node_ids is not None:
+            # ids can be anything (e.g. tuples), they are stored as repr
+            # (as 1-D string array, so loading needs no pickle)
+            arrays['node_ids'] = np.array(
+                [repr(node_id) for node_id in self.node_ids], dtype=str)
+        else:
+            arrays['shape'] = np.array((self.grid.width, self.grid.height))
+        np.savez(file, **arrays)
+
+    @classmethod
+    def load(cls, file, grid):
+        """
+        load landmarks created by save for the same grid or graph
+
+        :param file: file name or file object
+        :param grid: Grid or Graph the landmarks were created for
+        :return: Landmarks
+        """
+        if not USE_NUMPY:
+            raise ImportError('numpy is required for landmarks')
+        data = np.load(file)
+        landmarks = cls.__new__(cls)
+        landmarks.grid = grid
+        landmarks.diagonal_movement = int(data['diagonal_movement'])
+        landmarks.weighted = bool(data['weighted'])
+        landmarks._setup_index()
+        if 'node_ids' in data:
+            node_ids = data['node_ids'].tolist()
+            by_repr = {repr(node_id): node_id
+                       for node_id in landmarks.node_ids or ()}
+            if landmarks.node_ids is None or len(by_repr) != len(
+                    landmarks.node_ids) or set(node_ids) != set(by_repr):
+                raise ValueError('landmarks belong to a different graph')
+            node_ids = [by_repr[node_id] for node_id in node_ids]
+            landmarks.node_ids = node_ids
+            landmarks._ids = {
+                node_id: i for i, node_id in enumerate(node_ids)}
+        elif landmarks.node_ids is not None or tuple(
+                data['shape'].tolist()) != (grid.width, grid.height):
+            raise ValueError('landmarks belong to a grid of a different size')
+        landmarks.landmarks = data['landmarks'].tolist()
+        landmarks.distance_from = data['distance_from']
+        landmarks.distance_to = data['distance_to']
+        landmarks._prepare()
+        if isinstance(grid, Grid):
+            grid.subscribe(landmarks.grid_changed)
+        return landmarks
@@ -0,0 +1,193 @@
+from .grid import Grid, GridListener, USE_NUMPY
+if USE_NUMPY:
+    import numpy as np
+
+
+# max. number of results kept by LineOfSight (the cache is cleared when it
+# is full)
+CACHE_SIZE = 1_000_000
+# lines that cross at least this many columns (or rows) are checked with
+# numpy, shorter ones cell by cell
+NUMPY_MIN_LENGTH = 16
+
+
+class LineOfSight:
+    """
+    Check if the straight line between the centers of two cells only
+    crosses walkable cells (used by the any-angle finders, see
+    finder/theta_star.py).
+
+    A cell counts as crossed if the line touches it, so lines don't cut
+    corners of blocked cells. The number of blocked cells in every column
+    and row is kept as prefix sums (with numpy), so a long line is checked
+    with a few array operations instead of looking at every cell. Results
+    are cached until the grid changes (see Grid.subscribe).
+    """
+    def __init__(self, grid, cache_size=CACHE_SIZE):
+        """
+        :param grid: Grid (or CompactGrid)
+        :param cache_size: max. number of cached results
+        """
+        if not isinstance(grid, Grid):
+            raise TypeError(
+                'line of sight needs a Grid, '
+                f'not {grid.__class__.__name__}')
+        self.grid = grid
+        self.cache_size = cache_size
+        self.cache = {}
+        self._blocked = None
+        self._prefix = None
+        # version of the grid the results belong to
+        self.version = grid.version
+        # doesn't keep the checks alive, they stop listening once they are
+        # garbage collected
+        self.listener = GridListener(self)
+        grid.subscribe(self.listener)
+
+    def _setup(self):
+        grid = self.grid
+        width, height = grid.width, grid.height
+        if USE_NUMPY and width and height:
+            blocked = ~grid._walkable_mask()
+            self._blocked = bytearray(blocked.astype(np.uint8).tobytes())
+            # blocked cells above every cell of a column and left of every
+            # cell of a row
+            by_column = np.zeros((height + 1, width), dtype=np.int32)
+            np.cumsum(blocked, axis=0, out=by_column[1:])
+            by_row = np.zeros((width + 1, height), dtype=np.int32)
+            np.cumsum(blocked.T, axis=0, out=by_row[1:])
+            self._prefix = (by_column, by_row)
+        else:
+            self._blocked = bytearray(
+                not grid.walkable(x, y)
+                for y in range(height) for x in range(width))
+            self._prefix = None
+
+    def grid_changed(self, grid, cells):
+        """
+        forget all results after cells of the grid changed
+        """
+        self.version = self.grid.version
+        self.cache.clear()
+        self._blocked = None
+        self._prefix = None
+
+    def close(self):
+        """
+        stop listening to changes of the grid
+        """
+        self.grid.unsubscribe(self.listener)
+
+    def visible(self, node_a, node_b) -> bool:
+        """
+        check if there is a line of sight between two nodes
+        """
+        width = self.grid.width
+        index_a = node_a.y * width + node_a.x
+        index_b = node_b.y * width + node_b.x
+        key = (index_a, index_b) if index_a < index_b else (index_b, index_a)
+        result = self.cache.get(key)
+        if result is None:
+            result = self.check(node_a.x, node_a.y, node_b.x, node_b.y)
+            if len(self.cache) >= self.cache_size:
+                self.cache.clear()
+            self.cache[key] = result
+        return result
+
+    def check(self, x0, y0, x1, y1) -> bool:
+        """
+        check if the line from cell (x0, y0) to cell (x1, y1) only crosses
+        walkable cells (without using the cache)
+        """
+        if self._blocked is None:
+            self._setup()
+        width = self.grid.width
+        if abs(x1 - x0) >= abs(y1 - y0):
+            # walk along the columns, look at the rows the line crosses
+            major, minor, delta, delta_minor = x0, y0, x1 - x0, y1 - y0
+            stride_major, stride_minor = 1, width
+            size_minor = self.grid.height
+            axis = 0
+        else:
+            major, minor, delta, delta_minor = y0, x0, y1 - y0, x1 - x0
+            stride_major, stride_minor = width, 1
+            size_minor = width
+            axis = 1
+        length = abs(delta)
+        if not length:
+            return not self._blocked[y0 * width + x0]
+        step = 1 if delta > 0 else -1
+
+        if self._prefix is not None and length >= NUMPY_MIN_LENGTH:
+            prefix = self._prefix[axis]
+            t = np.arange(length + 1)
+            low, high = _crossed(
+                np.maximum(2 * t - 1, 0), np.minimum(2 * t + 1, 2 * length),
+                length, delta_minor)
+            low = np.clip(minor + low, 0, size_minor - 1)
+            high = np.clip(minor + high, 0, size_minor - 1)
+            columns = major + step * t
+            return not np.any(
+                prefix[high + 1, columns] - prefix[low, columns])
+
+        blocked = self._blocked
+        for t in range(length + 1):
+            low, high = _crossed(
+                2 * t - 1 if t else 0,
+                2 * t + 1 if t < length else 2 * length,
+                length, delta_minor)
+            low += minor
+            high += minor
+            if low < 0:
+                low = 0
+            if high >= size_minor:
+                high = size_minor - 1
+            offset = (major + step * t) * stride_major
+            for row in range(low, high + 1):
+                if blocked[offset + row * stride_minor]:
+                    return False
+        return True
+
+
+def line_cells(x0, y0, x1, y1):
+    """
+    all cells the straight line from cell (x0, y0) to cell (x1, y1) touches
+    (the cells that have to be walkable for a line of sight)
+
+    :return: list of (x, y) tuples
+    """
+    horizontal = abs(x1 - x0) >= abs(y1 - y0)
+    if horizontal:
+        major, minor, delta, delta_minor = x0, y0, x1 - x0, y1 - y0
+    else:
+        major, minor, delta, delta_minor = y0, x0, y1 - y0, x1 - x0
+    length = abs(delta)
+    if not length:
+        return [(x0, y0)]
+    step = 1 if delta > 0 else -1
+    cells = []
+    for t in range(length + 1):
+        low, high = _crossed(
+            2 * t - 1 if t else 0,
+            2 * t + 1 if t < length else 2 * length,
+            length, delta_minor)
+        column = major + step * t
+        for row in range(minor + low, minor + high + 1):
+            cells.append((column, row) if horizontal else (row, column))
+    return cells
+
+
+def _crossed(start, end, length, delta):
+    """
+    first and last row (relative to the first cell) the line crosses between
+    the column positions start / 2 and end / 2 (works on numbers and numpy
+    arrays). The line goes from (0, 0) to (length, delta), cell i covers
+    i - 0.5 to i + 0.5, all values are scaled by 2 * length to stay integers.
+    """
+    y_start = start * delta
+    y_end = end * delta
+    if delta < 0:
+        y_start, y_end = y_end, y_start
+    low = -((length - y_start) // (2 * length))
+    high = (y_end + length) // (2 * length)
+    return low, high
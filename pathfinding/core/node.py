@@ -2,7 +2,9 @@ from __future__ import annotations
 import dataclasses
 
 
-@dataclasses.dataclass
+# nodes are compared by identity (GraphNode by its id, CompactGridNode by
+# its index), comparing all fields would be slow and follow the parents
+@dataclasses.dataclass(eq=False)
 class Node:
     h: float = 0.0
     g: float = 0.0
@@ -12,6 +14,8 @@ class Node:
     parent: Node = None
     retain_count: int = 0
     tested: bool = False
+    # id of the search the values above belong to (see Finder.clean_grid)
+    search_id: int = 0
 
     def __post_init__(self):
         # values used in the finder
@@ -52,7 +56,7 @@ class Node:
         self.tested = False
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(eq=False)
 class GraphNode(Node):
     """
     simple node in a graph that's not a grid.
@@ -69,11 +73,14 @@ class GraphNode(Node):
             return o == self.node_id
         return self.node_id == o.node_id
 
+    def __hash__(self):
+        return hash(self.node_id)
+
     def __repr__(self):
         return f'<GraphNode({self.node_id} {hex(id(self))})>'
 
 
-@dataclasses.dataclass
+@dataclasses.dataclass(eq=False)
 class GridNode(Node):
     """
     basic node, saves X and Y coordinates on some grid and determine if
@@ -114,3 +121,108 @@ class GridNode(Node):
 
     def __repr__(self):
         return f'<GridNode({self.x}:{self.y} {hex(id(self))})>'
+
+
+def _cell_property(array_name, convert=None):
+    """
+    property that reads and writes the value of a node in one of the
+    flat arrays of its CompactGrid.
+    """
+    def fget(node):
+        value = getattr(node.grid, array_name)[node.index]
+        return convert(value) if convert else value
+
+    def fset(node, value):
+        getattr(node.grid, array_name)[node.index] = value
+
+    return property(fget, fset)
+
+
+class CompactGridNode(GridNode):
+    """
+    node of a CompactGrid. It does not store any values itself but reads
+    and writes them from/to the arrays of its grid, so it can be created on
+    demand and thrown away after use.
+    """
+    def __init__(self, grid, x, y):
+        self.grid = grid
+        self.x = x
+        self.y = y
+        # position of the node in the flat arrays of the grid
+        self.index = y * grid.width + x
+
+    walkable = _cell_property('_walkable', bool)
+    weight = _cell_property('_weight')
+
+    h = _cell_property('_h')
+    g = _cell_property('_g')
+    f = _cell_property('_f')
+    opened = _cell_property('_opened')
+    closed = _cell_property('_closed', bool)
+    search_id = _cell_property('_search_id')
+
+    @property
+    def parent(self):
+        # index of the parent + 1, so a new grid can start with zeros
+        index = self.grid._parent[self.index]
+        if index == 0:
+            return None
+        if index == -1:
+            # parent from another grid (e.g. connected in a World)
+            return self.grid._foreign_parents[self.index]
+        return self.grid.node_at(index - 1)
+
+    @parent.setter
+    def parent(self, node):
+        if node is None:
+            self.grid._parent[self.index] = 0
+        elif isinstance(node, CompactGridNode) and node.grid is self.grid:
+            self.grid._parent[self.index] = node.index + 1
+        else:
+            self.grid._parent[self.index] = -1
+            self.grid._foreign_parents[self.index] = node
+
+    # only used by IDA*, so we keep them sparse in a dict
+    @property
+    def retain_count(self):
+        return self.grid._retain_count.get(self.index, 0)
+
+    @retain_count.setter
+    def retain_count(self, value):
+        if value:
+            self.grid._retain_count[self.index] = value
+        else:
+            self.grid._retain_count.pop(self.index, None)
+
+    @property
+    def tested(self):
+        return self.index in self.grid._tested
+
+    @tested.setter
+    def tested(self, value):
+        if value:
+            self.grid._tested.add(self.index)
+        else:
+            self.grid._tested.discard(self.index)
+
+    @property
+    def connections(self):
+        return self.grid._connections.get(self.index)
+
+    @connections.setter
+    def connections(self, value):
+        if value:
+            self.grid._connections[self.index] = value
+        else:
+            self.grid._connections.pop(self.index, None)
+
+    @property
+    def grid_id(self):
+        return self.grid.grid_id
+
+    def __eq__(self, o):
+        return isinstance(o, CompactGridNode) and \
+            o.index == self.index and o.grid is self.grid
+
+    def __hash__(self):
+        return hash((id(self.grid), self.index))
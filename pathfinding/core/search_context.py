@@ -0,0 +1,224 @@
+import copy
+
+from .compact_grid import _NodeRows
+from .diagonal_movement import DiagonalMovement
+from .graph import Graph
+from .grid import Grid
+from .node import GraphNode, GridNode
+from .world import World
+
+
+class ContextGridNode(GridNode):
+    """
+    node of a search context, it keeps the values of the finder (g, f,
+    parent, ...) while position, walkability and weight are read from the
+    node of the original grid.
+    """
+    def __init__(self, view, original):
+        self.view = view
+        self.original = original
+        self.x = original.x
+        self.y = original.y
+        self.grid_id = original.grid_id
+        self.cleanup()
+
+    @property
+    def walkable(self):
+        return self.original.walkable
+
+    @property
+    def weight(self):
+        return self.original.weight
+
+    @property
+    def connections(self):
+        connections = self.original.connections
+        if not connections:
+            return connections
+        nodes = [self.view.context_node(node) for node in connections]
+        return [node for node in nodes if node is not None]
+
+    # there is only one node per cell in a context
+    def __eq__(self, other):
+        return self is other
+
+    __hash__ = object.__hash__
+
+
+class ContextGraphNode(GraphNode):
+    """
+    node of a search context for a graph (see ContextGridNode)
+    """
+    def __init__(self, original):
+        self.original = original
+        super(ContextGraphNode, self).__init__(original.node_id)
+
+    __hash__ = object.__hash__
+
+
+class _GridView(Grid):
+    """
+    grid that shares the cells of another grid but has its own nodes.
+    """
+    def __init__(self, grid, world=None):
+        self.grid = grid
+        self.world = world
+        self.width = grid.width
+        self.height = grid.height
+        self.grid_id = grid.grid_id
+        self.dirty = False
+        self.passable_left_right_border = grid.passable_left_right_border
+        self.passable_up_down_border = grid.passable_up_down_border
+        # the same dict, so updates of the grid are visible to the view
+        self._neighbor_tables = grid._neighbor_tables
+        self._neighbor_functions = {}
+        self._listeners = []
+        self._context_nodes = {}
+        self.nodes = _NodeRows(self)
+
+    @property
+    def min_weight(self) -> float:
+        return self.grid.min_weight
+
+    @property
+    def version(self) -> int:
+        return self.grid.version
+
+    def node(self, x, y) -> ContextGridNode:
+        index = y * self.width + x
+        node = self._context_nodes.get(index)
+        if node is None:
+            node = ContextGridNode(self, self.grid.node(x, y))
+            self._context_nodes[index] = node
+        return node
+
+    def context_node(self, node):
+        """
+        get the node of the context for a node of an original grid
+        """
+        if self.world is not None:
+            return self.world.grids[node.grid_id].node(node.x, node.y)
+        if node.grid_id == self.grid_id:
+            return self.node(node.x, node.y)
+        # connection to a grid that is not part of the context
+        return None
+
+    def walkable(self, x, y) -> bool:
+        return self.grid.walkable(x, y)
+
+    def _walkable_mask(self):
+        return self.grid._walkable_mask()
+
+    def components(self, diagonal_movement=DiagonalMovement.never):
+        return self.grid.components(diagonal_movement)
+
+    def connected(self, node_a, node_b,
+                  diagonal_movement=DiagonalMovement.never) -> bool:
+        return self.grid.connected(node_a, node_b, diagonal_movement)
+
+    def cleanup(self):
+        self._context_nodes = {}
+
+
+class _WorldView(World):
+    def __init__(self, world):
+        self.world = world
+        self.grids = {
+            grid_id: _GridView(grid, self)
+            for grid_id, grid in world.grids.items()}
+        self.dirty = False
+
+    def context_node(self, node):
+        return self.grids[node.grid_id].node(node.x, node.y)
+
+
+class _GraphView(Graph):
+    """
+    graph that shares the edges of another graph but has its own nodes.
+    """
+    def __init__(self, graph):
+        self.graph = graph
+        self.bi_directional = graph.bi_directional
+        self.dirty = False
+        self._context_nodes = {}
+
+    @property
+    def edges(self):
+        return self.graph.edges
+
+    @property
+    def version(self) -> int:
+        return self.graph.version
+
+    @property
+    def nodes(self):
+        return {node_id: self.node(node_id) for node_id in self.graph.nodes}
+
+    def node(self, node_id) -> ContextGraphNode:
+        node = self._context_nodes.get(node_id)
+        if node is None:
+            node = ContextGraphNode(self.graph.node(node_id))
+            self._context_nodes[node_id] = node
+        return node
+
+    def context_node(self, node):
+        return self.node(node.node_id)
+
+    def neighbors(self, node, **kwargs):
+        return [self.node(neighbor.node_id)
+                for neighbor in self.graph.neighbors(node, **kwargs)]
+
+    def calc_cost(self, node_a, node_b, _weighted=False):
+        return self.graph.calc_cost(node_a, node_b, _weighted)
+
+    def connected(self, node_a, node_b, diagonal_movement=None) -> bool:
+        return self.graph.connected(node_a, node_b)
+
+    def cleanup(self):
+        self._context_nodes = {}
+
+
+class SearchContext:
+    """
+    Keeps the values of a search (g, f, parent, ...) outside of the grid, so
+    the same grid, graph or world can be searched by multiple threads at the
+    same time as long as every thread uses its own context.
+    The grid must not be changed while searches are running.
+    """
+    def __init__(self, grid):
+        """
+        :param grid: Grid, Graph or World that should be searched
+        """
+        self.grid = grid
+        if isinstance(grid, World):
+            self.view = _WorldView(grid)
+        elif isinstance(grid, Graph):
+            self.view = _GraphView(grid)
+        elif isinstance(grid, Grid):
+            self.view = _GridView(grid)
+        else:
+            raise TypeError(f'unsupported grid type {grid}')
+
+    def node(self, node):
+        """
+        get the node of this context for a node of the grid
+        """
+        return self.view.context_node(node)
+
+    def find_path(self, finder, start, end):
+        """
+        find a path using a copy of the finder, so the finder can be shared
+        between threads as well (runs and start time are kept per copy).
+
+        :param finder: finder to use (e.g. AStarFinder)
+        :param start: start node of the grid
+        :param end: end node of the grid
+        :return: path (made of the nodes of the grid) and number of runs
+        """
+        # forget the nodes of the last query, so the context doesn't keep a
+        # node for every cell it ever touched
+        self.view.cleanup()
+        finder = copy.copy(finder)
+        path, runs = finder.find_path(
+            self.node(start), self.node(end), self.view)
+        return [node.original for node in path], runs
@@ -9,10 +9,18 @@ from .node import Node
 class World:
     def __init__(self, grids: Dict[int, Grid]):
         self.grids = grids
+        # set by the finders once the world has been used for a search
         self.dirty = False
 
+    @property
+    def version(self) -> int:
+        """
+        changes of all grids of the world (see Grid.notify)
+        """
+        return sum(grid.version for grid in self.grids.values())
+
     def cleanup(self):
-        for grid in self.grids:
+        for grid in self.grids.values():
             grid.cleanup()
 
     def neighbors(
@@ -1,3 +1,5 @@
-__all__ = ['a_star', 'best_first', 'bi_a_star', 'bi_breadth_first',
-           'bi_best_first', 'bi_dijkstra', 'breadth_first', 'dijkstra',
-           'finder', 'ida_star']
+__all__ = ['a_star', 'ara_star', 'best_first', 'bi_a_star',
+           'bi_breadth_first', 'bi_best_first', 'bi_dijkstra',
+           'breadth_first', 'contraction_hierarchy', 'd_star_lite',
+           'dijkstra', 'finder', 'focal_search', 'fringe_search', 'hpa_star',
+           'ida_star', 'jump_point', 'msp', 'path_cache', 'theta_star']
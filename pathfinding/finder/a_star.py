@@ -1,5 +1,6 @@
-from .finder import BY_END, Finder, MAX_RUNS, TIME_LIMIT
+from .finder import BY_END, Finder, MAX_RUNS, OPEN_LIST_CLASS, TIME_LIMIT
 from ..core.diagonal_movement import DiagonalMovement
+from ..core.heap import TieBreaking
 from ..core.heuristic import manhattan, octile
 from ..core.util import backtrace, bi_backtrace
 
@@ -12,12 +13,16 @@ class AStarFinder(Finder):
     def __init__(self, heuristic=None, weight=1,
                  diagonal_movement=DiagonalMovement.never,
                  time_limit=TIME_LIMIT,
-                 max_runs=MAX_RUNS):
+                 max_runs=MAX_RUNS,
+                 open_list_class=OPEN_LIST_CLASS,
+                 tie_breaking=TieBreaking.fifo):
         """
         Find shortest path using A* algorithm
         :param heuristic: heuristic used to calculate distance of 2 points
             (defaults to manhattan)
-        :param weight: weight for the edges
+        :param weight: weight of the heuristic (weighted A*), with a weight
+            bigger than 1 far less nodes are expanded and the path costs at
+            most weight times the cost of the shortest path
         :param diagonal_movement: if diagonal movement is allowed
             (see enum in diagonal_movement)
         :param time_limit: max. runtime in seconds
@@ -25,13 +30,19 @@ class AStarFinder(Finder):
             (optional, only if we enter huge grids and have time constrains)
             <=0 means there are no constrains and the code might run on any
             large map.
+        :param open_list_class: priority queue used as open list
+            (see core/heap.py, defaults to IndexedHeap)
+        :param tie_breaking: order of the nodes with the same f value in
+            the open list (see TieBreaking in core/heap.py, defaults to fifo)
         """
         super(AStarFinder, self).__init__(
             heuristic=heuristic,
             weight=weight,
             diagonal_movement=diagonal_movement,
             time_limit=time_limit,
-            max_runs=max_runs)
+            max_runs=max_runs,
+            open_list_class=open_list_class,
+            tie_breaking=tie_breaking)
 
         if not heuristic:
             if diagonal_movement == DiagonalMovement.never:
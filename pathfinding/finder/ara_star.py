@@ -0,0 +1,196 @@
+import time
+
+from .a_star import AStarFinder
+from .finder import (
+    ExecutionRunsException, ExecutionTimeException, MAX_RUNS,
+    OPEN_LIST_CLASS, TIME_LIMIT)
+from ..core.diagonal_movement import DiagonalMovement
+from ..core.heap import TieBreaking
+from ..core.util import backtrace
+
+# values of node.opened
+IN_OPEN = 1
+# closed nodes whose g value got smaller, they are opened again by the next
+# search with a smaller weight
+INCONSISTENT = 2
+# nodes closed by an earlier search that are not in the open list anymore,
+# they keep their g value
+VISITED = 3
+
+
+class ARAStarFinder(AStarFinder):
+    """
+    Anytime Repairing A* (ARA*) by Maxim Likhachev, Geoff Gordon and
+    Sebastian Thrun, "ARA*: Anytime A* with Provable Bounds on
+    Sub-Optimality" (2003).
+
+    Starts with a weighted A* search that finds a path quickly and repeats
+    it with smaller weights until the path is the shortest one or the
+    time_limit/max_runs budget runs out. Every search reuses the values of
+    the previous one, only nodes whose cost changed are expanded again.
+    """
+    def __init__(self, heuristic=None, weight=3, weight_step=0.5,
+                 diagonal_movement=DiagonalMovement.never,
+                 time_limit=TIME_LIMIT,
+                 max_runs=MAX_RUNS,
+                 open_list_class=OPEN_LIST_CLASS,
+                 tie_breaking=TieBreaking.fifo):
+        """
+        find a path quickly and improve it while there is time left
+        :param heuristic: heuristic used to calculate distance of 2 points
+            (defaults to manhattan or octile if diagonal movement is allowed)
+        :param weight: weight of the heuristic for the first search
+        :param weight_step: the weight gets decreased by this value for
+            every following search (until it is 1)
+        :param diagonal_movement: if diagonal movement is allowed
+            (see enum in diagonal_movement)
+        :param time_limit: max. runtime in seconds, the best path found so
+            far is returned when it runs out
+        :param max_runs: max. amount of expanded nodes, the best path found
+            so far is returned when it is reached
+        :param open_list_class: priority queue used as open list
+            (see core/heap.py, defaults to IndexedHeap)
+        :param tie_breaking: order of the nodes with the same f value in
+            the open list (see TieBreaking in core/heap.py, defaults to fifo)
+        """
+        super(ARAStarFinder, self).__init__(
+            heuristic=heuristic,
+            weight=weight,
+            diagonal_movement=diagonal_movement,
+            time_limit=time_limit,
+            max_runs=max_runs,
+            open_list_class=open_list_class,
+            tie_breaking=tie_breaking)
+        self.weight_step = weight_step
+        # suboptimality bound of the last path
+        self.bound = None
+
+    def _improve_path(self, end, grid, weight):
+        """
+        weighted A* search that reuses the values of the previous searches,
+        stops as soon as no open node can lead to a cheaper path to the end
+        """
+        open_list = self.open_list
+        while len(open_list) > 0:
+            node = open_list.pop_node()
+            if end.opened and node.f >= end.g:
+                open_list.push_node(node)
+                return
+            self.runs += 1
+            self.keep_running()
+            node.closed = True
+            self.closed_nodes.append(node)
+
+            for neighbor in self.find_neighbors(grid, node):
+                ng = node.g + grid.calc_cost(node, neighbor, self.weighted)
+                if neighbor.opened and ng >= neighbor.g:
+                    continue
+                neighbor.g = ng
+                neighbor.parent = node
+                neighbor.h = neighbor.h or self.apply_heuristic(
+                    neighbor, end, graph=grid)
+                if neighbor.closed:
+                    if neighbor.opened != INCONSISTENT:
+                        neighbor.opened = INCONSISTENT
+                        self.inconsistent.append(neighbor)
+                    continue
+                old_f = neighbor.f
+                neighbor.f = ng + weight * neighbor.h
+                if neighbor.opened == IN_OPEN:
+                    open_list.update_node(neighbor, old_f)
+                else:
+                    neighbor.opened = IN_OPEN
+                    open_list.push_node(neighbor)
+                    self.open_nodes.append(neighbor)
+
+    def _open_nodes(self):
+        return [node for node in self.open_nodes
+                if node.opened == IN_OPEN and not node.closed]
+
+    def _reopen(self, grid, weight):
+        """
+        start the next search: open and inconsistent nodes get opened with
+        the new weight, all closed nodes count as not visited
+        """
+        nodes = self._open_nodes() + self.inconsistent
+        for node in self.closed_nodes:
+            node.closed = False
+            if node.opened == IN_OPEN:
+                # not part of the new open list
+                node.opened = VISITED
+        self.closed_nodes = []
+        self.inconsistent = []
+        self.open_nodes = nodes
+        for node in nodes:
+            node.opened = IN_OPEN
+            node.f = node.g + weight * node.h
+        self.open_list = self.create_open_list(nodes[0], grid) \
+            if nodes else []
+        for node in nodes[1:]:
+            self.open_list.push_node(node)
+
+    def anytime_paths(self, start, end, grid):
+        """
+        generator of better and better paths from start to end
+
+        :param start: start node
+        :param end: end node
+        :param grid: grid that stores all possible steps/tiles as 2D-list
+        :return: generator of (path, bound) tuples, the cost of the path is
+            at most bound times the cost of the shortest path. Raises
+            ExecutionTimeException or ExecutionRunsException when the budget
+            runs out.
+        """
+        self.clean_grid(grid)
+        self.start_time = time.time()  # execution time limitation
+        self.runs = 0  # count number of iterations
+        if self.unreachable(start, end, grid):
+            return
+        self.refresh_node(start)
+        self.refresh_node(end)
+
+        weight = self.weight
+        start.g = 0
+        start.h = self.apply_heuristic(start, end, graph=grid)
+        start.f = weight * start.h
+        start.opened = IN_OPEN
+        self.open_nodes = [start]
+        self.closed_nodes = []
+        self.inconsistent = []
+        self.open_list = self.create_open_list(start, grid)
+
+        while True:
+            self._improve_path(end, grid, weight)
+            if not end.opened:
+                # failed to find path
+                return
+            lower_bounds = [node.g + node.h for node in
+                            self._open_nodes() + self.inconsistent]
+            lower_bound = min(lower_bounds) if lower_bounds else end.g
+            bound = weight
+            if lower_bound > 0:
+                bound = max(1, min(weight, end.g / lower_bound))
+            yield backtrace(end), bound
+            if bound <= 1:
+                return
+            weight = max(1, weight - self.weight_step)
+            self._reopen(grid, weight)
+
+    def find_path(self, start, end, grid):
+        """
+        find a path from start to end node on grid, improving it until it is
+        the shortest one or the budget runs out (see anytime_paths)
+        :param start: start node
+        :param end: end node
+        :param grid: grid that stores all possible steps/tiles as 2D-list
+        :return: best path found and the number of expanded nodes, the
+            suboptimality bound of the path is stored in self.bound
+        """
+        path, self.bound = [], None
+        try:
+            for path, self.bound in self.anytime_paths(start, end, grid):
+                pass
+        except (ExecutionTimeException, ExecutionRunsException):
+            if not path:
+                raise
+        return path, self.runs
@@ -1,5 +1,7 @@
 from .a_star import AStarFinder, MAX_RUNS, TIME_LIMIT
+from .finder import OPEN_LIST_CLASS
 from ..core.diagonal_movement import DiagonalMovement
+from ..core.heap import TieBreaking
 
 
 class BestFirst(AStarFinder):
@@ -9,7 +11,9 @@ class BestFirst(AStarFinder):
     def __init__(self, heuristic=None, weight=1,
                  diagonal_movement=DiagonalMovement.never,
                  time_limit=TIME_LIMIT,
-                 max_runs=MAX_RUNS):
+                 max_runs=MAX_RUNS,
+                 open_list_class=OPEN_LIST_CLASS,
+                 tie_breaking=TieBreaking.fifo):
         """
         find shortest path using BestFirst algorithm
         :param heuristic: heuristic used to calculate distance of 2 points
@@ -22,13 +26,19 @@ class BestFirst(AStarFinder):
             (optional, only if we enter huge grids and have time constrains)
             <=0 means there are no constrains and the code might run on any
             large map.
+        :param open_list_class: priority queue used as open list
+            (see core/heap.py, defaults to IndexedHeap)
+        :param tie_breaking: order of the nodes with the same f value in
+            the open list (see TieBreaking in core/heap.py, defaults to fifo)
         """
         super(BestFirst, self).__init__(
             heuristic=heuristic,
             weight=weight,
             diagonal_movement=diagonal_movement,
             time_limit=time_limit,
-            max_runs=max_runs)
+            max_runs=max_runs,
+            open_list_class=open_list_class,
+            tie_breaking=tie_breaking)
 
         self.weighted = False
 
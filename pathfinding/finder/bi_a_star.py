@@ -1,8 +1,8 @@
 import time
 from .a_star import AStarFinder
-from .finder import BY_END, BY_START, MAX_RUNS, TIME_LIMIT
+from .finder import BY_END, BY_START, MAX_RUNS, OPEN_LIST_CLASS, TIME_LIMIT
 from ..core.diagonal_movement import DiagonalMovement
-from ..core.heap import SimpleHeap
+from ..core.heap import TieBreaking
 
 
 class BiAStarFinder(AStarFinder):
@@ -13,12 +13,14 @@ class BiAStarFinder(AStarFinder):
     def __init__(self, heuristic=None, weight=1,
                  diagonal_movement=DiagonalMovement.never,
                  time_limit=TIME_LIMIT,
-                 max_runs=MAX_RUNS):
+                 max_runs=MAX_RUNS,
+                 open_list_class=OPEN_LIST_CLASS,
+                 tie_breaking=TieBreaking.fifo):
         """
         find shortest path using Bi-A* algorithm
         :param heuristic: heuristic used to calculate distance of 2 points
             (defaults to manhattan)
-        :param weight: weight for the edges
+        :param weight: weight of the heuristic (see AStarFinder)
         :param diagonal_movement: if diagonal movement is allowed
             (see enum in diagonal_movement)
         :param time_limit: max. runtime in seconds
@@ -26,13 +28,19 @@ class BiAStarFinder(AStarFinder):
             (optional, only if we enter huge grids and have time constrains)
             <=0 means there are no constrains and the code might run on any
             large map.
+        :param open_list_class: priority queue used as open list
+            (see core/heap.py, defaults to IndexedHeap)
+        :param tie_breaking: order of the nodes with the same f value in
+            the open list (see TieBreaking in core/heap.py, defaults to fifo)
         """
         super(BiAStarFinder, self).__init__(
             heuristic=heuristic,
             weight=weight,
             diagonal_movement=diagonal_movement,
             time_limit=time_limit,
-            max_runs=max_runs)
+            max_runs=max_runs,
+            open_list_class=open_list_class,
+            tie_breaking=tie_breaking)
 
         self.weighted = False
 
@@ -48,13 +56,17 @@ class BiAStarFinder(AStarFinder):
 
         self.start_time = time.time()  # execution time limitation
         self.runs = 0  # count number of iterations
+        if self.unreachable(start, end, grid):
+            return [], self.runs
+        self.refresh_node(start)
+        self.refresh_node(end)
 
-        start_open_list = SimpleHeap(start, grid)
+        start_open_list = self.create_open_list(start, grid)
         start.g = 0
         start.f = 0
         start.opened = BY_START
 
-        end_open_list = SimpleHeap(end, grid)
+        end_open_list = self.create_open_list(end, grid)
         end.g = 0
         end.f = 0
         end.opened = BY_END
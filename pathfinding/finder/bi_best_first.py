@@ -1,6 +1,7 @@
 from .bi_a_star import BiAStarFinder
 from ..core.diagonal_movement import DiagonalMovement
-from .finder import TIME_LIMIT, MAX_RUNS
+from ..core.heap import TieBreaking
+from .finder import TIME_LIMIT, MAX_RUNS, OPEN_LIST_CLASS
 
 
 class BiBestFirstFinder(BiAStarFinder):
@@ -17,6 +18,8 @@ class BiBestFirstFinder(BiAStarFinder):
         diagonal_movement=DiagonalMovement.never,
         time_limit=TIME_LIMIT,
         max_runs=MAX_RUNS,
+        open_list_class=OPEN_LIST_CLASS,
+        tie_breaking=TieBreaking.fifo,
     ):
         """
         :param heuristic: heuristic used to calculate distance of 2 points
@@ -26,6 +29,10 @@ class BiBestFirstFinder(BiAStarFinder):
             (see enum in diagonal_movement)
         :param time_limit: max. runtime in seconds
         :param max_runs: max. amount of tries until we abort the search
+        :param open_list_class: priority queue used as open list
+            (see core/heap.py, defaults to IndexedHeap)
+        :param tie_breaking: order of the nodes with the same f value in
+            the open list (see TieBreaking in core/heap.py, defaults to fifo)
         """
         super(BiBestFirstFinder, self).__init__(
             heuristic=heuristic,
@@ -33,6 +40,8 @@ class BiBestFirstFinder(BiAStarFinder):
             diagonal_movement=diagonal_movement,
             time_limit=time_limit,
             max_runs=max_runs,
+            open_list_class=open_list_class,
+            tie_breaking=tie_breaking,
         )
 
         self.weighted = False
@@ -63,6 +63,10 @@ class BiBreadthFirstFinder(Finder):
 
         self.start_time = time.time()
         self.runs = 0
+        if self.unreachable(start, end, grid):
+            return [], self.runs
+        self.refresh_node(start)
+        self.refresh_node(end)
 
         start_queue = deque([start])
         start.opened = BY_START
@@ -1,5 +1,6 @@
-from .finder import Finder, MAX_RUNS, TIME_LIMIT
+from .finder import Finder, MAX_RUNS, OPEN_LIST_CLASS, TIME_LIMIT
 from ..core.diagonal_movement import DiagonalMovement
+from ..core.heap import TieBreaking
 from ..core.util import backtrace
 
 
@@ -10,14 +11,18 @@ class BreadthFirstFinder(Finder):
     def __init__(self, heuristic=None, weight=1,
                  diagonal_movement=DiagonalMovement.never,
                  time_limit=TIME_LIMIT,
-                 max_runs=MAX_RUNS):
+                 max_runs=MAX_RUNS,
+                 open_list_class=OPEN_LIST_CLASS,
+                 tie_breaking=TieBreaking.fifo):
         super(BreadthFirstFinder, self).__init__(
             heuristic=heuristic,
             weight=weight,
             weighted=False,
             diagonal_movement=diagonal_movement,
             time_limit=time_limit,
-            max_runs=max_runs)
+            max_runs=max_runs,
+            open_list_class=open_list_class,
+            tie_breaking=tie_breaking)
 
     def check_neighbors(self, start, end, grid, open_list):
         node = open_list.pop_node()
@@ -0,0 +1,299 @@
+import heapq
+import time
+
+from .finder import Finder, MAX_RUNS, TIME_LIMIT
+from ..core.diagonal_movement import DiagonalMovement
+from ..core.graph import Graph
+
+
+# max. number of nodes a witness search settles before it gives up (and a
+# shortcut is added, which is never wrong, just not needed)
+WITNESS_SETTLE_LIMIT = 500
+
+
+class ContractionHierarchy:
+    """
+    Contraction hierarchy of a Graph (Geisberger et al., "Contraction
+    Hierarchies: Faster and Simpler Hierarchical Routing in Road Networks",
+    2008).
+
+    All nodes are contracted one after another, ordered by the number of
+    shortcut edges they would add (edge difference). When a node is
+    contracted shortcut edges between its neighbors keep the shortest
+    paths that lead through it. Queries only need to follow edges to nodes
+    that were contracted later, from the start and from the end at the same
+    time, so they look at a tiny part of the graph.
+
+    The graph is copied, changes of the graph after the hierarchy was
+    created are not visible to it.
+    """
+    def __init__(self, graph):
+        """
+        :param graph: Graph to preprocess
+        """
+        self.graph = graph
+        ids = list(graph.nodes)
+        self.node_ids = ids
+        self.index = {node_id: i for i, node_id in enumerate(ids)}
+        count = len(ids)
+        # remaining edges of every node while contracting: index -> cost
+        out_edges = [{} for _ in range(count)]
+        in_edges = [{} for _ in range(count)]
+
+        def add(from_id, to_id, cost):
+            i, j = self.index[from_id], self.index[to_id]
+            if i != j and cost < out_edges[i].get(j, float('inf')):
+                out_edges[i][j] = cost
+                in_edges[j][i] = cost
+
+        for from_id, outgoing in graph.successors.items():
+            for to_id, (_, cost) in outgoing.items():
+                add(from_id, to_id, cost)
+                if graph.bi_directional:
+                    add(to_id, from_id, cost)
+
+        # (from, to) -> contracted node the shortcut leads through
+        self.middle = {}
+        # edges to nodes with a higher rank (for the forward search) and
+        # edges from nodes with a higher rank (for the backward search)
+        self.up = [None] * count
+        self.down = [None] * count
+        self.rank = [0] * count
+        self.shortcuts = 0
+        self._contract(out_edges, in_edges)
+
+    def _witness_costs(self, out_edges, source, skip, targets, max_cost):
+        """
+        costs of the shortest paths from source to the targets that don't
+        use skip, searching only up to max_cost
+        """
+        costs = {source: 0}
+        open_list = [(0, source)]
+        remaining = len(targets)
+        settled = 0
+        while open_list and remaining:
+            cost, node = heapq.heappop(open_list)
+            if cost > costs[node]:
+                continue
+            settled += 1
+            if settled > WITNESS_SETTLE_LIMIT:
+                break
+            if node in targets:
+                remaining -= 1
+            # edges to contracted nodes are already removed
+            for neighbor, edge_cost in out_edges[node].items():
+                new_cost = cost + edge_cost
+                if new_cost <= max_cost and neighbor != skip and \
+                        new_cost < costs.get(neighbor, max_cost + 1):
+                    costs[neighbor] = new_cost
+                    heapq.heappush(open_list, (new_cost, neighbor))
+        return costs
+
+    def _shortcuts(self, out_edges, in_edges, node):
+        """
+        shortcuts needed to contract the node as (from, to, cost)
+        """
+        shortcuts = []
+        outgoing = out_edges[node]
+        if not outgoing:
+            return shortcuts
+        max_out = max(outgoing.values())
+        for source, in_cost in in_edges[node].items():
+            costs = self._witness_costs(
+                out_edges, source, node, outgoing, in_cost + max_out)
+            for target, out_cost in outgoing.items():
+                if target == source:
+                    continue
+                cost = in_cost + out_cost
+                if costs.get(target, float('inf')) > cost:
+                    shortcuts.append((source, target, cost))
+        return shortcuts
+
+    def _priority(self, out_edges, in_edges, node, deleted_neighbors):
+        """
+        edge difference of the node (plus its contracted neighbors, so the
+        contraction spreads evenly over the graph) and its shortcuts
+        """
+        shortcuts = self._shortcuts(out_edges, in_edges, node)
+        return len(shortcuts) - len(out_edges[node]) - \
+            len(in_edges[node]) + deleted_neighbors[node], shortcuts
+
+    def _contract(self, out_edges, in_edges):
+        count = len(out_edges)
+        deleted_neighbors = [0] * count
+        queue = [(self._priority(out_edges, in_edges, node,
+                                 deleted_neighbors)[0], node)
+                 for node in range(count)]
+        heapq.heapify(queue)
+        rank = 0
+        while queue:
+            _, node = heapq.heappop(queue)
+            # lazy update: the priority might be outdated
+            priority, shortcuts = self._priority(
+                out_edges, in_edges, node, deleted_neighbors)
+            if queue and priority > queue[0][0]:
+                heapq.heappush(queue, (priority, node))
+                continue
+
+            for source, target, cost in shortcuts:
+                if cost < out_edges[source].get(target, float('inf')):
+                    out_edges[source][target] = cost
+                    in_edges[target][source] = cost
+                    self.middle[(source, target)] = node
+                    self.shortcuts += 1
+
+            # all remaining neighbors get contracted later
+            self.up[node] = list(out_edges[node].items())
+            self.down[node] = list(in_edges[node].items())
+            for neighbor in out_edges[node]:
+                in_edges[neighbor].pop(node)
+                deleted_neighbors[neighbor] += 1
+            for neighbor in in_edges[node]:
+                out_edges[neighbor].pop(node)
+                deleted_neighbors[neighbor] += 1
+            out_edges[node] = {}
+            in_edges[node] = {}
+            self.rank[node] = rank
+            rank += 1
+
+    def query(self, start_id, end_id, finder=None):
+        """
+        shortest path between two nodes
+
+        :param start_id: node id of the start
+        :param end_id: node id of the end
+        :param finder: finder that checks the time and run limits (optional)
+        :return: list of node ids (empty if there is no path), its cost
+            and the number of settled nodes
+        """
+        start = self.index[start_id]
+        end = self.index[end_id]
+        if start == end:
+            return [start_id], 0, 1
+
+        # forward search on up, backward search on down
+        costs = ({start: 0}, {end: 0})
+        parents = ({start: None}, {end: None})
+        open_lists = ([(0, start)], [(0, end)])
+        edges = (self.up, self.down)
+        settled = ({}, {})
+        best = float('inf')
+        meeting = None
+        runs = 0
+        side = 0
+        while open_lists[0] or open_lists[1]:
+            # stop a direction once it can't improve the best path
+            if not open_lists[side] or open_lists[side][0][0] >= best:
+                if not open_lists[1 - side] or \
+                        open_lists[1 - side][0][0] >= best:
+                    break
+                side = 1 - side
+                continue
+            cost, node = heapq.heappop(open_lists[side])
+            if node in settled[side]:
+                side = 1 - side
+                continue
+            settled[side][node] = cost
+            runs += 1
+            if finder is not None:
+                finder.runs = runs
+                finder.keep_running()
+            other_cost = costs[1 - side].get(node)
+            if other_cost is not None and cost + other_cost < best:
+                best = cost + other_cost
+                meeting = node
+            side_costs = costs[side]
+            for neighbor, edge_cost in edges[side][node]:
+                new_cost = cost + edge_cost
+                if new_cost < side_costs.get(neighbor, float('inf')):
+                    side_costs[neighbor] = new_cost
+                    parents[side][neighbor] = node
+                    heapq.heappush(open_lists[side], (new_cost, neighbor))
+            side = 1 - side
+
+        if meeting is None:
+            return [], None, runs
+        path = []
+        node = meeting
+        while node is not None:
+            path.append(node)
+            node = parents[0][node]
+        path.reverse()
+        node = parents[1][meeting]
+        while node is not None:
+            path.append(node)
+            node = parents[1][node]
+        return [self.node_ids[i] for i in self.unpack(path)], best, runs
+
+    def unpack(self, path):
+        """
+        replace all shortcuts in a path of node indices by the nodes they
+        lead through
+        """
+        result = [path[0]]
+        for edge in zip(path, path[1:]):
+            stack = [edge]
+            while stack:
+                source, target = stack.pop()
+                middle = self.middle.get((source, target))
+                if middle is None:
+                    result.append(target)
+                else:
+                    stack.append((middle, target))
+                    stack.append((source, middle))
+        return result
+
+
+class ContractionHierarchyFinder(Finder):
+    """
+    Find shortest paths in a Graph using a ContractionHierarchy.
+
+    The hierarchy is created by the first search (or by calling preprocess)
+    and reused as long as the same graph is searched. Call preprocess again
+    after the graph has been changed.
+    """
+    def __init__(self, diagonal_movement=DiagonalMovement.never,
+                 time_limit=TIME_LIMIT,
+                 max_runs=MAX_RUNS):
+        """
+        :param diagonal_movement: not used, graphs have no diagonals
+        :param time_limit: max. runtime in seconds
+        :param max_runs: max. amount of tries until we abort the search
+            (optional, only if we enter huge grids and have time constrains)
+            <=0 means there are no constrains and the code might run on any
+            large map.
+        """
+        super(ContractionHierarchyFinder, self).__init__(
+            diagonal_movement=diagonal_movement,
+            time_limit=time_limit,
+            max_runs=max_runs)
+        self.hierarchy = None
+
+    def preprocess(self, graph):
+        """
+        create the contraction hierarchy of the graph
+        """
+        if not isinstance(graph, Graph):
+            raise TypeError(
+                f'{self.__class__.__name__} only supports Graph, '
+                f'not {graph.__class__.__name__}')
+        self.hierarchy = ContractionHierarchy(graph)
+        return self.hierarchy
+
+    def find_path(self, start, end, graph):
+        """
+        find a path from start to end node in the graph
+        :param start: start node
+        :param end: end node
+        :param graph: the Graph
+        :return: list of nodes of the path and the number of settled nodes
+        """
+        if self.hierarchy is None or self.hierarchy.graph is not graph:
+            self.preprocess(graph)
+        self.start_time = time.time()  # execution time limitation
+        self.runs = 0  # count number of iterations
+        if self.unreachable(start, end, graph):
+            return [], self.runs
+        path, _, self.runs = self.hierarchy.query(
+            start.node_id, end.node_id, self)
+        return [graph.node(node_id) for node_id in path], self.runs
@@ -0,0 +1,285 @@
+import heapq
+import math
+import time
+
+from .finder import Finder, MAX_RUNS, TIME_LIMIT
+from ..core.diagonal_movement import DiagonalMovement
+from ..core.grid import Grid, GridListener
+from ..core.heuristic import manhattan, octile
+
+
+def _less(key_a, key_b):
+    """
+    compare two keys, values that only differ by rounding errors are the
+    same (the sums of the keys are calculated in a different order)
+    """
+    for value_a, value_b in zip(key_a, key_b):
+        if value_a == value_b:
+            continue
+        if math.isinf(value_a) or math.isinf(value_b) or \
+                abs(value_a - value_b) > 1e-9 * max(1, abs(value_b)):
+            return value_a < value_b
+    return False
+
+
+class DStarLiteFinder(Finder):
+    """
+    D* Lite by Sven Koenig and Maxim Likhachev, "D* Lite" (2002).
+
+    Searches backwards from the end and keeps its results between calls of
+    find_path. When cells of the grid change (see Grid.update_node) or the
+    start moves, only the part of the search that is affected gets repaired
+    instead of searching again from scratch.
+
+    The values of the search are kept by the finder (not in the nodes), so
+    use one finder per unit. A new search is started when the end or the
+    grid change. The finder listens to changes of its grid until reset is
+    called, a search on another grid starts or the finder gets garbage
+    collected.
+    """
+    def __init__(self, heuristic=None,
+                 diagonal_movement=DiagonalMovement.never,
+                 time_limit=TIME_LIMIT,
+                 max_runs=MAX_RUNS):
+        """
+        find shortest path and repair it when the grid changes
+        :param heuristic: heuristic used to calculate distance of 2 points
+            (defaults to manhattan or octile if diagonal movement is allowed)
+        :param diagonal_movement: if diagonal movement is allowed
+            (see enum in diagonal_movement)
+        :param time_limit: max. runtime in seconds
+        :param max_runs: max. amount of tries until we abort the search
+            (optional, only if we enter huge grids and have time constrains)
+            <=0 means there are no constrains and the code might run on any
+            large map.
+        """
+        super(DStarLiteFinder, self).__init__(
+            heuristic=heuristic,
+            diagonal_movement=diagonal_movement,
+            time_limit=time_limit,
+            max_runs=max_runs)
+        if not heuristic:
+            if diagonal_movement == DiagonalMovement.never:
+                self.heuristic = manhattan
+            else:
+                self.heuristic = octile
+        self.grid = None
+        self.goal = None
+        # subscribed to the grid (see GridListener)
+        self.listener = None
+
+    def reset(self):
+        """
+        forget the current search
+        """
+        if self.listener is not None:
+            self.grid.unsubscribe(self.listener)
+        self.grid = None
+        self.goal = None
+        self.listener = None
+
+    def _initialize(self, start, end, grid):
+        self.reset()
+        self.grid = grid
+        self.goal = (end.x, end.y)
+        self.last_start = (start.x, start.y)
+        # the heuristic must not change during a search, so the minimum
+        # weight is fixed until the next reset
+        self.min_weight = grid.min_weight if self.weighted else 1
+        self.km = 0
+        self.g = {}
+        self.rhs = {self.goal: 0}
+        # current key of every cell in the open list (others are outdated)
+        self.keys = {}
+        self.open_list = []
+        self.changed = set()
+        self._push(self.goal, self._key(self.goal))
+        self.listener = GridListener(self)
+        grid.subscribe(self.listener)
+
+    def grid_changed(self, grid, cells):
+        """
+        remember changed cells, they are updated by the next find_path
+        (see Grid.subscribe)
+        """
+        if cells is None or grid.min_weight < self.min_weight:
+            self.reset()
+        else:
+            self.update_cells(cells)
+
+    def update_cells(self, cells):
+        """
+        tell the finder that walkability or weight of cells changed
+        without using Grid.update_node
+
+        :param cells: list of (x, y) tuples
+        """
+        self.changed.update(cells)
+
+    def _h(self, cell_a, cell_b):
+        grid = self.grid
+        dx = abs(cell_a[0] - cell_b[0])
+        dy = abs(cell_a[1] - cell_b[1])
+        if grid.passable_left_right_border and dx > grid.width / 2:
+            dx = grid.width - dx
+        if grid.passable_up_down_border and dy > grid.height / 2:
+            dy = grid.height - dy
+        return self.heuristic(dx, dy) * self.min_weight
+
+    def _key(self, cell):
+        value = min(self.g.get(cell, math.inf),
+                    self.rhs.get(cell, math.inf))
+        return (value + self._h(self.start, cell) + self.km, value)
+
+    def _push(self, cell, key):
+        self.keys[cell] = key
+        heapq.heappush(self.open_list, (key, cell))
+
+    def _top(self):
+        """
+        smallest key in the open list (removes outdated entries)
+        """
+        open_list = self.open_list
+        while open_list:
+            key, cell = open_list[0]
+            if self.keys.get(cell) == key:
+                return key, cell
+            heapq.heappop(open_list)
+        return (math.inf, math.inf), None
+
+    def _neighbors(self, cell):
+        grid = self.grid
+        return [
+            neighbor for neighbor in grid.neighbors(
+                grid.node(*cell), self.diagonal_movement)
+            if neighbor.grid_id == grid.grid_id]
+
+    def _update_rhs(self, cell):
+        if cell != self.goal:
+            grid = self.grid
+            node = grid.node(*cell)
+            g = self.g
+            rhs = math.inf
+            for neighbor in self._neighbors(cell):
+                value = g.get((neighbor.x, neighbor.y), math.inf)
+                if value < math.inf:
+                    value += grid.calc_cost(node, neighbor, self.weighted)
+                    if value < rhs:
+                        rhs = value
+            self.rhs[cell] = rhs
+        self.keys.pop(cell, None)
+        if self.g.get(cell, math.inf) != self.rhs.get(cell, math.inf):
+            self._push(cell, self._key(cell))
+
+    def _compute_shortest_path(self):
+        start = self.start
+        g, rhs = self.g, self.rhs
+        # a blocked start is no neighbor of other cells, so it needs to be
+        # updated when one of its neighbors changes
+        watched = ()
+        if not self.grid.walkable(*start):
+            watched = {(node.x, node.y) for node in self._neighbors(start)}
+            self._update_rhs(start)
+        while True:
+            key, cell = self._top()
+            if cell is None or (
+                    not _less(key, self._key(start)) and
+                    rhs.get(start, math.inf) == g.get(start, math.inf)):
+                return
+            self.runs += 1
+            self.keep_running()
+            new_key = self._key(cell)
+            if key < new_key:
+                self._push(cell, new_key)
+                continue
+            heapq.heappop(self.open_list)
+            del self.keys[cell]
+            predecessors = [(node.x, node.y) for node in self._neighbors(cell)]
+            if g.get(cell, math.inf) > rhs.get(cell, math.inf):
+                g[cell] = rhs[cell]
+            else:
+                g[cell] = math.inf
+                predecessors.append(cell)
+            if cell in watched:
+                predecessors.append(start)
+            for predecessor in predecessors:
+                self._update_rhs(predecessor)
+
+    def _apply_changes(self):
+        """
+        update all cells whose edges might have changed: the changed cells
+        and their neighbors (diagonal steps depend on the cells next to
+        them)
+        """
+        grid = self.grid
+        width, height = grid.width, grid.height
+        cells = set()
+        for x, y in self.changed:
+            for dy in (-1, 0, 1):
+                for dx in (-1, 0, 1):
+                    nx, ny = x + dx, y + dy
+                    if grid.passable_left_right_border:
+                        nx %= width
+                    if grid.passable_up_down_border:
+                        ny %= height
+                    if 0 <= nx < width and 0 <= ny < height:
+                        cells.add((nx, ny))
+        self.changed = set()
+        for cell in cells:
+            self._update_rhs(cell)
+
+    def _extract_path(self):
+        grid = self.grid
+        g = self.g
+        cell = self.start
+        if g.get(cell, math.inf) == math.inf:
+            return []
+        path = [grid.node(*cell)]
+        while cell != self.goal:
+            node = path[-1]
+            best, best_cell = math.inf, None
+            for neighbor in self._neighbors(cell):
+                neighbor_cell = (neighbor.x, neighbor.y)
+                value = g.get(neighbor_cell, math.inf)
+                if value < math.inf:
+                    value += grid.calc_cost(node, neighbor, self.weighted)
+                if value < best:
+                    best, best_cell = value, neighbor_cell
+            if best_cell is None or len(path) > grid.width * grid.height:
+                return []
+            cell = best_cell
+            path.append(grid.node(*cell))
+        return path
+
+    def find_path(self, start, end, grid):
+        """
+        find a path from start to end node on grid, reusing the search of
+        the last call if the end and the grid are the same
+        :param start: start node (can move between calls)
+        :param end: end node
+        :param grid: grid that stores all possible steps/tiles as 2D-list
+        :return: list of nodes of the path and the number of expanded cells
+            in this call
+        """
+        if not isinstance(grid, Grid):
+            raise TypeError(
+                f'{self.__class__.__name__} only supports Grid, '
+                f'not {grid.__class__.__name__}')
+        self.start_time = time.time()  # execution time limitation
+        self.runs = 0  # count number of iterations
+        if self.grid is not None and self.grid is not grid:
+            # stop listening to the old grid
+            self.reset()
+        if self.unreachable(start, end, grid):
+            return [], self.runs
+        self.start = (start.x, start.y)
+        if self.grid is not grid or self.goal != (end.x, end.y) or \
+                grid.min_weight < self.min_weight:
+            self._initialize(start, end, grid)
+        else:
+            # the keys in the open list were calculated for the old start
+            self.km += self._h(self.last_start, self.start)
+            self.last_start = self.start
+            self._apply_changes()
+        self._compute_shortest_path()
+        return self._extract_path(), self.runs
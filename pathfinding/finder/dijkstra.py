@@ -1,5 +1,8 @@
 from .a_star import AStarFinder, MAX_RUNS, TIME_LIMIT
+from .distance_field import distance_field
+from .finder import OPEN_LIST_CLASS
 from ..core.diagonal_movement import DiagonalMovement
+from ..core.heap import TieBreaking
 from ..core.heuristic import null
 
 
@@ -11,13 +14,17 @@ class DijkstraFinder(AStarFinder):
     def __init__(self, weight=1,
                  diagonal_movement=DiagonalMovement.never,
                  time_limit=TIME_LIMIT,
-                 max_runs=MAX_RUNS):
+                 max_runs=MAX_RUNS,
+                 open_list_class=OPEN_LIST_CLASS,
+                 tie_breaking=TieBreaking.fifo):
         super(DijkstraFinder, self).__init__(
             heuristic=null,
             weight=weight,
             diagonal_movement=diagonal_movement,
             time_limit=time_limit,
-            max_runs=max_runs)
+            max_runs=max_runs,
+            open_list_class=open_list_class,
+            tie_breaking=tie_breaking)
 
     def apply_heuristic(self, node_a, node_b, heuristic=None, graph=None):
         """
@@ -26,3 +33,17 @@ class DijkstraFinder(AStarFinder):
         returns 0 as Dijkstra is not using any heuristic (but A* is).
         """
         return 0
+
+    def distance_field(self, goal, grid, max_cost=None, radius=None):
+        """
+        calculate the costs from all cells of the grid to the goal in one
+        pass (see distance_field.distance_field)
+
+        :param goal: goal node
+        :param grid: grid the goal belongs to
+        :param max_cost: stop the expansion at cells that cost more than this
+        :param radius: only expand cells within this distance to the goal
+        :return: DistanceField with distance, parent and direction arrays
+        """
+        return distance_field(
+            self, goal, grid, max_cost=max_cost, radius=radius)
@@ -0,0 +1,145 @@
+import time
+from ..core.grid import USE_NUMPY
+from ..core.heuristic import euclidean
+if USE_NUMPY:
+    import numpy as np
+
+
+class DistanceField:
+    """
+    Costs from every cell of a grid to one goal and the next cell on the
+    way to the goal, created by distance_field.
+
+    distance and parent are numpy arrays in the shape of the grid
+    (height, width). Cells that can't reach the goal (or are outside of the
+    cutoff) have an infinite distance and -1 as parent, parents are stored
+    as index (y * width + x).
+    """
+    def __init__(self, grid, goal, distance, parent):
+        self.grid = grid
+        self.goal = goal
+        self.distance = distance
+        self.parent = parent
+        # flat list of parents for fast lookups when we follow a path
+        self._parents = parent.ravel().tolist()
+
+        # direction to the next cell (dx, dy), -1, 0 or 1 on both axis
+        width = grid.width
+        ys, xs = np.indices(parent.shape)
+        has_parent = parent >= 0
+        self.direction = np.zeros(parent.shape + (2,), dtype=np.int8)
+        for axis, position, size, passable in (
+                (0, xs, width, grid.passable_left_right_border),
+                (1, ys, grid.height, grid.passable_up_down_border)):
+            target = parent % width if axis == 0 else parent // width
+            delta = target - position
+            if passable:
+                # step over the border
+                delta[delta > 1] = -1
+                delta[delta < -1] = 1
+            self.direction[..., axis] = np.where(has_parent, delta, 0)
+
+    def reachable(self, x, y) -> bool:
+        """
+        check, if the goal can be reached from the cell
+        """
+        return bool(np.isfinite(self.distance[y, x]))
+
+    def path(self, x, y):
+        """
+        get the path from the cell to the goal by following the parents
+        :param x: x pos
+        :param y: y pos
+        :return: list of nodes from x, y to the goal (empty if the goal
+            can't be reached)
+        """
+        if not self.reachable(x, y):
+            return []
+        grid = self.grid
+        width = grid.width
+        index = y * width + x
+        goal_index = self.goal.y * width + self.goal.x
+        path = [grid.node(x, y)]
+        while index != goal_index:
+            index = self._parents[index]
+            path.append(grid.node(index % width, index // width))
+        return path
+
+
+def _grid_distance(grid, node_a, node_b):
+    """
+    euclidean distance of two nodes, taking passable borders into account
+    """
+    dx = abs(node_a.x - node_b.x)
+    dy = abs(node_a.y - node_b.y)
+    if grid.passable_left_right_border and dx > grid.width / 2:
+        dx = grid.width - dx
+    if grid.passable_up_down_border and dy > grid.height / 2:
+        dy = grid.height - dy
+    return euclidean(dx, dy)
+
+
+def distance_field(finder, goal, grid, max_cost=None, radius=None):
+    """
+    Run Dijkstra backwards from the goal over the whole grid, so many units
+    can look up their path to the same goal without a search of their own.
+
+    Costs are calculated for moving towards the goal, so weights are used
+    the same way as by find_path. Connections to other grids are ignored.
+
+    :param finder: finder that provides diagonal movement, weighted and
+        the constrains (time_limit, max_runs), e.g. a DijkstraFinder
+    :param goal: goal node
+    :param grid: grid (or CompactGrid) the goal belongs to
+    :param max_cost: stop the expansion at cells that cost more than this
+    :param radius: only expand cells within this (euclidean) distance to
+        the goal
+    :return: DistanceField
+    """
+    if not USE_NUMPY:
+        raise ImportError('numpy is required to create a distance field')
+
+    finder.clean_grid(grid)
+    finder.start_time = time.time()  # execution time limitation
+    finder.runs = 0  # count number of iterations
+    finder.refresh_node(goal)
+    goal.opened = True
+
+    width = grid.width
+    distance = np.full((grid.height, grid.width), np.inf)
+    parent = np.full((grid.height, grid.width), -1, dtype=np.int64)
+
+    open_list = finder.create_open_list(goal, grid)
+    while len(open_list) > 0:
+        finder.runs += 1
+        finder.keep_running()
+
+        node = open_list.pop_node()
+        if max_cost is not None and node.g > max_cost:
+            # all other nodes in the open list cost even more
+            break
+        node.closed = True
+        distance[node.y, node.x] = node.g
+        if node.parent:
+            parent[node.y, node.x] = node.parent.y * width + node.parent.x
+
+        for neighbor in finder.find_neighbors(grid, node):
+            if neighbor.closed or neighbor.grid_id != goal.grid_id:
+                continue
+            if radius is not None and \
+                    _grid_distance(grid, neighbor, goal) > radius:
+                continue
+            # cost to move from the neighbor to the node
+            ng = node.g + grid.calc_cost(neighbor, node, finder.weighted)
+            if not neighbor.opened or ng < neighbor.g:
+                old_f = neighbor.f
+                neighbor.g = ng
+                neighbor.f = ng
+                neighbor.parent = node
+                if not neighbor.opened:
+                    open_list.push_node(neighbor)
+                    neighbor.opened = True
+                else:
+                    open_list.update_node(neighbor, old_f)
+
+    return DistanceField(grid, goal, distance, parent)
@@ -1,18 +1,66 @@
+import itertools
+import multiprocessing
 import time  # for time limitation
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from ..core.grid import Grid
 from ..core.diagonal_movement import DiagonalMovement
-from ..core.heap import SimpleHeap
+from ..core.heap import IndexedHeap, TieBreaking, node_key_function
+from ..core.world import World
 
 
 # max. amount of tries we iterate until we abort the search
 MAX_RUNS = float('inf')
 # max. time after we until we abort the search (in seconds)
 TIME_LIMIT = float('inf')
+# priority queue used as open list (see core/heap.py)
+OPEN_LIST_CLASS = IndexedHeap
 
 # used for backtrace of bi-directional A*
 BY_START = 1
 BY_END = 2
 
+# every search gets its own id, values stored on the nodes by an older
+# search are ignored (see Finder.clean_grid)
+SEARCH_IDS = itertools.count(1)
+
+
+# finder and grid of a worker process (see Finder.find_paths)
+_worker_state = None
+
+
+def node_by_key(grid, key):
+    """
+    get the node of the grid by its key (see heap.node_key_function)
+    """
+    if isinstance(grid, World):
+        x, y, grid_id = key
+        return grid.grids[grid_id].node(x, y)
+    if isinstance(grid, Grid):
+        return grid.node(*key)
+    return grid.node(key)
+
+
+def _init_worker(finder, grid):
+    global _worker_state
+    _worker_state = (finder, grid)
+
+
+def _find_paths_worker(queries):
+    """
+    answer a chunk of queries in a worker process, nodes are sent as keys.
+    """
+    finder, grid = _worker_state
+    key = node_key_function(grid)
+    results = []
+    for index, start_key, end_key in queries:
+        start_time = time.perf_counter()
+        path, runs = finder.find_path(
+            node_by_key(grid, start_key), node_by_key(grid, end_key), grid)
+        results.append((
+            index, [key(node) for node in path], runs,
+            time.perf_counter() - start_time))
+    return results
+
 
 class ExecutionTimeException(Exception):
     """
@@ -35,12 +83,14 @@ class Finder:
                  diagonal_movement: int = DiagonalMovement.never,
                  weighted: bool = True,
                  time_limit: float = TIME_LIMIT,
-                 max_runs: int = MAX_RUNS):
+                 max_runs: int = MAX_RUNS,
+                 open_list_class: type = OPEN_LIST_CLASS,
+                 tie_breaking: int = TieBreaking.fifo):
         """
         Find shortest path
         :param heuristic: heuristic used to calculate distance of 2 points
             (defaults to manhattan)
-        :param weight: weight for the edges
+        :param weight: weight of the heuristic (see process_node)
         :param diagonal_movement: if diagonal movement is allowed
             (see enum in diagonal_movement)
         :param weighted: the algorithm supports weighted nodes
@@ -50,6 +100,10 @@ class Finder:
             (optional, only if we enter huge grids and have time constrains)
             <=0 means there are no constrains and the code might run on any
             large map.
+        :param open_list_class: priority queue used as open list
+            (see core/heap.py, defaults to IndexedHeap)
+        :param tie_breaking: order of the nodes with the same f value in
+            the open list (see TieBreaking in core/heap.py, defaults to fifo)
         """
         self.time_limit = time_limit
         self.max_runs = max_runs
@@ -58,9 +112,23 @@ class Finder:
         self.diagonal_movement = diagonal_movement
         self.weight = weight
         self.heuristic = heuristic
+        self.open_list_class = open_list_class
+        self.tie_breaking = tie_breaking
 
         self.start_time = 0  # execution time limitation
         self.runs = 0  # count number of iterations
+        self.search_id = 0  # id of the current search
+        # heuristic function of the current search for every end node
+        # (see process_node)
+        self._estimates = {}
+
+    def create_open_list(self, node, grid):
+        """
+        create an open list (see open_list_class) that contains the node
+        """
+        if self.tie_breaking == TieBreaking.fifo:
+            return self.open_list_class(node, grid)
+        return self.open_list_class(node, grid, self.tie_breaking)
 
     def apply_heuristic(self, node_a, node_b, heuristic=None, graph=None):
         """
@@ -69,6 +137,11 @@ class Finder:
         if not heuristic:
             heuristic = self.heuristic
 
+        if hasattr(heuristic, 'estimate'):
+            # heuristic that knows the nodes (e.g. core.landmarks.Landmarks),
+            # its costs already contain the weights
+            return heuristic.estimate(node_a, node_b)
+
         dx = abs(node_a.x - node_b.x)
         dy = abs(node_a.y - node_b.y)
 
@@ -88,13 +161,57 @@ class Finder:
         else:
             return heuristic(dx, dy)
 
+    def heuristic_function(self, end, graph):
+        """
+        function that estimates the cost from a node to end like
+        apply_heuristic, but the checks are only done once (for finders that
+        estimate the same node many times, e.g. IDA*)
+        """
+        heuristic = self.heuristic
+        if hasattr(heuristic, 'estimate') or not isinstance(graph, Grid) or \
+                type(self).apply_heuristic is not Finder.apply_heuristic:
+            return lambda node: self.apply_heuristic(node, end, graph=graph)
+
+        end_x, end_y = end.x, end.y
+        width, height = graph.width, graph.height
+        wrap_x = graph.passable_left_right_border
+        wrap_y = graph.passable_up_down_border
+        scale = graph.min_weight if self.weighted else 1
+
+        def estimate(node):
+            dx = abs(node.x - end_x)
+            dy = abs(node.y - end_y)
+            if wrap_x and dx > width / 2:
+                dx = width - dx
+            if wrap_y and dy > height / 2:
+                dy = height - dy
+            return heuristic(dx, dy) * scale
+        return estimate
+
     def find_neighbors(self, grid, node, diagonal_movement=None):
         '''
         Find neighbor, same for Djikstra, A*, Bi-A*, IDA*
         '''
         if not diagonal_movement:
             diagonal_movement = self.diagonal_movement
-        return grid.neighbors(node, diagonal_movement=diagonal_movement)
+        neighbors = grid.neighbors(node, diagonal_movement=diagonal_movement)
+        # reset values that are left over from a previous search
+        search_id = self.search_id
+        for neighbor in neighbors:
+            if neighbor.search_id != search_id:
+                neighbor.cleanup()
+                neighbor.search_id = search_id
+        return neighbors
+
+    def unreachable(self, start, end, graph) -> bool:
+        """
+        check if end can't be reached from start without searching, using
+        the connected components of the grid or graph (see Grid.connected)
+        """
+        connected = getattr(graph, 'connected', None)
+        if connected is None:
+            return False
+        return not connected(start, end, self.diagonal_movement)
 
     def keep_running(self):
         """
@@ -133,9 +250,16 @@ class Finder:
         if not node.opened or ng < node.g:
             old_f = node.f
             node.g = ng
-            node.h = node.h or self.apply_heuristic(node, end, graph=graph)
-            # f is the estimated total cost from start to goal
-            node.f = node.g + node.h
+            if not node.h:
+                # the heuristic only gets checked once per search and end
+                estimate = self._estimates.get(end)
+                if estimate is None:
+                    estimate = self.heuristic_function(end, graph)
+                    self._estimates[end] = estimate
+                node.h = estimate(node)
+            # f is the estimated total cost from start to goal, a weight
+            # bigger than 1 prefers nodes close to the goal (weighted A*)
+            node.f = node.g + node.h * self.weight
             node.parent = parent
             if not node.opened:
                 open_list.push_node(node)
@@ -144,8 +268,7 @@ class Finder:
                 # the node can be reached with smaller cost.
                 # Since its f value has been updated, we have to
                 # update its position in the open list
-                open_list.remove_node(node, old_f)
-                open_list.push_node(node)
+                open_list.update_node(node, old_f)
 
     def check_neighbors(self, start, end, graph, open_list,
                         open_value=True, backtrace_by=None):
@@ -162,11 +285,26 @@ class Finder:
             'Please implement check_neighbors in your finder')
 
     def clean_grid(self, grid):
-        """Clean the map if needed."""
-        if grid.dirty:
-            grid.cleanup()
+        """
+        Start a new search on the map.
+
+        Instead of resetting all nodes of the map (see grid.cleanup) the
+        search gets a new id. Nodes are reset when a finder reaches them for
+        the first time in this search (see find_neighbors and refresh_node),
+        so values stored by older searches count as unvisited.
+        """
+        self.search_id = next(SEARCH_IDS)
+        self._estimates = {}
         grid.dirty = True
 
+    def refresh_node(self, node):
+        """
+        Reset the node if its values belong to an older search.
+        """
+        if node.search_id != self.search_id:
+            node.cleanup()
+            node.search_id = self.search_id
+
     def find_path(self, start, end, grid):
         """
         Find a path from start to end node on grid by iterating over
@@ -181,9 +319,13 @@ class Finder:
 
         self.start_time = time.time()  # execution time limitation
         self.runs = 0  # count number of iterations
+        if self.unreachable(start, end, grid):
+            return [], self.runs
+        self.refresh_node(start)
+        self.refresh_node(end)
         start.opened = True
 
-        open_list = SimpleHeap(start, grid)
+        open_list = self.create_open_list(start, grid)
 
         while len(open_list) > 0:
             self.runs += 1
@@ -196,6 +338,62 @@ class Finder:
         # failed to find path
         return [], self.runs
 
+    def find_paths(self, pairs, grid, workers=1, ordered=True, chunk_size=16):
+        """
+        Find paths for many (start, end) pairs on the same grid.
+
+        With more than one worker the queries are answered by a pool of
+        processes, the grid is sent to every worker only once (it gets
+        inherited when the processes are forked), after that only the keys
+        of the nodes are sent.
+
+        :param pairs: iterable of (start, end) node pairs
+        :param grid: grid, graph or world the nodes belong to
+        :param workers: number of worker processes (1 uses no processes)
+        :param ordered: yield results in the order of the pairs, otherwise
+            as soon as they are found
+        :param chunk_size: number of queries sent to a worker at once
+        :return: generator of (index, path, runs, time) for every pair,
+            index is the position of the pair, time is in seconds
+        """
+        if workers <= 1:
+            for index, (start, end) in enumerate(pairs):
+                start_time = time.perf_counter()
+                path, runs = self.find_path(start, end, grid)
+                yield index, path, runs, time.perf_counter() - start_time
+            return
+
+        key = node_key_function(grid)
+        queries = [(index, key(start), key(end))
+                   for index, (start, end) in enumerate(pairs)]
+        context = None
+        if 'fork' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(
+                max_workers=workers, mp_context=context,
+                initializer=_init_worker,
+                initargs=(self, grid)) as executor:
+            futures = [
+                executor.submit(
+                    _find_paths_worker, queries[i:i + chunk_size])
+                for i in range(0, len(queries), chunk_size)]
+            try:
+                for future in futures if ordered else as_completed(futures):
+                    for index, path, runs, duration in future.result():
+                        path = [node_by_key(grid, node) for node in path]
+                        yield index, path, runs, duration
+            finally:
+                # the caller stopped early or a query failed
+                for future in futures:
+                    future.cancel()
+
+    def __getstate__(self):
+        # the heuristic functions of a search (see process_node) can't be
+        # pickled, they get created again by the next search
+        state = self.__dict__.copy()
+        state['_estimates'] = {}
+        return state
+
     def __repr__(self):
         """
         Return a human readable representation
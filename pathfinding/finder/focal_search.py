@@ -0,0 +1,171 @@
+import heapq
+import itertools
+import time
+
+from .a_star import AStarFinder
+from .finder import MAX_RUNS, OPEN_LIST_CLASS, TIME_LIMIT
+from ..core.diagonal_movement import DiagonalMovement
+from ..core.heap import TieBreaking, tie_breaking_function
+from ..core.util import backtrace
+
+# values of node.opened
+IN_OPEN = 1
+IN_FOCAL = 2
+
+
+class FocalSearchFinder(AStarFinder):
+    """
+    Focal search (A*epsilon by Judea Pearl and Jin H. Kim, "Studies in
+    Semi-Admissible Heuristics", 1982).
+
+    Like A* the open nodes are ordered by f = g + h, but the next node is
+    taken from the focal list: all open nodes with an f value of at most
+    weight times the smallest f value. Of those the node with the smallest
+    g + weight * h (the order of weighted A*) is expanded, so the search
+    heads for the end while the path costs at most weight times the cost of
+    the shortest path.
+    """
+    def __init__(self, heuristic=None, weight=1.2,
+                 diagonal_movement=DiagonalMovement.never,
+                 time_limit=TIME_LIMIT,
+                 max_runs=MAX_RUNS,
+                 open_list_class=OPEN_LIST_CLASS,
+                 tie_breaking=TieBreaking.fifo):
+        """
+        find a path that costs at most weight times the shortest path
+        :param heuristic: heuristic used to calculate distance of 2 points
+            (defaults to manhattan or octile if diagonal movement is allowed)
+        :param weight: suboptimality bound (>= 1)
+        :param diagonal_movement: if diagonal movement is allowed
+            (see enum in diagonal_movement)
+        :param time_limit: max. runtime in seconds
+        :param max_runs: max. amount of tries until we abort the search
+            (optional, only if we enter huge grids and have time constrains)
+            <=0 means there are no constrains and the code might run on any
+            large map.
+        :param open_list_class: priority queue used for the open nodes
+            that are not part of the focal list (see core/heap.py, defaults
+            to IndexedHeap)
+        :param tie_breaking: order of the nodes with the same f value in
+            the open list and of the nodes with the same g + weight * h in
+            the focal list (see TieBreaking in core/heap.py, defaults to
+            fifo, the focal list prefers the smaller h before that)
+        """
+        super(FocalSearchFinder, self).__init__(
+            heuristic=heuristic,
+            weight=weight,
+            diagonal_movement=diagonal_movement,
+            time_limit=time_limit,
+            max_runs=max_runs,
+            open_list_class=open_list_class,
+            tie_breaking=tie_breaking)
+
+    def _push(self, node, f_min, grid):
+        if node.f <= self.weight * f_min:
+            node.opened = IN_FOCAL
+            heapq.heappush(self.focal, (
+                node.g + self.weight * node.h,
+                self.focal_tie(node) if self.focal_tie else node.h,
+                next(self.order) * self.order_step, node))
+            heapq.heappush(self.focal_f, (node.f, next(self.order), node))
+        else:
+            node.opened = IN_OPEN
+            if self.open_list is None:
+                self.open_list = self.create_open_list(node, grid)
+            else:
+                self.open_list.push_node(node)
+            self.open_count += 1
+
+    def _pop_open(self):
+        """
+        node with the smallest f value of the open list or None
+        """
+        if not self.open_count:
+            return None
+        self.open_count -= 1
+        return self.open_list.pop_node()
+
+    def _focal_f_min(self):
+        """
+        smallest f value of the focal list (removes outdated entries)
+        """
+        heap = self.focal_f
+        while heap:
+            f, _, node = heap[0]
+            if node.opened == IN_FOCAL and not node.closed and f == node.f:
+                return f
+            heapq.heappop(heap)
+        return None
+
+    def find_path(self, start, end, grid):
+        """
+        find a path from start to end node on grid using focal search
+        :param start: start node
+        :param end: end node
+        :param grid: grid that stores all possible steps/tiles as 2D-list
+        :return: list of nodes of the path and the number of expanded nodes
+        """
+        self.clean_grid(grid)
+        self.start_time = time.time()  # execution time limitation
+        self.runs = 0  # count number of iterations
+        if self.unreachable(start, end, grid):
+            return [], self.runs
+        self.refresh_node(start)
+        self.refresh_node(end)
+
+        # open nodes that are not part of the focal list ordered by f (see
+        # open_list_class), nodes of the focal list ordered by
+        # g + weight * h and by f (for the smallest f)
+        self.open_list, self.focal, self.focal_f = None, [], []
+        self.open_count = 0
+        self.focal_tie = tie_breaking_function(self.tie_breaking)
+        self.order_step = -1 if self.tie_breaking == TieBreaking.lifo else 1
+        self.order = itertools.count()
+        start.g = 0
+        start.h = self.apply_heuristic(start, end, graph=grid)
+        start.f = start.h
+        self._push(start, start.f, grid)
+
+        while True:
+            f_min = self._focal_f_min()
+            top = self._pop_open()
+            if top is not None and (f_min is None or top.f < f_min):
+                f_min = top.f
+            if f_min is None:
+                # failed to find path
+                return [], self.runs
+            # the smallest f value only grows, move all nodes that are
+            # within the bound now to the focal list
+            while top is not None and top.f <= self.weight * f_min:
+                self._push(top, f_min, grid)
+                top = self._pop_open()
+            if top is not None:
+                self.open_list.push_node(top)
+                self.open_count += 1
+
+            key, _, _, node = heapq.heappop(self.focal)
+            if node.opened != IN_FOCAL or node.closed or \
+                    key != node.g + self.weight * node.h:
+                continue
+            self.runs += 1
+            self.keep_running()
+            node.closed = True
+            if node == end:
+                return backtrace(end), self.runs
+
+            for neighbor in self.find_neighbors(grid, node):
+                ng = node.g + grid.calc_cost(node, neighbor, self.weighted)
+                if neighbor.opened and ng >= neighbor.g:
+                    continue
+                if neighbor.opened == IN_OPEN:
+                    self.open_list.remove_node(neighbor, neighbor.f)
+                    self.open_count -= 1
+                neighbor.g = ng
+                neighbor.h = neighbor.h or self.apply_heuristic(
+                    neighbor, end, graph=grid)
+                neighbor.f = ng + neighbor.h
+                neighbor.parent = node
+                # nodes are opened again if a cheaper way to them is found,
+                # otherwise the bound would not hold
+                neighbor.closed = False
+                self._push(neighbor, f_min, grid)
@@ -0,0 +1,116 @@
+import time
+
+from .finder import Finder, MAX_RUNS, TIME_LIMIT
+from ..core.diagonal_movement import DiagonalMovement
+from ..core.heuristic import manhattan, octile
+from ..core.util import backtrace
+
+
+class FringeSearchFinder(Finder):
+    """
+    Fringe Search by Yngvi Björnsson, Markus Enzenberger, Robert C. Holte
+    and Jonathan Schaeffer, "Fringe Search: Beating A* at Pathfinding on
+    Game Maps" (2005).
+
+    Like IDA* the nodes are searched depth-first up to a threshold of the
+    estimated path cost, but the fringe of the search is kept between the
+    iterations so nodes are not searched again from the start. The open
+    nodes are kept in two lists (now and later) instead of a priority
+    queue and the cost of visited nodes is cached on the nodes.
+    """
+    def __init__(self, heuristic=None, weight=1,
+                 diagonal_movement=DiagonalMovement.never,
+                 time_limit=TIME_LIMIT,
+                 max_runs=MAX_RUNS):
+        """
+        find shortest path using Fringe Search
+        :param heuristic: heuristic used to calculate distance of 2 points
+            (defaults to manhattan or octile if diagonal movement is allowed)
+        :param weight: weight of the heuristic
+        :param diagonal_movement: if diagonal movement is allowed
+            (see enum in diagonal_movement)
+        :param time_limit: max. runtime in seconds
+        :param max_runs: max. amount of tries until we abort the search
+            (optional, only if we enter huge grids and have time constrains)
+            <=0 means there are no constrains and the code might run on any
+            large map.
+        """
+        super(FringeSearchFinder, self).__init__(
+            heuristic=heuristic, weight=weight,
+            diagonal_movement=diagonal_movement,
+            time_limit=time_limit,
+            max_runs=max_runs)
+        if not heuristic:
+            if diagonal_movement == DiagonalMovement.never:
+                self.heuristic = manhattan
+            else:
+                # When diagonal movement is allowed the manhattan heuristic is
+                # not admissible it should be octile instead
+                self.heuristic = octile
+
+    def find_path(self, start, end, grid):
+        """
+        find a path from start to end node on grid using Fringe Search
+        :param start: start node
+        :param end: end node
+        :param grid: grid that stores all possible steps/tiles as 2D-list
+        :return: list of nodes of the path and the number of expanded nodes
+        """
+        self.clean_grid(grid)
+        self.start_time = time.time()  # execution time limitation
+        self.runs = 0  # count number of iterations
+        if self.unreachable(start, end, grid):
+            return [], self.runs
+        self.refresh_node(start)
+        self.refresh_node(end)
+
+        estimate = self.heuristic_function(end, grid)
+        weight = self.weight
+        start.g = 0
+        start.h = estimate(start)
+        start.opened = True
+        threshold = start.h * weight
+
+        # entries are (g, node), an entry is outdated if the node has been
+        # expanded or reached with a smaller cost since it was added.
+        # node.opened marks nodes in the fringe, node.closed nodes that
+        # have been expanded.
+        now = [(0, start)]
+        while now:
+            later = []
+            next_threshold = float('inf')
+            while now:
+                g, node = now.pop()
+                if not node.opened or g != node.g:
+                    continue
+                f = g + node.h * weight
+                if f > threshold:
+                    # search it in the next iteration
+                    if f < next_threshold:
+                        next_threshold = f
+                    later.append((g, node))
+                    continue
+                if node == end:
+                    return backtrace(end), self.runs
+
+                self.runs += 1
+                self.keep_running()
+                node.opened = False
+                node.closed = True
+                # the first neighbor is searched next (depth-first)
+                for neighbor in reversed(self.find_neighbors(grid, node)):
+                    ng = g + grid.calc_cost(node, neighbor, self.weighted)
+                    if (neighbor.opened or neighbor.closed) and \
+                            ng >= neighbor.g:
+                        continue
+                    neighbor.g = ng
+                    neighbor.h = neighbor.h or estimate(neighbor)
+                    neighbor.parent = node
+                    neighbor.opened = True
+                    now.append((ng, neighbor))
+            threshold = next_threshold
+            later.reverse()
+            now = later
+
+        # failed to find path
+        return [], self.runs
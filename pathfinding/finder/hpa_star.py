@@ -0,0 +1,654 @@
+import heapq
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from .a_star import AStarFinder
+from .finder import Finder, MAX_RUNS, OPEN_LIST_CLASS, TIME_LIMIT
+from ..core.diagonal_movement import DiagonalMovement
+from ..core.graph import Graph
+from ..core.heap import TieBreaking
+from ..core.heuristic import manhattan, octile
+from ..core.node import GraphNode
+
+
+# entrances that are at least this wide get a transition at both ends
+# instead of one in the middle (see Botea et al.)
+WIDE_ENTRANCE = 6
+
+# cluster offsets of the borders to the east, south and the south-east and
+# south-west corners
+BORDER_OFFSETS = {'E': (1, 0), 'S': (0, 1), 'SE': (1, 1), 'SW': (-1, 1)}
+
+# grid, diagonal movement and weighted of a worker process
+_worker_state = None
+
+
+class AbstractNode(GraphNode):
+    """
+    node of the abstract graph, it represents the cell x, y of the grid.
+    """
+    def __init__(self, x, y):
+        super(AbstractNode, self).__init__(node_id=(x, y))
+        self.x = x
+        self.y = y
+
+
+def cluster_search(grid, source, bounds, diagonal_movement, weighted,
+                   targets=None, reverse=False):
+    """
+    Dijkstra from source that stays inside bounds (min_x, min_y, max_x,
+    max_y). Only reads from the grid, so it can run in worker processes.
+
+    :param source: (x, y) of the start cell
+    :param targets: stop as soon as all these cells were reached
+    :param reverse: use the costs of moving towards the source
+    :return: dict of costs by (x, y), dict of parents by (x, y) and the
+        number of expanded cells
+    """
+    min_x, min_y, max_x, max_y = bounds
+    costs = {source: 0}
+    parents = {}
+    remaining = set(targets) if targets is not None else None
+    open_list = [(0, source)]
+    closed = set()
+    expanded = 0
+    while open_list:
+        cost, position = heapq.heappop(open_list)
+        if position in closed:
+            continue
+        closed.add(position)
+        expanded += 1
+        if remaining is not None:
+            remaining.discard(position)
+            if not remaining:
+                break
+        node = grid.node(*position)
+        for neighbor in grid.neighbors(node, diagonal_movement):
+            x, y = neighbor.x, neighbor.y
+            if not (min_x <= x < max_x and min_y <= y < max_y) or \
+                    neighbor.grid_id != grid.grid_id or (x, y) in closed:
+                continue
+            if reverse:
+                step = grid.calc_cost(neighbor, node, weighted)
+            else:
+                step = grid.calc_cost(node, neighbor, weighted)
+            if (x, y) not in costs or cost + step < costs[(x, y)]:
+                costs[(x, y)] = cost + step
+                parents[(x, y)] = position
+                heapq.heappush(open_list, (cost + step, (x, y)))
+    return {position: costs[position] for position in closed}, parents, \
+        expanded
+
+
+def intra_cluster_edges(grid, bounds, entrances, diagonal_movement,
+                        weighted):
+    """
+    costs between all entrances of a cluster
+
+    :return: list of (from, to, cost) with (x, y) of the entrances
+    """
+    edges = []
+    for entrance in entrances:
+        others = [other for other in entrances if other != entrance]
+        if not others:
+            continue
+        costs, _, _ = cluster_search(
+            grid, entrance, bounds, diagonal_movement, weighted,
+            targets=others)
+        for other in others:
+            if other in costs:
+                edges.append((entrance, other, costs[other]))
+    return edges
+
+
+def _init_worker(grid, diagonal_movement, weighted):
+    global _worker_state
+    _worker_state = (grid, diagonal_movement, weighted)
+
+
+def _intra_cluster_worker(tasks):
+    grid, diagonal_movement, weighted = _worker_state
+    return [(cluster, intra_cluster_edges(
+        grid, bounds, entrances, diagonal_movement, weighted))
+        for cluster, bounds, entrances in tasks]
+
+
+class _QueryGraph(Graph):
+    """
+    the abstract graph with the start and end node of one query, the
+    abstract graph itself is not changed.
+    """
+    def __init__(self, graph, extra_edges):
+        self.graph = graph
+        # node id -> {node id: (node, cost)} like Graph.successors
+        self.extra_edges = extra_edges
+        self.bi_directional = False
+        self.dirty = False
+
+    def neighbors(self, node, **kwargs):
+        nodes = self.graph.neighbors(node)
+        extra = self.extra_edges.get(node.node_id)
+        if extra:
+            nodes = nodes + [entry[0] for entry in extra.values()]
+        return nodes
+
+    def calc_cost(self, node_a, node_b, _weighted=False):
+        costs = [
+            entry[1] for entry in (
+                self.graph.successors.get(node_a.node_id, {}).get(
+                    node_b.node_id),
+                self.extra_edges.get(node_a.node_id, {}).get(
+                    node_b.node_id))
+            if entry is not None]
+        if not costs:
+            raise RuntimeError('not connected')
+        return min(costs)
+
+    def connected(self, node_a, node_b, diagonal_movement=None) -> bool:
+        # already checked on the grid (see HPAStarFinder.find_path)
+        return True
+
+
+class ClusterGraph:
+    """
+    Abstract graph of a grid for hierarchical pathfinding (HPA*).
+
+    The grid is split into clusters of cluster_size x cluster_size cells.
+    Where walkable cells of two neighboring clusters touch, transitions
+    (pairs of entrance cells) are created, entrances of the same cluster are
+    connected by edges with the cost of the shortest path inside the
+    cluster.
+
+    The cluster graph subscribes to the grid, if cells change (see
+    Grid.update_node) only the clusters around them are recomputed.
+    Connections to other grids are not supported.
+    """
+    def __init__(self, grid, cluster_size=10,
+                 diagonal_movement=DiagonalMovement.never, weighted=True,
+                 workers=1):
+        """
+        :param grid: the grid
+        :param cluster_size: width and height of the clusters
+        :param diagonal_movement: if diagonal movement is allowed
+            (see enum in diagonal_movement)
+        :param weighted: use the weights of the grid
+        :param workers: number of processes to compute the costs inside of
+            the clusters (1 uses no processes)
+        """
+        self.grid = grid
+        self.cluster_size = cluster_size
+        self.diagonal_movement = diagonal_movement
+        self.weighted = weighted
+        self.build(workers)
+        grid.subscribe(self.grid_changed)
+
+    def close(self):
+        """
+        stop listening to changes of the grid
+        """
+        self.grid.unsubscribe(self.grid_changed)
+
+    def cluster(self, x, y):
+        return x // self.cluster_size, y // self.cluster_size
+
+    def bounds(self, cluster):
+        cx, cy = cluster
+        size = self.cluster_size
+        return (cx * size, cy * size,
+                min((cx + 1) * size, self.grid.width),
+                min((cy + 1) * size, self.grid.height))
+
+    def build(self, workers=1):
+        """
+        (re)create the whole abstract graph
+        """
+        grid = self.grid
+        self.clusters_x = -(-grid.width // self.cluster_size)
+        self.clusters_y = -(-grid.height // self.cluster_size)
+        self.graph = Graph()
+        # border key -> list of ((x, y), (x, y)) transitions
+        self.transitions = {}
+        # cluster -> set of (x, y) of its entrances
+        self.entrances = {}
+        # cluster -> list of (from, to) of its intra-cluster edges
+        self.intra_edges = {}
+
+        for border in self._all_borders():
+            self._add_transitions(border)
+        clusters = [(cx, cy) for cy in range(self.clusters_y)
+                    for cx in range(self.clusters_x)]
+        for cluster in clusters:
+            self.entrances[cluster] = self._cluster_entrances(cluster)
+
+        tasks = [(cluster, self.bounds(cluster),
+                  sorted(self.entrances[cluster]))
+                 for cluster in clusters if len(self.entrances[cluster]) > 1]
+        if workers <= 1:
+            results = [(cluster, intra_cluster_edges(
+                grid, bounds, entrances, self.diagonal_movement,
+                self.weighted)) for cluster, bounds, entrances in tasks]
+        else:
+            results = self._parallel_intra_edges(tasks, workers)
+        for cluster, edges in results:
+            self._add_intra_edges(cluster, edges)
+
+    def _parallel_intra_edges(self, tasks, workers, chunk_size=64):
+        context = None
+        if 'fork' in multiprocessing.get_all_start_methods():
+            context = multiprocessing.get_context('fork')
+        with ProcessPoolExecutor(
+                max_workers=workers, mp_context=context,
+                initializer=_init_worker,
+                initargs=(self.grid, self.diagonal_movement,
+                          self.weighted)) as executor:
+            chunks = [tasks[i:i + chunk_size]
+                      for i in range(0, len(tasks), chunk_size)]
+            results = []
+            for chunk_result in executor.map(_intra_cluster_worker, chunks):
+                results.extend(chunk_result)
+        return results
+
+    def _directions(self):
+        if self.diagonal_movement == DiagonalMovement.never:
+            return ('E', 'S')
+        # diagonal steps over the corners of the clusters
+        return ('E', 'S', 'SE', 'SW')
+
+    def _all_borders(self):
+        for cy in range(self.clusters_y):
+            for cx in range(self.clusters_x):
+                for direction in self._directions():
+                    border = (cx, cy, direction)
+                    if self._neighbor_cluster(border) is not None:
+                        yield border
+
+    def _neighbor_cluster(self, border):
+        """
+        the cluster on the other side of the border (east, south or the
+        corners south-east and south-west), None if there is none
+        """
+        cx, cy, direction = border
+        dx, dy = BORDER_OFFSETS[direction]
+        x, y = cx + dx, cy + dy
+        if not 0 <= x < self.clusters_x:
+            if not self.grid.passable_left_right_border or \
+                    self.clusters_x < 2:
+                return None
+            x %= self.clusters_x
+        if not 0 <= y < self.clusters_y:
+            if not self.grid.passable_up_down_border or self.clusters_y < 2:
+                return None
+            y %= self.clusters_y
+        return x, y
+
+    def _cluster_borders(self, cluster):
+        """
+        all existing borders of the cluster
+        """
+        cx, cy = cluster
+        borders = []
+        for direction in self._directions():
+            dx, dy = BORDER_OFFSETS[direction]
+            for border in ((cx, cy, direction),
+                           ((cx - dx) % self.clusters_x,
+                            (cy - dy) % self.clusters_y, direction)):
+                neighbor = self._neighbor_cluster(border)
+                if border not in borders and neighbor is not None and (
+                        border[:2] == cluster or neighbor == cluster):
+                    borders.append(border)
+        return borders
+
+    def _border_cells(self, border):
+        """
+        pairs of cells on both sides of the border that are next to each
+        other (without diagonal steps)
+        """
+        cx, cy, direction = border
+        min_x, min_y, max_x, max_y = self.bounds((cx, cy))
+        other_min_x, other_min_y, other_max_x, _ = self.bounds(
+            self._neighbor_cluster(border))
+        if direction == 'E':
+            return [((max_x - 1, y), (other_min_x, y))
+                    for y in range(min_y, max_y)]
+        if direction == 'S':
+            return [((x, max_y - 1), (x, other_min_y))
+                    for x in range(min_x, max_x)]
+        if direction == 'SE':
+            return [((max_x - 1, max_y - 1), (other_min_x, other_min_y))]
+        return [((min_x, max_y - 1), (other_max_x - 1, other_min_y))]
+
+    def _diagonal_pairs(self, border, pairs):
+        """
+        diagonal steps over an east or south border that start or end at
+        a cell that can't go straight over the border
+        """
+        grid = self.grid
+        covered = {cell for pair in pairs for cell in pair}
+        other = self._neighbor_cluster(border)
+        diagonals = []
+        for cell_a, _ in self._border_cells(border):
+            if not grid.walkable(*cell_a):
+                continue
+            node_a = grid.node(*cell_a)
+            for node_b in grid.neighbors(node_a, self.diagonal_movement):
+                cell_b = (node_b.x, node_b.y)
+                if node_b.grid_id != grid.grid_id or \
+                        self.cluster(*cell_b) != other or \
+                        cell_a[0] == cell_b[0] or cell_a[1] == cell_b[1]:
+                    continue
+                if cell_a not in covered or cell_b not in covered:
+                    diagonals.append((cell_a, cell_b))
+        return diagonals
+
+    def _add_transitions(self, border):
+        grid = self.grid
+        transitions = []
+        walkable_pairs = []
+        run = []
+        if border[2] in ('SE', 'SW'):
+            cell_a, cell_b = self._border_cells(border)[0]
+            if grid.walkable(*cell_a) and grid.node(*cell_b) in \
+                    grid.neighbors(grid.node(*cell_a),
+                                   self.diagonal_movement):
+                transitions.append((cell_a, cell_b))
+        else:
+            # the last None closes the last run
+            for pair in self._border_cells(border) + [None]:
+                if pair is not None and grid.walkable(*pair[0]) and \
+                        grid.walkable(*pair[1]):
+                    run.append(pair)
+                    walkable_pairs.append(pair)
+                    continue
+                if run:
+                    if len(run) >= WIDE_ENTRANCE:
+                        transitions += [run[0], run[-1]]
+                    else:
+                        transitions.append(run[len(run) // 2])
+                    run = []
+            if self.diagonal_movement != DiagonalMovement.never:
+                transitions += self._diagonal_pairs(border, walkable_pairs)
+        self.transitions[border] = transitions
+        for cell_a, cell_b in transitions:
+            node_a = grid.node(*cell_a)
+            node_b = grid.node(*cell_b)
+            self.graph.add_edge(
+                self._abstract_node(cell_a), self._abstract_node(cell_b),
+                grid.calc_cost(node_a, node_b, self.weighted))
+            self.graph.add_edge(
+                self._abstract_node(cell_b), self._abstract_node(cell_a),
+                grid.calc_cost(node_b, node_a, self.weighted))
+
+    def _abstract_node(self, cell):
+        node = self.graph.nodes.get(cell)
+        if node is None:
+            node = AbstractNode(*cell)
+            self.graph.nodes[cell] = node
+        return node
+
+    def _cluster_entrances(self, cluster):
+        entrances = set()
+        for border in self._cluster_borders(cluster):
+            for cell_a, cell_b in self.transitions.get(border, ()):
+                for cell in (cell_a, cell_b):
+                    if self.cluster(*cell) == cluster:
+                        entrances.add(cell)
+        return entrances
+
+    def _add_intra_edges(self, cluster, edges):
+        self.intra_edges[cluster] = [(cell_a, cell_b)
+                                     for cell_a, cell_b, _ in edges]
+        for cell_a, cell_b, cost in edges:
+            self.graph.add_edge(
+                self._abstract_node(cell_a), self._abstract_node(cell_b),
+                cost)
+
+    def grid_changed(self, grid, cells):
+        """
+        update the clusters around the changed cells (see Grid.subscribe)
+        """
+        if cells is None:
+            self.build()
+            return
+        clusters = {self.cluster(x, y) for x, y in cells}
+        # diagonal steps over a border depend on the cells next to them
+        # (see DiagonalMovement.only_when_no_obstacle)
+        width, height = self.grid.width, self.grid.height
+        border_clusters = {
+            self.cluster((x + dx) % width, (y + dy) % height)
+            for x, y in cells for dx in (-1, 0, 1) for dy in (-1, 0, 1)}
+        borders = set()
+        for cluster in border_clusters:
+            borders.update(self._cluster_borders(cluster))
+
+        # remove the old transitions and their edges
+        removed = []
+        for border in borders:
+            for cell_a, cell_b in self.transitions.pop(border, ()):
+                removed += [(cell_a, cell_b), (cell_b, cell_a)]
+        self.graph.remove_edges(removed)
+        for border in borders:
+            self._add_transitions(border)
+
+        # clusters on both sides of the changed borders
+        touched = set(clusters)
+        for border in borders:
+            touched.add(border[:2])
+            touched.add(self._neighbor_cluster(border))
+        removed = []
+        recompute = []
+        for cluster in touched:
+            entrances = self._cluster_entrances(cluster)
+            if cluster not in clusters and \
+                    entrances == self.entrances[cluster]:
+                continue
+            for cell in self.entrances[cluster] - entrances:
+                self.graph.remove_node(cell)
+            self.entrances[cluster] = entrances
+            removed += self.intra_edges.pop(cluster, [])
+            recompute.append(cluster)
+        self.graph.remove_edges(removed)
+        for cluster in recompute:
+            self._add_intra_edges(cluster, intra_cluster_edges(
+                self.grid, self.bounds(cluster),
+                sorted(self.entrances[cluster]), self.diagonal_movement,
+                self.weighted))
+
+    def query_graph(self, start, end):
+        """
+        connect start and end to the entrances of their clusters
+
+        :return: graph to search, its start and end node and the number of
+            expanded cells
+        """
+        start_cell = (start.x, start.y)
+        end_cell = (end.x, end.y)
+        extra_edges = {}
+        expanded = 0
+        nodes = {}
+
+        def abstract_node(cell):
+            if cell not in nodes:
+                nodes[cell] = self.graph.nodes.get(cell) or AbstractNode(*cell)
+            return nodes[cell]
+
+        def add_edge(cell_a, cell_b, cost):
+            extra_edges.setdefault(cell_a, {})[cell_b] = (
+                abstract_node(cell_b), cost)
+
+        start_cluster = self.cluster(*start_cell)
+        end_cluster = self.cluster(*end_cell)
+        if start_cell not in self.graph.nodes or \
+                start_cluster == end_cluster:
+            targets = set(self.entrances[start_cluster])
+            if start_cluster == end_cluster:
+                targets.add(end_cell)
+            targets.discard(start_cell)
+            costs, _, start_expanded = cluster_search(
+                self.grid, start_cell, self.bounds(start_cluster),
+                self.diagonal_movement, self.weighted, targets=targets)
+            expanded += start_expanded
+            for cell in targets:
+                if cell in costs:
+                    add_edge(start_cell, cell, costs[cell])
+        if end_cell not in self.graph.nodes:
+            sources = self.entrances[end_cluster] - {start_cell}
+            costs, _, end_expanded = cluster_search(
+                self.grid, end_cell, self.bounds(end_cluster),
+                self.diagonal_movement, self.weighted, targets=sources,
+                reverse=True)
+            expanded += end_expanded
+            for cell in sources:
+                if cell in costs:
+                    add_edge(cell, end_cell, costs[cell])
+        return _QueryGraph(self.graph, extra_edges), \
+            abstract_node(start_cell), abstract_node(end_cell), expanded
+
+    def refine(self, abstract_path):
+        """
+        create the path on the grid from a path in the abstract graph
+
+        :return: list of nodes and the number of expanded cells
+        """
+        grid = self.grid
+        if not abstract_path:
+            return [], 0
+        cells = [(abstract_path[0].x, abstract_path[0].y)]
+        expanded = 0
+        for node_a, node_b in zip(abstract_path, abstract_path[1:]):
+            cell_a = (node_a.x, node_a.y)
+            cell_b = (node_b.x, node_b.y)
+            cluster = self.cluster(*cell_a)
+            if cluster != self.cluster(*cell_b):
+                # transition between two clusters
+                cells.append(cell_b)
+                continue
+            _, parents, segment_expanded = cluster_search(
+                grid, cell_a, self.bounds(cluster), self.diagonal_movement,
+                self.weighted, targets=[cell_b])
+            expanded += segment_expanded
+            segment = [cell_b]
+            while segment[-1] != cell_a:
+                segment.append(parents[segment[-1]])
+            segment.reverse()
+            cells += segment[1:]
+        return [grid.node(*cell) for cell in cells], expanded
+
+
+class HPAStarFinder(Finder):
+    """
+    Hierarchical Path-Finding A* (HPA*) by Adi Botea, Martin Müller and
+    Jonathan Schaeffer, "Near Optimal Hierarchical Path-Finding" (2004).
+
+    Searches an abstract graph of clusters (see ClusterGraph) first and
+    only creates the path on the grid for the clusters along the way. The
+    found paths are close to but not always the shortest ones.
+    """
+    def __init__(self, heuristic=None, weight=1,
+                 diagonal_movement=DiagonalMovement.never,
+                 time_limit=TIME_LIMIT,
+                 max_runs=MAX_RUNS,
+                 open_list_class=OPEN_LIST_CLASS,
+                 tie_breaking=TieBreaking.fifo,
+                 cluster_size=10):
+        """
+        find a path using hierarchical A*
+        :param heuristic: heuristic used to calculate distance of 2 points
+            (defaults to manhattan or octile if diagonal movement is allowed)
+        :param weight: weight of the heuristic of the search on the cluster
+            graph (weighted A*), with a weight bigger than 1 far less nodes
+            are expanded and the path costs at most weight times the cost of
+            the shortest path through the cluster graph
+        :param diagonal_movement: if diagonal movement is allowed
+            (see enum in diagonal_movement)
+        :param time_limit: max. runtime in seconds
+        :param max_runs: max. amount of tries until we abort the search
+            (optional, only if we enter huge grids and have time constrains)
+            <=0 means there are no constrains and the code might run on any
+            large map.
+        :param open_list_class: priority queue used as open list
+            (see core/heap.py, defaults to IndexedHeap)
+        :param tie_breaking: order of the nodes with the same f value in
+            the open list (see TieBreaking in core/heap.py, defaults to fifo)
+        :param cluster_size: width and height of the clusters
+        """
+        super(HPAStarFinder, self).__init__(
+            heuristic=heuristic,
+            weight=weight,
+            diagonal_movement=diagonal_movement,
+            time_limit=time_limit,
+            max_runs=max_runs,
+            open_list_class=open_list_class,
+            tie_breaking=tie_breaking)
+        if not heuristic:
+            if diagonal_movement == DiagonalMovement.never:
+                self.heuristic = manhattan
+            else:
+                self.heuristic = octile
+        self.cluster_size = cluster_size
+        self.cluster_graph = None
+
+    def preprocess(self, grid, workers=1):
+        """
+        create the cluster graph for the grid, it is kept up to date when
+        the grid changes and reused by find_path
+
+        :param workers: number of processes used to create it
+        """
+        if self.cluster_graph is not None:
+            self.cluster_graph.close()
+        self.cluster_graph = ClusterGraph(
+            grid, self.cluster_size, self.diagonal_movement, self.weighted,
+            workers)
+        return self.cluster_graph
+
+    def _abstract_heuristic(self, grid):
+        """
+        heuristic for the abstract graph, the nodes are no grid nodes, so
+        we take care of passable borders and the minimum weight here
+        """
+        heuristic = self.heuristic
+        min_weight = grid.min_weight if self.weighted else 1
+
+        def abstract_heuristic(dx, dy):
+            if grid.passable_left_right_border and dx > grid.width / 2:
+                dx = grid.width - dx
+            if grid.passable_up_down_border and dy > grid.height / 2:
+                dy = grid.height - dy
+            return heuristic(dx, dy) * min_weight
+        return abstract_heuristic
+
+    def find_path(self, start, end, grid):
+        """
+        find a path from start to end node on grid using HPA*
+        :param start: start node
+        :param end: end node
+        :param grid: grid that stores all possible steps/tiles as 2D-list
+        :return:
+        """
+        cluster_graph = self.cluster_graph
+        if cluster_graph is None or cluster_graph.grid is not grid or \
+                cluster_graph.diagonal_movement != self.diagonal_movement:
+            cluster_graph = self.preprocess(grid)
+
+        self.start_time = time.time()  # execution time limitation
+        self.runs = 0  # count number of iterations
+        if self.unreachable(start, end, grid):
+            return [], self.runs
+        if (start.x, start.y) == (end.x, end.y):
+            return [start], 1
+        if not end.walkable:
+            return [], 0
+
+        graph, abstract_start, abstract_end, expanded = \
+            cluster_graph.query_graph(start, end)
+        finder = AStarFinder(
+            heuristic=self._abstract_heuristic(grid), weight=self.weight,
+            time_limit=self.time_limit, max_runs=self.max_runs,
+            open_list_class=self.open_list_class,
+            tie_breaking=self.tie_breaking)
+        abstract_path, runs = finder.find_path(
+            abstract_start, abstract_end, graph)
+        path, refine_expanded = cluster_graph.refine(abstract_path)
+        self.runs = runs + expanded + refine_expanded
+        return path, self.runs
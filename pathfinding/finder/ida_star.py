@@ -1,22 +1,27 @@
 import time
 from .finder import Finder, MAX_RUNS, TIME_LIMIT
 from ..core.diagonal_movement import DiagonalMovement
+from ..core.heap import node_key_function
 from ..core.heuristic import manhattan, octile
-from ..core.node import Node
+
+# max. number of nodes in the transposition table
+TRANSPOSITION_TABLE_SIZE = 1_000_000
 
 
 class IDAStarFinder(Finder):
     """
     Iterative Deeping A Star (IDA*) path-finder.
 
-    Recursion based on:
+    Depth-first searches up to a cutoff of the estimated path cost that
+    grows with every iteration. Only the current path is kept in memory
+    (plus the optional transposition table).
+
+    Based on:
        http://www.apl.jhu.edu/~hall/AI-Programming/IDA-Star.html
 
-    Path retracing based on:
-     V. Nageshwara Rao, Vipin Kumar and K. Ramesh
-     "A Parallel Implementation of Iterative-Deeping-A*", January 1987.
-     ftp://ftp.cs.utexas.edu/.snapshot/hourly.1/pub/AI-Lab/tech-reports/
-     UT-AI-TR-87-46.pdf
+    Transposition table based on:
+     Alexander Reinefeld and T. Anthony Marsland
+     "Enhanced Iterative-Deepening Search", 1994.
 
     based on the JavaScript implementation by Gerard Meier
     (www.gerardmeier.com)
@@ -25,7 +30,27 @@ class IDAStarFinder(Finder):
                  diagonal_movement=DiagonalMovement.never,
                  time_limit=TIME_LIMIT,
                  max_runs=MAX_RUNS,
-                 track_recursion=True):
+                 track_recursion=False,
+                 transposition_table_size=TRANSPOSITION_TABLE_SIZE):
+        """
+        find shortest path using IDA*
+        :param heuristic: heuristic used to calculate distance of 2 points
+            (defaults to manhattan or octile if diagonal movement is allowed)
+        :param weight: weight of the heuristic
+        :param diagonal_movement: if diagonal movement is allowed
+            (see enum in diagonal_movement)
+        :param time_limit: max. runtime in seconds
+        :param max_runs: max. amount of tries until we abort the search
+            (optional, only if we enter huge grids and have time constrains)
+            <=0 means there are no constrains and the code might run on any
+            large map.
+        :param track_recursion: count how often every node was visited in
+            node.retain_count and set node.tested (for visualization)
+        :param transposition_table_size: max. number of nodes whose cost is
+            remembered, nodes that are reached again with a higher cost (or
+            the same cost in the same iteration) are not searched again
+            (0 disables the table)
+        """
         super(IDAStarFinder, self).__init__(
             heuristic=heuristic, weight=weight,
             diagonal_movement=diagonal_movement,
@@ -34,6 +59,9 @@ class IDAStarFinder(Finder):
             max_runs=max_runs)
         self.nodes_visited = 0
         self.track_recursion = track_recursion
+        self.transposition_table_size = transposition_table_size
+        self._table = None
+        self._iteration = 0
         if not heuristic:
             if diagonal_movement == DiagonalMovement.never:
                 self.heuristic = manhattan
@@ -42,86 +70,109 @@ class IDAStarFinder(Finder):
                 # not admissible it should be octile instead
                 self.heuristic = octile
 
-    def search(self, node, g, cutoff, path, depth, end, grid):
-        self.runs += 1
-        self.keep_running()
-
-        self.nodes_visited += 1
-
-        f = g + self.apply_heuristic(node, end, graph=grid) * self.weight
-
-        # We've searched too deep for this iteration.
-        if f > cutoff:
-            return f
-
-        if node == end:
-            if len(path) < depth:
-                path += [None] * (depth - len(path) + 1)
-            path[depth] = node
-            return node
-
-        neighbors = self.find_neighbors(grid, node)
-
-        # Sort the neighbors, gives nicer paths. But, this deviates
-        # from the original algorithm - so I left it out
-        # TODO: make this an optional parameter
-        #    def sort_neighbors(a, b):
-        #        return self.apply_heuristic(a, end) - \
-        #            self.apply_heuristic(b, end)
-        #    sorted(neighbors, sort_neighbors)
-        min_t = float('inf')
-        for neighbor in neighbors:
-            neighbor.opened = True
-
-            if self.track_recursion:
-                # Retain a copy for visualization. Due to recursion, this
-                # node may be part of other paths too.
+    def _neighbors(self, grid, node):
+        if self.track_recursion:
+            neighbors = self.find_neighbors(grid, node)
+            for neighbor in neighbors:
                 neighbor.retain_count += 1
                 neighbor.tested = True
-
-            t = self.search(neighbor, g + grid.calc_cost(node, neighbor),
-                            cutoff, path, depth + 1, end, grid)
-
-            if isinstance(t, Node):
-                if len(path) < depth:
-                    path += [None] * (depth - len(path) + 1)
-                path[depth] = node
-                return t
-
-            if t < min_t:
-                min_t = t
-
-        return min_t
+            return neighbors
+        return grid.neighbors(node, diagonal_movement=self.diagonal_movement)
+
+    def search(self, start, end, grid, cutoff):
+        """
+        depth-first search from start that does not follow nodes whose
+        estimated path cost is above the cutoff
+
+        :return: path to end (None if not found) and the smallest
+            estimated path cost above the cutoff (next cutoff)
+        """
+        key = node_key_function(grid)
+        end_key = key(end)
+        estimate = self.heuristic_function(end, grid)
+        weight = self.weight
+        max_runs = self.max_runs
+        table = self._table
+        iteration = self._iteration
+        table_size = self.transposition_table_size
+        next_cutoff = float('inf')
+        # time and run limits are checked every 256 expanded nodes
+        next_check = self.runs + 1
+
+        path = [start]
+        path_keys = {key(start)}
+        # cost of the nodes of the path and their remaining neighbors
+        costs = [0]
+        stack = [iter(self._neighbors(grid, start))]
+        while stack:
+            node = path[-1]
+            g = costs[-1]
+            for neighbor in stack[-1]:
+                neighbor_key = key(neighbor)
+                if neighbor_key in path_keys:
+                    continue
+                ng = g + grid.calc_cost(node, neighbor)
+                f = ng + estimate(neighbor) * weight
+                if f > cutoff:
+                    # we've searched too deep for this iteration
+                    if f < next_cutoff:
+                        next_cutoff = f
+                    continue
+                if table is not None:
+                    # skip nodes that have been reached cheaper (in this or
+                    # an earlier iteration) or as cheap in this iteration
+                    known = table.get(neighbor_key)
+                    if known is not None and (known[0] < ng or (
+                            known[0] == ng and known[1] == iteration)):
+                        continue
+                    if known is not None or len(table) < table_size:
+                        table[neighbor_key] = (ng, iteration)
+                if neighbor_key == end_key:
+                    path.append(neighbor)
+                    return path, next_cutoff
+
+                self.runs += 1
+                self.nodes_visited += 1
+                if self.runs >= next_check or self.runs >= max_runs:
+                    self.keep_running()
+                    next_check = self.runs + 256
+                path.append(neighbor)
+                path_keys.add(neighbor_key)
+                costs.append(ng)
+                stack.append(iter(self._neighbors(grid, neighbor)))
+                break
+            else:
+                # all neighbors have been searched
+                stack.pop()
+                costs.pop()
+                path_keys.discard(key(path.pop()))
+        return None, next_cutoff
 
     def find_path(self, start, end, grid):
         self.clean_grid(grid)
 
         self.start_time = time.time()  # execution time limitation
         self.runs = 0  # count number of iterations
+        if self.unreachable(start, end, grid):
+            return [], self.runs
 
         self.nodes_visited = 0  # for statistics
+        self.refresh_node(start)
+        self.refresh_node(end)
+        if node_key_function(grid)(start) == node_key_function(grid)(end):
+            return [start], self.runs
 
         # initial search depth, given the typical heuristic constraints,
         # there should be no cheaper route possible.
-        cutoff = self.apply_heuristic(start, end, graph=grid)
-
-        while True:
-            path = []
-
-            # search till cut-off depth:
-            t = self.search(start, 0, cutoff, path, 0, end, grid)
-
-            if isinstance(t, bool) and not t:
-                # only when an error occured we return "False"
-                break
-
-            # If t is a node, it's also the end node. Route is now
-            # populated with a valid path to the end node.
-            if isinstance(t, Node):
+        cutoff = self.apply_heuristic(start, end, graph=grid) * self.weight
+
+        # cheapest known cost of the nodes and the iteration it was found in
+        self._table = {} if self.transposition_table_size > 0 else None
+        self._iteration = 0
+        while cutoff < float('inf'):
+            self._iteration += 1
+            path, cutoff = self.search(start, end, grid, cutoff)
+            if path:
                 return path, self.runs
 
-            # Try again, this time with a deeper cut-off. The t score
-            # is the closest we got to the end node.
-            cutoff = t
-
         return [], self.runs
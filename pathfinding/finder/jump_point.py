@@ -0,0 +1,307 @@
+from .finder import Finder, MAX_RUNS, OPEN_LIST_CLASS, TIME_LIMIT
+from ..core.diagonal_movement import DiagonalMovement
+from ..core.heap import TieBreaking
+from ..core.heuristic import manhattan, octile
+from ..core.util import SQRT2, backtrace
+
+
+class JumpPointFinder(Finder):
+    """
+    Jump Point Search (JPS) by Daniel Harabor and Alban Grastien,
+    "Online Graph Pruning for Pathfinding on Grid Maps", AAAI 2011.
+
+    Instead of adding all neighbors of a node to the open list it "jumps"
+    in straight lines over nodes that are not of interest until it finds a
+    node with a forced neighbor (a jump point), so only a few nodes are
+    added to the open list on open maps. It finds the same path costs as A*
+    but only works on grids where all walkable cells have the same cost
+    (the weights of the grid are ignored) and does not follow connections
+    to other grids.
+
+    based on the JavaScript implementation of PathFinding.js
+    """
+    def __init__(self, heuristic=None, weight=1,
+                 diagonal_movement=DiagonalMovement.never,
+                 time_limit=TIME_LIMIT,
+                 max_runs=MAX_RUNS,
+                 open_list_class=OPEN_LIST_CLASS,
+                 tie_breaking=TieBreaking.fifo):
+        """
+        find shortest path using Jump Point Search
+        :param heuristic: heuristic used to calculate distance of 2 points
+            (defaults to manhattan or octile if diagonal movement is allowed)
+        :param weight: weight of the heuristic (see AStarFinder)
+        :param diagonal_movement: if diagonal movement is allowed
+            (see enum in diagonal_movement)
+        :param time_limit: max. runtime in seconds
+        :param max_runs: max. amount of tries until we abort the search
+            (optional, only if we enter huge grids and have time constrains)
+            <=0 means there are no constrains and the code might run on any
+            large map.
+        :param open_list_class: priority queue used as open list
+            (see core/heap.py, defaults to IndexedHeap)
+        :param tie_breaking: order of the nodes with the same f value in
+            the open list (see TieBreaking in core/heap.py, defaults to fifo)
+        """
+        super(JumpPointFinder, self).__init__(
+            heuristic=heuristic,
+            weight=weight,
+            diagonal_movement=diagonal_movement,
+            weighted=False,
+            time_limit=time_limit,
+            max_runs=max_runs,
+            open_list_class=open_list_class,
+            tie_breaking=tie_breaking)
+
+        if not heuristic:
+            if diagonal_movement == DiagonalMovement.never:
+                self.heuristic = manhattan
+            else:
+                self.heuristic = octile
+
+    def _wrapped_walkable(self, x, y):
+        """
+        check if a cell is walkable, coordinates outside of the grid are
+        wrapped around if the border is passable.
+        """
+        grid = self.grid
+        if grid.passable_left_right_border:
+            x %= grid.width
+        if grid.passable_up_down_border:
+            y %= grid.height
+        return grid.walkable(x, y)
+
+    def _wrap(self, x, y):
+        grid = self.grid
+        if grid.passable_left_right_border:
+            x %= grid.width
+        if grid.passable_up_down_border:
+            y %= grid.height
+        return x, y
+
+    def _jump(self, x, y, dx, dy):
+        """
+        jump from x, y (excluding) in direction dx, dy until we reach a
+        jump point, returns its coordinates and the number of steps or None
+        if we run into an obstacle (or around the whole map).
+        """
+        walkable = self.walkable
+        end_x, end_y = self.end.x, self.end.y
+        origin = self._wrap(x, y)
+        diagonal = dx != 0 and dy != 0
+        steps = 0
+        mode = self.diagonal_movement
+        while True:
+            if diagonal:
+                # the diagonal step itself has to be allowed
+                if mode == DiagonalMovement.only_when_no_obstacle:
+                    if not (walkable(x + dx, y) and walkable(x, y + dy)):
+                        return None
+                elif mode == DiagonalMovement.if_at_most_one_obstacle:
+                    if not (walkable(x + dx, y) or walkable(x, y + dy)):
+                        return None
+            x += dx
+            y += dy
+            steps += 1
+            if not walkable(x, y):
+                return None
+            position = self._wrap(x, y)
+            if position == (end_x, end_y):
+                return position, steps
+            if position == origin:
+                # we went around the whole map without finding anything
+                return None
+
+            if self._is_jump_point(x, y, dx, dy):
+                return position, steps
+
+    def _is_jump_point(self, x, y, dx, dy):
+        """
+        check if the cell has a forced neighbor when we reach it moving in
+        direction dx, dy (or if a straight jump from it finds one).
+        """
+        walkable = self.walkable
+        mode = self.diagonal_movement
+        if mode == DiagonalMovement.never:
+            if dx != 0:
+                return (walkable(x, y - 1) and
+                        not walkable(x - dx, y - 1)) or \
+                    (walkable(x, y + 1) and not walkable(x - dx, y + 1))
+            if (walkable(x - 1, y) and not walkable(x - 1, y - dy)) or \
+                    (walkable(x + 1, y) and not walkable(x + 1, y - dy)):
+                return True
+            # when moving vertically, we need to look for horizontal jump
+            # points as well
+            return bool(self._jump(x, y, 1, 0) or self._jump(x, y, -1, 0))
+
+        if dx != 0 and dy != 0:
+            if mode != DiagonalMovement.only_when_no_obstacle and (
+                    (walkable(x - dx, y + dy) and not walkable(x - dx, y)) or
+                    (walkable(x + dx, y - dy) and not walkable(x, y - dy))):
+                return True
+            # when moving diagonally, we need to look for horizontal and
+            # vertical jump points as well
+            return bool(self._jump(x, y, dx, 0) or self._jump(x, y, 0, dy))
+
+        if mode == DiagonalMovement.only_when_no_obstacle:
+            if dx != 0:
+                return (walkable(x, y - 1) and
+                        not walkable(x - dx, y - 1)) or \
+                    (walkable(x, y + 1) and not walkable(x - dx, y + 1))
+            return (walkable(x - 1, y) and not walkable(x - 1, y - dy)) or \
+                (walkable(x + 1, y) and not walkable(x + 1, y - dy))
+
+        if dx != 0:
+            return (walkable(x + dx, y + 1) and not walkable(x, y + 1)) or \
+                (walkable(x + dx, y - 1) and not walkable(x, y - 1))
+        return (walkable(x + 1, y + dy) and not walkable(x + 1, y)) or \
+            (walkable(x - 1, y + dy) and not walkable(x - 1, y))
+
+    def _directions(self, node):
+        """
+        directions we need to look at from the node, if it has no parent
+        (the start node) these are all directions to its neighbors,
+        otherwise the directions get pruned by the direction we came from.
+        """
+        if node.parent is None:
+            directions = []
+            for neighbor in self.grid.neighbors(
+                    node, diagonal_movement=self.diagonal_movement):
+                dx = neighbor.x - node.x
+                dy = neighbor.y - node.y
+                # direction over a passable border
+                if dx not in (-1, 0, 1):
+                    dx = 1 if dx < 0 else -1
+                if dy not in (-1, 0, 1):
+                    dy = 1 if dy < 0 else -1
+                directions.append((dx, dy))
+            return directions
+
+        x, y = node.x, node.y
+        dx, dy = self.came_from[(x, y)]
+        walkable = self.walkable
+        mode = self.diagonal_movement
+        directions = []
+        if mode == DiagonalMovement.never:
+            if dx != 0:
+                directions = [(0, -1), (0, 1), (dx, 0)]
+            else:
+                directions = [(-1, 0), (1, 0), (0, dy)]
+        elif dx != 0 and dy != 0:
+            vertical = walkable(x, y + dy)
+            horizontal = walkable(x + dx, y)
+            directions = [(0, dy), (dx, 0)]
+            if mode == DiagonalMovement.always:
+                directions.append((dx, dy))
+                if not walkable(x - dx, y):
+                    directions.append((-dx, dy))
+                if not walkable(x, y - dy):
+                    directions.append((dx, -dy))
+            elif mode == DiagonalMovement.if_at_most_one_obstacle:
+                if vertical or horizontal:
+                    directions.append((dx, dy))
+                if not walkable(x - dx, y) and vertical:
+                    directions.append((-dx, dy))
+                if not walkable(x, y - dy) and horizontal:
+                    directions.append((dx, -dy))
+            elif vertical and horizontal:
+                directions.append((dx, dy))
+        elif mode == DiagonalMovement.only_when_no_obstacle:
+            if dx != 0:
+                directions = [(dx, 0), (dx, 1), (dx, -1), (0, 1), (0, -1)]
+            else:
+                directions = [(0, dy), (1, dy), (-1, dy), (1, 0), (-1, 0)]
+        elif dx != 0:
+            directions = [(dx, 0)]
+            if mode == DiagonalMovement.always or walkable(x + dx, y):
+                if not walkable(x, y + 1):
+                    directions.append((dx, 1))
+                if not walkable(x, y - 1):
+                    directions.append((dx, -1))
+        else:
+            directions = [(0, dy)]
+            if mode == DiagonalMovement.always or walkable(x, y + dy):
+                if not walkable(x + 1, y):
+                    directions.append((1, dy))
+                if not walkable(x - 1, y):
+                    directions.append((-1, dy))
+        return directions
+
+    def check_neighbors(self, start, end, grid, open_list,
+                        open_value=True, backtrace_by=None):
+        """
+        Find next path segment based on given node
+        (or return path if we found the end)
+
+        :param start: start node
+        :param end: end node
+        :param grid: grid that stores all possible steps/tiles as 2D-list
+        :param open_list: stores nodes that will be processed next
+        """
+        node = open_list.pop_node()
+        node.closed = True
+
+        if node == end:
+            return self.expand_path(backtrace(end))
+
+        for dx, dy in self._directions(node):
+            jump_point = self._jump(node.x, node.y, dx, dy)
+            if not jump_point:
+                continue
+            (jump_x, jump_y), steps = jump_point
+            jump_node = grid.node(jump_x, jump_y)
+            self.refresh_node(jump_node)
+            if jump_node.closed:
+                continue
+
+            ng = node.g + steps * (SQRT2 if dx != 0 and dy != 0 else 1)
+            if not jump_node.opened or ng < jump_node.g:
+                old_f = jump_node.f
+                jump_node.g = ng
+                jump_node.h = jump_node.h or self.apply_heuristic(
+                    jump_node, end, graph=grid)
+                jump_node.f = jump_node.g + jump_node.h * self.weight
+                jump_node.parent = node
+                self.came_from[(jump_x, jump_y)] = (dx, dy)
+                if not jump_node.opened:
+                    open_list.push_node(jump_node)
+                    jump_node.opened = True
+                else:
+                    open_list.update_node(jump_node, old_f)
+
+        # the end has not been reached (yet) keep the find_path loop running
+        return None
+
+    def expand_path(self, jump_points):
+        """
+        create the path with all nodes between the jump points
+        """
+        if not jump_points:
+            return jump_points
+        path = [jump_points[0]]
+        for jump_point in jump_points[1:]:
+            dx, dy = self.came_from[(jump_point.x, jump_point.y)]
+            x, y = path[-1].x, path[-1].y
+            while (x, y) != (jump_point.x, jump_point.y):
+                x, y = self._wrap(x + dx, y + dy)
+                path.append(self.grid.node(x, y))
+            path[-1] = jump_point
+        return path
+
+    def find_path(self, start, end, grid):
+        """
+        find a path from start to end node on grid using Jump Point Search
+        :param start: start node
+        :param end: end node
+        :param grid: grid that stores all possible steps/tiles as 2D-list
+        :return:
+        """
+        self.grid = grid
+        self.end = end
+        if grid.passable_left_right_border or grid.passable_up_down_border:
+            self.walkable = self._wrapped_walkable
+        else:
+            self.walkable = grid.walkable
+        # direction we came from for every jump point
+        self.came_from = {}
+        return super(JumpPointFinder, self).find_path(start, end, grid)
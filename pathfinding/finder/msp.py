@@ -2,7 +2,6 @@ import time
 from collections import deque, namedtuple
 from ..core import heuristic
 from ..finder.finder import Finder
-from ..core.heap import SimpleHeap
 
 
 class MinimumSpanningTree(Finder):
@@ -21,6 +20,8 @@ class MinimumSpanningTree(Finder):
         return list(self.itertree(grid, start))
 
     def itertree(self, grid, start):
+        self.clean_grid(grid)
+        self.refresh_node(start)
 
         # Finder.process_node requires an end node, which we don't have.
         # The following value tricks the call to Finder.apply_heuristic.
@@ -31,7 +32,7 @@ class MinimumSpanningTree(Finder):
 
         start.opened = True
 
-        open_list = SimpleHeap(start, grid)
+        open_list = self.create_open_list(start, grid)
 
         while len(open_list) > 0:
             self.runs += 1
@@ -48,10 +49,10 @@ class MinimumSpanningTree(Finder):
                         grid, neighbor, node, end, open_list, open_value=True)
 
     def find_path(self, start, end, grid):
-        self.clean_grid(grid)
-
         self.start_time = time.time()  # execution time limitation
         self.runs = 0  # count number of iterations
+        if self.unreachable(start, end, grid):
+            return [], self.runs
 
         for node in self.itertree(grid, start):
             if node == end:
@@ -0,0 +1,229 @@
+import collections
+
+from ..core.graph import Graph
+from ..core.grid import Grid, USE_NUMPY
+from ..core.heap import node_key_function
+from ..core.line_of_sight import line_cells
+from ..core.world import World
+if USE_NUMPY:
+    import numpy as np
+
+
+# max. number of paths kept by a PathCache
+CACHE_SIZE = 1024
+# attributes of a finder that change its paths
+FINDER_CONFIG = ('heuristic', 'weight', 'diagonal_movement', 'weighted',
+                 'tie_breaking')
+
+
+def _cell_costs(grid):
+    """
+    weights of all cells (infinite for blocked cells) indexed by
+    y * width + x
+    """
+    if USE_NUMPY and grid.width and grid.height:
+        return np.where(
+            grid._walkable_mask(), grid._weight_matrix(), np.inf).ravel()
+    return [_cell_cost(grid, x, y)
+            for y in range(grid.height) for x in range(grid.width)]
+
+
+def _cell_cost(grid, x, y):
+    node = grid.node(x, y)
+    return node.weight if node.walkable else float('inf')
+
+
+class _CachedGraph:
+    """
+    paths of a PathCache that belong to one grid, graph or world and the
+    cells they depend on
+    """
+    def __init__(self, cache, graph):
+        self.cache = cache
+        self.graph = graph
+        self.keys = set()
+        # cell key -> keys of the paths that depend on the cell
+        self.index = {}
+        # weights of the cells when the paths were found, by id of the grid
+        self.costs = {}
+        if isinstance(graph, World):
+            self.grids = list(graph.grids.values())
+        elif isinstance(graph, Grid):
+            self.grids = [graph]
+        else:
+            self.grids = []
+        for grid in self.grids:
+            self.costs[id(grid)] = _cell_costs(grid)
+            grid.subscribe(self.grid_changed)
+
+    def close(self):
+        for grid in self.grids:
+            grid.unsubscribe(self.grid_changed)
+
+    def _cell_key(self, grid, x, y):
+        if isinstance(self.graph, World):
+            return x, y, grid.grid_id
+        return x, y
+
+    def path_cells(self, path):
+        """
+        keys of all cells the path depends on: the cells of the path, the
+        cells next to diagonal steps (they might not be allowed anymore if
+        one of them gets blocked) and the cells crossed by steps of
+        any-angle paths
+        """
+        if not self.grids:
+            return set()
+        key = node_key_function(self.graph)
+        cells = {key(node) for node in path}
+        for node_a, node_b in zip(path, path[1:]):
+            if node_a.grid_id != node_b.grid_id:
+                # connection between grids
+                continue
+            grid = self.graph
+            if isinstance(grid, World):
+                grid = grid.grids[node_a.grid_id]
+            dx = node_b.x - node_a.x
+            dy = node_b.y - node_a.y
+            if grid.passable_left_right_border and \
+                    abs(dx) == grid.width - 1:
+                dx = -1 if dx > 0 else 1
+            if grid.passable_up_down_border and abs(dy) == grid.height - 1:
+                dy = -1 if dy > 0 else 1
+            if abs(dx) > 1 or abs(dy) > 1:
+                for x, y in line_cells(node_a.x, node_a.y,
+                                       node_b.x, node_b.y):
+                    cells.add(self._cell_key(grid, x, y))
+            elif dx and dy:
+                cells.add(self._cell_key(
+                    grid, (node_a.x + dx) % grid.width, node_a.y))
+                cells.add(self._cell_key(
+                    grid, node_a.x, (node_a.y + dy) % grid.height))
+        return cells
+
+    def grid_changed(self, grid, cells):
+        """
+        remove the paths that depend on changed cells, or all paths if a cell
+        got cheaper (see Grid.subscribe)
+        """
+        costs = self.costs[id(grid)]
+        cheaper = cells is None
+        if cheaper:
+            self.costs[id(grid)] = _cell_costs(grid)
+        else:
+            for x, y in cells:
+                index = y * grid.width + x
+                cost = _cell_cost(grid, x, y)
+                if cost < costs[index]:
+                    cheaper = True
+                costs[index] = cost
+        if cheaper:
+            keys = list(self.keys)
+        else:
+            keys = set()
+            for x, y in cells:
+                keys.update(self.index.get(self._cell_key(grid, x, y), ()))
+        for key in keys:
+            self.cache._remove(key)
+
+
+class PathCache:
+    """
+    Keeps the paths found by a finder, so repeated queries are answered
+    without searching again.
+
+    The paths are kept per finder configuration, grid, start and end.
+    Changes of grids (and the grids of a world) made with update_node are
+    followed (see Grid.subscribe): if cells get more expensive or blocked
+    only the paths that depend on them are removed, if a cell gets cheaper
+    or walkable a shorter path might exist and all paths of the grid are
+    removed. The paths of a graph are removed when its version changed. If
+    the cache is full the least recently used path is removed.
+    """
+    def __init__(self, finder, max_size=CACHE_SIZE):
+        """
+        :param finder: finder that searches the paths that are not cached
+        :param max_size: max. number of paths
+        """
+        self.finder = finder
+        self.max_size = max_size
+        # key -> (path, version of the grid, keys of the cells it depends on)
+        self.entries = collections.OrderedDict()
+        # id of the grid -> _CachedGraph (only while it has paths)
+        self._graphs = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def _key(self, start, end, grid):
+        finder = self.finder
+        config = tuple(getattr(finder, name, None) for name in FINDER_CONFIG)
+        key = node_key_function(grid)
+        return type(finder), config, id(grid), key(start), key(end)
+
+    def _remove(self, key):
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            return
+        cached = self._graphs[key[2]]
+        cached.keys.discard(key)
+        if not cached.keys:
+            # no paths left, don't keep the grid alive
+            cached.close()
+            del self._graphs[key[2]]
+            return
+        for cell in entry[2]:
+            keys = cached.index.get(cell)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del cached.index[cell]
+
+    def find_path(self, start, end, grid):
+        """
+        find a path from start to end node on grid, the path is taken from the
+        cache if possible.
+
+        :param start: start node
+        :param end: end node
+        :param grid: grid, graph or world the nodes belong to
+        :return: path and the number of nodes the finder expanded (0 if the
+            path was cached)
+        """
+        key = self._key(start, end, grid)
+        entry = self.entries.get(key)
+        if entry is not None and entry[1] != grid.version and \
+                isinstance(grid, Graph):
+            self._remove(key)
+            entry = None
+        if entry is not None:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return list(entry[0]), 0
+
+        self.misses += 1
+        path, runs = self.finder.find_path(start, end, grid)
+        cached = self._graphs.get(id(grid))
+        if cached is None:
+            cached = self._graphs[id(grid)] = _CachedGraph(self, grid)
+        cells = cached.path_cells(path)
+        self.entries[key] = (list(path), grid.version, cells)
+        cached.keys.add(key)
+        for cell in cells:
+            cached.index.setdefault(cell, set()).add(key)
+        while len(self.entries) > self.max_size:
+            self._remove(next(iter(self.entries)))
+            self.evictions += 1
+        return path, runs
+
+    def clear(self):
+        """
+        remove all paths and stop following changes of the grids
+        """
+        for cached in self._graphs.values():
+            cached.close()
+        self._graphs = {}
+        self.entries.clear()
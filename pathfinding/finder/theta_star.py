@@ -0,0 +1,168 @@
+import math
+
+from .a_star import AStarFinder
+from .finder import MAX_RUNS, OPEN_LIST_CLASS, TIME_LIMIT
+from ..core.diagonal_movement import DiagonalMovement
+from ..core.heap import TieBreaking
+from ..core.heuristic import euclidean
+from ..core.line_of_sight import LineOfSight
+from ..core.util import backtrace
+
+# max. number of grids the line of sight checks are kept for
+LINE_OF_SIGHT_GRIDS = 8
+
+
+class ThetaStarFinder(AStarFinder):
+    """
+    Theta* by Alex Nash, Kenny Daniel, Sven Koenig and Ariel Felner,
+    "Theta*: Any-Angle Path Planning on Grids" (2007).
+
+    Works like A*, but a node gets the parent of the node it was reached from
+    as parent if there is a line of sight between them, so the path is not
+    bound to the directions of the grid. The path only contains the nodes
+    where it changes its direction and a straight line costs its euclidean
+    length (use util.expand_path to get all cells of the path).
+    Only works on grids, weights are ignored.
+    """
+    def __init__(self, heuristic=None, weight=1,
+                 diagonal_movement=DiagonalMovement.never,
+                 time_limit=TIME_LIMIT,
+                 max_runs=MAX_RUNS,
+                 open_list_class=OPEN_LIST_CLASS,
+                 tie_breaking=TieBreaking.fifo):
+        """
+        find short any-angle paths using Theta*
+        :param heuristic: heuristic used to calculate distance of 2 points
+            (defaults to euclidean)
+        :param weight: weight of the heuristic
+        :param diagonal_movement: if diagonal movement is allowed
+            (see enum in diagonal_movement)
+        :param time_limit: max. runtime in seconds
+        :param max_runs: max. amount of tries until we abort the search
+            (optional, only if we enter huge grids and have time constrains)
+            <=0 means there are no constrains and the code might run on any
+            large map.
+        :param open_list_class: priority queue used as open list
+            (see core/heap.py, defaults to IndexedHeap)
+        :param tie_breaking: order of the nodes with the same f value in
+            the open list (see TieBreaking in core/heap.py, defaults to fifo)
+        """
+        super(ThetaStarFinder, self).__init__(
+            heuristic=heuristic or euclidean,
+            weight=weight,
+            diagonal_movement=diagonal_movement,
+            time_limit=time_limit,
+            max_runs=max_runs,
+            open_list_class=open_list_class,
+            tie_breaking=tie_breaking)
+        self.weighted = False
+        # line of sight checks of the last grid (see core/line_of_sight.py)
+        self.line_of_sight = None
+        # line of sight checks of the last grids, shared with the copies of
+        # the finder (see SearchContext.find_path)
+        self.lines_of_sight = {}
+
+    def _line_of_sight(self, grid):
+        """
+        line of sight checks of the grid, the results are cached between
+        searches until the grid changes. They are never closed, a copy of
+        the finder might still use them, checks that are dropped stop
+        listening to their grid once they are garbage collected.
+        """
+        line_of_sight = self.lines_of_sight.get(grid)
+        if line_of_sight is None:
+            # the copies of the finder might drop the same grids at the
+            # same time
+            grids = list(self.lines_of_sight)
+            for old_grid in grids[:max(
+                    0, len(grids) - LINE_OF_SIGHT_GRIDS + 1)]:
+                self.lines_of_sight.pop(old_grid, None)
+            line_of_sight = self.lines_of_sight[grid] = LineOfSight(grid)
+        elif line_of_sight.version != grid.version:
+            # changed without a notification (e.g. the grid of a view)
+            line_of_sight.grid_changed(grid, None)
+        self.line_of_sight = line_of_sight
+        return line_of_sight
+
+    def _visible(self, grid, node_a, node_b):
+        return self.line_of_sight.visible(node_a, node_b)
+
+    def process_node(
+            self, graph, node, parent, end, open_list, open_value=True):
+        '''
+        like Finder.process_node, but the node is connected to the parent of
+        parent directly if it can be seen from there
+        '''
+        grandparent = parent.parent
+        if grandparent is not None and \
+                self._visible(graph, grandparent, node):
+            parent = grandparent
+            ng = parent.g + math.hypot(node.x - parent.x, node.y - parent.y)
+        else:
+            ng = parent.g + graph.calc_cost(parent, node, self.weighted)
+
+        if not node.opened or ng < node.g:
+            old_f = node.f
+            node.g = ng
+            node.h = node.h or self.apply_heuristic(node, end, graph=graph)
+            node.f = node.g + node.h * self.weight
+            node.parent = parent
+            if not node.opened:
+                open_list.push_node(node)
+                node.opened = open_value
+            else:
+                open_list.update_node(node, old_f)
+
+    def find_path(self, start, end, grid):
+        """
+        find an any-angle path from start to end node on grid
+        :param start: start node
+        :param end: end node
+        :param grid: grid that stores all possible steps/tiles as 2D-list
+        :return: list of the nodes where the path changes its direction and
+            the number of expanded nodes
+        """
+        self._line_of_sight(grid)
+        return super(ThetaStarFinder, self).find_path(start, end, grid)
+
+
+class LazyThetaStarFinder(ThetaStarFinder):
+    """
+    Lazy Theta* by Alex Nash, Sven Koenig and Craig Tovey, "Lazy Theta*:
+    Any-Angle Path Planning and Path Length Analysis in 3D" (2010).
+
+    Like Theta*, but assumes that a node can be seen from the parent of the
+    node it was reached from. The line of sight is only checked when the
+    node is expanded, if it is blocked the best expanded neighbor becomes its
+    parent. This needs far less line of sight checks.
+    """
+    def _visible(self, grid, node_a, node_b):
+        # checked in check_neighbors when node_b gets expanded
+        return True
+
+    def check_neighbors(self, start, end, graph, open_list,
+                        open_value=True, backtrace_by=None):
+        node = open_list.pop_node()
+        parent = node.parent
+        if parent is not None and \
+                not self.line_of_sight.visible(parent, node):
+            # there is no line of sight to the parent, connect the node
+            # to the expanded neighbor it can be reached from the cheapest
+            node.g = float('inf')
+            for neighbor in self.find_neighbors(graph, node):
+                if not neighbor.closed:
+                    continue
+                ng = neighbor.g + graph.calc_cost(
+                    neighbor, node, self.weighted)
+                if ng < node.g:
+                    node.g = ng
+                    node.parent = neighbor
+        node.closed = True
+
+        if node == end:
+            return backtrace(end)
+
+        for neighbor in self.find_neighbors(graph, node):
+            if not neighbor.closed:
+                self.process_node(graph, neighbor, node, end, open_list)
+        return None
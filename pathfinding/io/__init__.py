@@ -0,0 +1 @@
+__all__ = ['grid_file', 'image']
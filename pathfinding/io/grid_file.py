@@ -0,0 +1,134 @@
+"""
+binary file format for big grids that can be opened without parsing it.
+
+The file starts with a header of HEADER_SIZE bytes (all values little
+endian): the magic bytes b'PFGRID', the version (uint16), width and height
+(uint32), flags (uint32, bit 0: passable left/right border, bit 1:
+passable up/down border) and the minimum weight of the walkable cells
+(float64). After the header follows a bitmask of the walkable cells (one
+bit per cell, row by row, see numpy.packbits with bitorder='little') and
+the weights of all cells as float64, row by row, starting at the next
+multiple of ALIGNMENT.
+
+The weights are opened as numpy.memmap, so processes that open the same
+file share the pages of the operating system cache instead of loading the
+map every time.
+"""
+import struct
+
+from ..core.compact_grid import CompactGrid
+from ..core.grid import USE_NUMPY
+if USE_NUMPY:
+    import numpy as np
+
+
+MAGIC = b'PFGRID'
+VERSION = 1
+HEADER = struct.Struct('<6sHIIId')
+HEADER_SIZE = 64
+ALIGNMENT = 64
+
+PASSABLE_LEFT_RIGHT = 1
+PASSABLE_UP_DOWN = 2
+
+
+def _weights_offset(width, height):
+    end = HEADER_SIZE + (width * height + 7) // 8
+    return (end + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def write_grid(grid, file):
+    """
+    save walkability, weights and passable borders of a Grid (or
+    CompactGrid) to a grid file
+
+    :param grid: the grid
+    :param file: file name or binary file object
+    """
+    if not USE_NUMPY:
+        raise ImportError('numpy is required for grid files')
+    width, height = grid.width, grid.height
+    walkable = grid._walkable_mask() if width and height else \
+        np.zeros((height, width), dtype=bool)
+    weights = grid._weight_matrix() if width and height else \
+        np.zeros((height, width))
+    flags = 0
+    if grid.passable_left_right_border:
+        flags |= PASSABLE_LEFT_RIGHT
+    if grid.passable_up_down_border:
+        flags |= PASSABLE_UP_DOWN
+
+    header = HEADER.pack(
+        MAGIC, VERSION, width, height, flags, grid.min_weight)
+    bits = np.packbits(walkable.reshape(-1), bitorder='little').tobytes()
+    padding = _weights_offset(width, height) - HEADER_SIZE - len(bits)
+    if isinstance(file, (str, bytes)) or hasattr(file, '__fspath__'):
+        with open(file, 'wb') as f:
+            _write(f, header, bits, padding, weights)
+    else:
+        _write(file, header, bits, padding, weights)
+
+
+def _write(f, header, bits, padding, weights):
+    f.write(header.ljust(HEADER_SIZE, b'\0'))
+    f.write(bits)
+    f.write(b'\0' * padding)
+    f.write(np.ascontiguousarray(weights, dtype='<f8').data)
+
+
+def read_header(file):
+    """
+    read the header of a grid file
+
+    :param file: file name
+    :return: dict with width, height, flags and min_weight
+    """
+    with open(file, 'rb') as f:
+        data = f.read(HEADER.size)
+    if len(data) < HEADER.size or data[:len(MAGIC)] != MAGIC:
+        raise ValueError(f'{file} is not a grid file')
+    _, version, width, height, flags, min_weight = HEADER.unpack(data)
+    if version != VERSION:
+        raise ValueError(f'unsupported grid file version {version}')
+    return {'width': width, 'height': height, 'flags': flags,
+            'min_weight': min_weight}
+
+
+def open_grid(file, grid_class=CompactGrid, grid_id=None):
+    """
+    open a grid file.
+
+    A CompactGrid uses the memory mapped weights directly (copy-on-write,
+    update_node changes the weights of this grid but not the file), only
+    the walkable bitmask gets unpacked. A Grid still creates a node for
+    every cell.
+
+    :param file: file name
+    :param grid_class: Grid or CompactGrid
+    :param grid_id: id of the grid
+    :return: grid of the given class
+    """
+    if not USE_NUMPY:
+        raise ImportError('numpy is required for grid files')
+    header = read_header(file)
+    width, height = header['width'], header['height']
+    size = width * height
+    if size:
+        bits = np.memmap(file, dtype=np.uint8, mode='r', offset=HEADER_SIZE,
+                         shape=((size + 7) // 8,))
+        walkable = np.unpackbits(bits, count=size, bitorder='little').view(
+            bool).reshape(height, width)
+        weights = np.memmap(file, dtype='<f8', mode='c',
+                            offset=_weights_offset(width, height),
+                            shape=(height, width))
+    else:
+        walkable = np.zeros((height, width), dtype=bool)
+        weights = np.zeros((height, width))
+    grid = grid_class.from_arrays(
+        walkable, weights, grid_id=grid_id,
+        min_weight=header['min_weight'])
+    if header['flags'] & PASSABLE_LEFT_RIGHT:
+        grid.set_passable_left_right_border()
+    if header['flags'] & PASSABLE_UP_DOWN:
+        grid.set_passable_up_down_border()
+    return grid
@@ -0,0 +1,124 @@
+"""
+create grids from images and draw paths into them.
+
+All functions work on images as numpy arrays (height, width) or (height,
+width, channels), only load_image needs Pillow.
+"""
+from ..core.grid import Grid, USE_NUMPY
+if USE_NUMPY:
+    import numpy as np
+
+
+def load_image(file, mode='RGB'):
+    """
+    load an image file as numpy array (needs Pillow)
+
+    :param file: file name or file object
+    :param mode: Pillow mode to convert the image to (e.g. 'RGB', 'RGBA'
+        or 'L' for grayscale)
+    :return: uint8 array (height, width, channels), (height, width) for
+        single channel modes
+    """
+    try:
+        from PIL import Image
+    except ImportError as error:
+        raise ImportError('Pillow is required to load images') from error
+    with Image.open(file) as im:
+        return np.asarray(im.convert(mode))
+
+
+def _color_keys(pixels, channels):
+    """
+    one integer per pixel that contains its first channels
+    """
+    pixels = np.asarray(pixels)
+    if channels == 0:
+        return pixels.astype(np.int64)
+    keys = np.zeros(pixels.shape[:2], dtype=np.int64)
+    for channel in range(channels):
+        keys |= pixels[..., channel].astype(np.int64) << (8 * channel)
+    return keys
+
+
+def _channels(color):
+    return 0 if isinstance(color, (int, np.integer)) else len(color)
+
+
+def color_weights(pixels, mapping, default=1.0):
+    """
+    weights of all pixels looked up in a color mapping
+
+    :param pixels: image as numpy array
+    :param mapping: dict from color (tuple of channel values, compared with
+        the first channels of the pixels, or int for grayscale images) to
+        weight (0 for obstacles)
+    :param default: weight of pixels whose color is not in the mapping
+    :return: float64 array (height, width), can be used as matrix of a grid
+    """
+    weights = np.full(np.shape(pixels)[:2], default, dtype=np.float64)
+    if not mapping:
+        return weights
+    channels = _channels(next(iter(mapping)))
+    colors = np.array([_color_keys(np.array([[color]]), channels)[0, 0]
+                       for color in mapping], dtype=np.int64)
+    values = np.array(list(mapping.values()), dtype=np.float64)
+    order = np.argsort(colors)
+    colors, values = colors[order], values[order]
+
+    keys = _color_keys(pixels, channels)
+    index = np.searchsorted(colors, keys).clip(max=len(colors) - 1)
+    found = colors[index] == keys
+    weights[found] = values[index[found]]
+    return weights
+
+
+def find_color(pixels, color, tolerance=0):
+    """
+    positions of all pixels of a color (e.g. start and end markers)
+
+    :param pixels: image as numpy array
+    :param color: tuple of channel values (compared with the first channels
+        of the pixels) or int for grayscale images
+    :param tolerance: max. difference of every channel
+    :return: list of (x, y) positions, row by row
+    """
+    pixels = np.asarray(pixels)
+    channels = _channels(color)
+    if channels:
+        pixels = pixels[..., :channels]
+    difference = np.abs(pixels.astype(np.int64) - np.asarray(color))
+    if channels:
+        difference = difference.max(axis=-1)
+    ys, xs = np.nonzero(difference <= tolerance)
+    return list(zip(xs.tolist(), ys.tolist()))
+
+
+def image_grid(pixels, mapping, default=1.0, grid_class=Grid, grid_id=None):
+    """
+    create a grid from an image
+
+    :param pixels: image as numpy array
+    :param mapping: dict from color to weight (see color_weights)
+    :param default: weight of pixels whose color is not in the mapping
+    :param grid_class: Grid or CompactGrid
+    :param grid_id: id of the grid
+    :return: grid of the given class
+    """
+    return grid_class(matrix=color_weights(pixels, mapping, default),
+                      grid_id=grid_id)
+
+
+def draw_path(pixels, path, color):
+    """
+    copy of the image with the path drawn into it
+
+    :param pixels: image as numpy array
+    :param path: list of nodes (or (x, y) tuples)
+    :param color: color of the path
+    :return: numpy array of the same shape and type as pixels
+    """
+    out = np.array(pixels, copy=True)
+    if path:
+        xs, ys = zip(*(tuple(point)[:2] for point in path))
+        out[list(ys), list(xs)] = color
+    return out
@@ -0,0 +1,27 @@
+"""
+functions shared by the tests
+"""
+import random
+
+
+def random_matrix(size, seed, weights=(1,), obstacles=0.15):
+    """
+    square matrix with random obstacles (0) and weights, the top left and
+    bottom right cells are always walkable
+
+    :param weights: walkable cells get one of them at random
+    :param obstacles: share of blocked cells
+    """
+    rnd = random.Random(seed)
+    matrix = [[0 if rnd.random() < obstacles else rnd.choice(weights)
+               for _ in range(size)] for _ in range(size)]
+    matrix[0][0] = matrix[-1][-1] = weights[0]
+    return matrix
+
+
+def path_cost(grid, path, weighted=True):
+    """
+    cost of the steps of a path (on a grid or graph)
+    """
+    return sum(grid.calc_cost(node_a, node_b, weighted)
+               for node_a, node_b in zip(path, path[1:]))
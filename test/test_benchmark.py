@@ -0,0 +1,83 @@
+import copy
+import json
+
+from pathfinding.benchmark.__main__ import main
+from pathfinding.benchmark.runner import all_finders, compare, run_benchmark
+from pathfinding.benchmark.scenarios import default_scenarios
+from pathfinding.finder.a_star import AStarFinder
+from pathfinding.finder.dijkstra import DijkstraFinder
+from pathfinding.finder.jump_point import JumpPointFinder
+from pathfinding.finder.msp import MinimumSpanningTree
+from pathfinding.finder.theta_star import ThetaStarFinder
+
+
+def test_all_finders():
+    finders = all_finders()
+    assert AStarFinder in finders
+    assert JumpPointFinder in finders
+    assert MinimumSpanningTree in finders
+
+
+def test_run_benchmark(tmp_path):
+    results = run_benchmark(
+        finders=[AStarFinder, DijkstraFinder], repeat=1, size=16)
+    # results can be stored as JSON
+    results = json.loads(json.dumps(results))
+    by_key = {(r['scenario'], r['finder']): r for r in results['results']}
+    assert len(by_key) == 14
+    for scenario in ('open_field', 'maze', 'rooms', 'weighted_terrain',
+                     'wrapped_borders', 'multi_grid_world'):
+        a_star = by_key[(scenario, 'AStarFinder')]
+        dijkstra = by_key[(scenario, 'DijkstraFinder')]
+        assert a_star['error'] is None
+        assert a_star['cost'] == dijkstra['cost'] and a_star['cost'] > 0
+        assert a_star['runs'] <= dijkstra['runs']
+        assert a_star['peak_memory'] > 0
+    # the heuristic of A* does not work on graphs
+    assert by_key[('large_graph', 'AStarFinder')]['error'] == 'AttributeError'
+    assert by_key[('large_graph', 'DijkstraFinder')]['cost'] > 0
+
+    assert not any(row['regression'] for row in compare(results, results))
+    slower = copy.deepcopy(results)
+    slower['results'][0]['time'] *= 2
+    rows = compare(results, slower)
+    assert rows[0]['regression'] and rows[0]['time']['ratio'] == 2
+    assert not any(row['regression'] for row in rows[1:])
+
+    old = tmp_path / 'old.json'
+    new = tmp_path / 'new.json'
+    old.write_text(json.dumps(results))
+    new.write_text(json.dumps(slower))
+    assert main(['--compare', str(old), str(old)]) == 0
+    assert main(['--compare', str(old), str(new)]) == 1
+
+
+def test_compare_no_path():
+    """
+    a finder that doesn't find a path anymore is a regression
+    """
+    result = {'scenario': 'maze', 'finder': 'AStarFinder', 'time': 1.0,
+              'runs': 10, 'peak_memory': 100, 'cost': 12.0, 'length': 13,
+              'error': None}
+    old = {'results': [result]}
+    new = {'results': [dict(result, cost=None, length=0)]}
+    assert compare(old, new)[0]['regression']
+    assert not compare(new, new)[0]['regression']
+    # the error is fixed
+    failed = {'results': [dict(result, cost=None, error='TypeError')]}
+    assert not compare(failed, old)[0]['regression']
+
+
+def test_any_angle_cost():
+    """
+    the any-angle finders ignore weights, their paths have no cost if they
+    cross weighted cells
+    """
+    results = run_benchmark(
+        scenarios=[scenario for scenario in default_scenarios(16)
+                   if scenario.name in ('open_field', 'weighted_terrain')],
+        finders=[ThetaStarFinder], repeat=1)
+    costs = {result['scenario']: result['cost']
+             for result in results['results']}
+    assert costs['open_field'] > 0
+    assert costs['weighted_terrain'] is None
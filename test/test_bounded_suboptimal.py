@@ -0,0 +1,157 @@
+import random
+
+import pytest
+
+from pathfinding.core.compact_grid import CompactGrid
+from pathfinding.core.diagonal_movement import DiagonalMovement
+from pathfinding.core.grid import Grid
+from pathfinding.core.heap import (
+    BucketQueue, IndexedHeap, PairingHeap, SimpleHeap, TieBreaking)
+from pathfinding.finder.a_star import AStarFinder
+from pathfinding.finder.ara_star import ARAStarFinder
+from pathfinding.finder.finder import ExecutionRunsException
+from pathfinding.finder.focal_search import FocalSearchFinder
+
+from helpers import path_cost, random_matrix
+
+
+# weights of the walkable cells of the random grids
+WEIGHTS = (1, 1, 1, 2, 3)
+
+
+def check_path(grid, path, diagonal_movement):
+    assert path[0] == grid.node(0, 0)
+    assert path[-1] == grid.node(grid.width - 1, grid.height - 1)
+    for node_a, node_b in zip(path, path[1:]):
+        assert node_b in grid.neighbors(node_a, diagonal_movement)
+
+
+def shortest(grid, diagonal_movement):
+    path, runs = AStarFinder(diagonal_movement=diagonal_movement).find_path(
+        grid.node(0, 0), grid.node(grid.width - 1, grid.height - 1), grid)
+    return path_cost(grid, path), runs
+
+
+@pytest.mark.parametrize('finder_class', [AStarFinder, FocalSearchFinder])
+def test_bound(finder_class):
+    """
+    paths cost at most weight times the shortest path and need less
+    expansions
+    """
+    for seed in (0, 1, 3):  # grids with a path
+        for diagonal_movement in (DiagonalMovement.never,
+                                  DiagonalMovement.always):
+            grid = Grid(matrix=random_matrix(60, seed, WEIGHTS))
+            cost, shortest_runs = shortest(grid, diagonal_movement)
+            for weight in (1.2, 2):
+                finder = finder_class(
+                    weight=weight, diagonal_movement=diagonal_movement)
+                path, runs = finder.find_path(
+                    grid.node(0, 0), grid.node(59, 59), grid)
+                check_path(grid, path, diagonal_movement)
+                assert path_cost(grid, path) <= weight * cost + 1e-9
+                assert runs < shortest_runs
+
+
+@pytest.mark.parametrize('open_list_class', [
+    IndexedHeap, SimpleHeap, PairingHeap, BucketQueue])
+def test_focal_search_open_lists(open_list_class):
+    grid = Grid(matrix=random_matrix(40, 7, WEIGHTS))
+    for diagonal_movement in (DiagonalMovement.never,
+                              DiagonalMovement.always):
+        cost, _ = shortest(grid, diagonal_movement)
+        for tie_breaking in (TieBreaking.fifo, TieBreaking.lifo,
+                             TieBreaking.high_g, TieBreaking.low_h):
+            finder = FocalSearchFinder(
+                weight=1.5, diagonal_movement=diagonal_movement,
+                open_list_class=open_list_class, tie_breaking=tie_breaking)
+            path, _ = finder.find_path(
+                grid.node(0, 0), grid.node(39, 39), grid)
+            check_path(grid, path, diagonal_movement)
+            assert path_cost(grid, path) <= 1.5 * cost + 1e-9
+
+
+def test_focal_search_no_path():
+    grid = Grid(matrix=[[1, 0, 1], [1, 0, 1]])
+    path, _ = FocalSearchFinder().find_path(
+        grid.node(0, 0), grid.node(2, 1), grid)
+    assert path == []
+
+
+def test_ara_star_improves():
+    for diagonal_movement in (DiagonalMovement.never,
+                              DiagonalMovement.always):
+        grid = CompactGrid(matrix=random_matrix(60, 4, WEIGHTS))
+        cost, _ = shortest(grid, diagonal_movement)
+        finder = ARAStarFinder(diagonal_movement=diagonal_movement)
+        results = list(finder.anytime_paths(
+            grid.node(0, 0), grid.node(59, 59), grid))
+        assert len(results) > 1
+        bounds = [bound for _, bound in results]
+        assert bounds == sorted(bounds, reverse=True)
+        assert bounds[-1] == 1
+        for path, bound in results:
+            check_path(grid, path, diagonal_movement)
+            assert path_cost(grid, path) <= bound * cost + 1e-9
+        assert path_cost(grid, results[-1][0]) == pytest.approx(cost)
+
+        path, runs = finder.find_path(
+            grid.node(0, 0), grid.node(59, 59), grid)
+        assert finder.bound == 1
+        assert path_cost(grid, path) == pytest.approx(cost)
+
+
+@pytest.mark.parametrize('open_list_class', [
+    IndexedHeap, SimpleHeap, PairingHeap, BucketQueue])
+def test_ara_star_open_lists(open_list_class):
+    """
+    nodes that were closed by an earlier search get opened again with every
+    open list and all paths keep their bound
+    """
+    rnd = random.Random(6)
+    for seed in range(6):
+        grid = Grid(matrix=random_matrix(20, seed, WEIGHTS))
+        for _ in range(10):
+            start = grid.node(rnd.randrange(20), rnd.randrange(20))
+            end = grid.node(rnd.randrange(20), rnd.randrange(20))
+            if not (start.walkable and end.walkable):
+                continue
+            for diagonal_movement in (DiagonalMovement.never,
+                                      DiagonalMovement.always):
+                path, _ = AStarFinder(
+                    diagonal_movement=diagonal_movement).find_path(
+                        start, end, grid)
+                cost = path_cost(grid, path)
+                finder = ARAStarFinder(
+                    diagonal_movement=diagonal_movement,
+                    open_list_class=open_list_class)
+                results = list(finder.anytime_paths(start, end, grid))
+                assert bool(results) == bool(path)
+                for anytime_path, bound in results:
+                    assert path_cost(grid, anytime_path) <= \
+                        bound * cost + 1e-9
+                if results:
+                    assert results[-1][1] == 1
+
+
+def test_ara_star_budget():
+    """
+    the best path so far is returned when the budget runs out
+    """
+    grid = Grid(matrix=random_matrix(60, 5, WEIGHTS))
+    cost, _ = shortest(grid, DiagonalMovement.never)
+    first_runs = None
+    finder = ARAStarFinder()
+    for _, _ in finder.anytime_paths(grid.node(0, 0), grid.node(59, 59),
+                                     grid):
+        first_runs = finder.runs
+        break
+
+    finder = ARAStarFinder(max_runs=first_runs + 1)
+    path, runs = finder.find_path(grid.node(0, 0), grid.node(59, 59), grid)
+    assert finder.bound > 1
+    assert path_cost(grid, path) <= finder.bound * cost + 1e-9
+
+    finder = ARAStarFinder(max_runs=first_runs // 2)
+    with pytest.raises(ExecutionRunsException):
+        finder.find_path(grid.node(0, 0), grid.node(59, 59), grid)
@@ -0,0 +1,142 @@
+import json
+import os
+import pickle
+import tracemalloc
+
+from pathfinding.core.compact_grid import CompactGrid
+from pathfinding.core.diagonal_movement import DiagonalMovement
+from pathfinding.core.grid import Grid
+from pathfinding.core.node import GridNode
+from pathfinding.core.world import World
+from pathfinding.finder.a_star import AStarFinder
+from pathfinding.finder.dijkstra import DijkstraFinder
+from pathfinding.finder.ida_star import IDAStarFinder
+
+import numpy as np
+import pytest
+
+
+BASE_PATH = os.path.abspath(os.path.dirname(__file__))
+scenarios = os.path.join(BASE_PATH, 'path_test_scenarios.json')
+data = json.load(open(scenarios, 'r', encoding='utf-8'))
+
+
+def _grids(scenario):
+    inverse = scenario.get('inverse', True)
+    for grid_class in (Grid, CompactGrid):
+        grid = grid_class(matrix=scenario['matrix'], inverse=inverse)
+        if scenario.get('passableLeftRightBorder'):
+            grid.set_passable_left_right_border()
+        if scenario.get('passableUpDownBorder'):
+            grid.set_passable_up_down_border()
+        yield grid
+
+
+def test_same_path_as_grid():
+    """
+    the compact grid has to give the same results as the normal grid
+    """
+    for scenario in data:
+        for finder_class in (AStarFinder, DijkstraFinder, IDAStarFinder):
+            results = []
+            for grid in _grids(scenario):
+                finder = finder_class(
+                    diagonal_movement=DiagonalMovement.always)
+                start = grid.node(scenario['startX'], scenario['startY'])
+                end = grid.node(scenario['endX'], scenario['endY'])
+                path, runs = finder.find_path(start, end, grid)
+                results.append(([tuple(p) for p in path], runs))
+            assert results[0] == results[1], scenario['name']
+
+
+def test_nodes():
+    grid = CompactGrid(matrix=[[1, 2], [0, 1]])
+    node = grid.node(1, 0)
+    assert isinstance(node, GridNode)
+    assert node == grid.node(1, 0)
+    assert node != grid.node(0, 0)
+    assert node.weight == 2
+    assert not grid.node(0, 1).walkable
+    assert grid.nodes[1][1] == grid.node(1, 1)
+    assert grid.min_weight == 1
+
+    # values get stored in the grid, not in the node
+    node.g = 3
+    node.parent = grid.node(0, 0)
+    assert grid.node(1, 0).g == 3
+    assert grid.node(1, 0).parent == grid.node(0, 0)
+    grid.cleanup()
+    assert grid.node(1, 0).g == 0
+    assert grid.node(1, 0).parent is None
+
+    grid.update_node(0, 1, walkable=True, weight=0.5)
+    assert grid.walkable(0, 1)
+    assert grid.min_weight == 0.5
+
+    with pytest.raises(IndexError):
+        grid.node(2, 0)
+
+
+def test_numpy():
+    """
+    a float64 matrix is used without copying it, others get converted
+    """
+    matrix = np.array([[1, 0, 2], [3, 1, 0]], dtype=np.float64)
+    grid = CompactGrid(matrix=matrix)
+    assert grid.min_weight == 1
+    assert not grid.node(1, 0).walkable
+    assert grid.node(0, 1).weight == 3
+    grid.update_node(0, 1, weight=5)
+    assert matrix[1, 0] == 5
+
+    for other in (matrix.astype(np.int32), matrix.T.copy().T,
+                  matrix.copy()):
+        other.flags.writeable = other.dtype != np.float64
+        grid = CompactGrid(matrix=other, inverse=True)
+        grid.update_node(1, 0, weight=7)
+        assert other[0, 1] == 0
+        assert grid.min_weight == 0
+        assert [node.walkable for node in grid.nodes[0]] == [
+            False, True, False]
+
+    # the pickled grid keeps the values
+    grid = pickle.loads(pickle.dumps(CompactGrid(matrix=matrix)))
+    assert grid.node(0, 1).weight == 5
+    assert grid.node(2, 0).walkable
+
+
+def test_grid_str():
+    matrix = [[1, 0, 1], [1, 5, 1]]
+    assert CompactGrid(matrix=matrix).grid_str(show_weight=True) == \
+        Grid(matrix=matrix).grid_str(show_weight=True)
+
+
+def test_connect():
+    level0 = [[1, 1, 1], [1, 0, 0], [1, 1, 1]]
+    level1 = [[1, 1, 1], [0, 0, 1], [1, 1, 1]]
+    grid0 = CompactGrid(matrix=level0, grid_id=0)
+    grid1 = CompactGrid(matrix=level1, grid_id=1)
+    grid0.node(2, 2).connect(grid1.node(2, 2))
+    grid1.node(2, 2).connect(grid0.node(2, 2))
+    world = World({0: grid0, 1: grid1})
+
+    path, _ = AStarFinder().find_path(
+        grid0.node(2, 0), grid1.node(0, 0), world)
+    assert [tuple(p) for p in path] == [
+        (2, 0, 0), (1, 0, 0), (0, 0, 0), (0, 1, 0), (0, 2, 0), (1, 2, 0),
+        (2, 2, 0), (2, 2, 1), (2, 1, 1), (2, 0, 1), (1, 0, 1), (0, 0, 1)]
+
+
+def test_memory():
+    """
+    the compact grid should need only a fraction of the memory
+    """
+    matrix = [[1] * 100 for _ in range(100)]
+    sizes = []
+    for grid_class in (Grid, CompactGrid):
+        tracemalloc.start()
+        grid = grid_class(matrix=matrix)
+        sizes.append(tracemalloc.get_traced_memory()[0])
+        tracemalloc.stop()
+        del grid
+    assert sizes[1] * 4 < sizes[0]
@@ -0,0 +1,183 @@
+import random
+
+import numpy as np
+import pytest
+
+from pathfinding.core.compact_grid import CompactGrid
+from pathfinding.core.diagonal_movement import DiagonalMovement
+from pathfinding.core.graph import Graph
+from pathfinding.core import grid as grid_module
+from pathfinding.core.grid import Grid
+from pathfinding.core.search_context import SearchContext
+from pathfinding.finder.a_star import AStarFinder
+from pathfinding.finder.bi_a_star import BiAStarFinder
+from pathfinding.finder.dijkstra import DijkstraFinder
+from pathfinding.finder.ida_star import IDAStarFinder
+
+# two rooms separated by a wall, the door in the middle is closed
+MATRIX = [
+    [1, 1, 0, 1, 1],
+    [1, 1, 0, 1, 1],
+    [1, 1, 0, 1, 1],
+]
+
+
+def reachable(grid, start, diagonal_movement):
+    seen = {(start.x, start.y)}
+    stack = [start]
+    while stack:
+        node = stack.pop()
+        for neighbor in grid.neighbors(node, diagonal_movement):
+            if (neighbor.x, neighbor.y) not in seen:
+                seen.add((neighbor.x, neighbor.y))
+                stack.append(neighbor)
+    return seen
+
+
+@pytest.mark.parametrize(
+    'finder_class', [AStarFinder, BiAStarFinder, IDAStarFinder])
+def test_unreachable(finder_class):
+    grid = Grid(matrix=MATRIX)
+    finder = finder_class()
+    path, runs = finder.find_path(grid.node(0, 0), grid.node(4, 2), grid)
+    assert (path, runs) == ([], 0)
+
+    grid.update_node(2, 1, walkable=True, weight=1)
+    path, runs = finder.find_path(grid.node(0, 0), grid.node(4, 2), grid)
+    assert len(path) == 7 and runs > 0
+
+
+@pytest.mark.parametrize('grid_class', [Grid, CompactGrid])
+def test_components(grid_class):
+    grid = grid_class(matrix=MATRIX)
+    labels = grid.components()
+    assert list(labels) == [0, 0, -1, 3, 3] * 3
+    assert grid.connected(grid.node(0, 2), grid.node(1, 0))
+    assert not grid.connected(grid.node(0, 0), grid.node(3, 0))
+    # blocked end
+    assert not grid.connected(grid.node(0, 0), grid.node(2, 0))
+    # a blocked start can still step to its neighbors
+    assert grid.connected(grid.node(2, 0), grid.node(4, 0))
+
+    grid.set_passable_left_right_border()
+    assert grid.connected(grid.node(0, 0), grid.node(4, 0))
+
+
+@pytest.mark.parametrize('search_limit', [4096, 3])
+@pytest.mark.parametrize('grid_class', [Grid, CompactGrid])
+def test_update_node(grid_class, search_limit, monkeypatch):
+    """
+    the labels follow update_node, also if the whole component has to be
+    labeled again
+    """
+    monkeypatch.setattr(grid_module, 'COMPONENT_SEARCH_LIMIT', search_limit)
+    rnd = random.Random(1)
+    matrix = [[int(rnd.random() < 0.6) for _ in range(12)] for _ in range(9)]
+    grid = grid_class(matrix=matrix)
+    movements = (DiagonalMovement.never, DiagonalMovement.always,
+                 DiagonalMovement.only_when_no_obstacle,
+                 DiagonalMovement.if_at_most_one_obstacle)
+    for movement in movements:
+        grid.components(movement)
+    for _ in range(100):
+        x, y = rnd.randrange(12), rnd.randrange(9)
+        grid.update_node(x, y, walkable=not grid.walkable(x, y), weight=1)
+        start = grid.node(rnd.randrange(12), rnd.randrange(9))
+        if not start.walkable:
+            continue
+        for movement in movements:
+            cells = reachable(grid, start, movement)
+            for y_end in range(9):
+                for x_end in range(12):
+                    assert grid.connected(
+                        start, grid.node(x_end, y_end), movement) == (
+                            (x_end, y_end) in cells)
+
+
+class ScanCounter(np.ndarray):
+    """
+    labels that count the comparisons of all cells at once
+    """
+    cells = 0
+    scans = 0
+
+    def __eq__(self, other):
+        if self.size >= ScanCounter.cells:
+            ScanCounter.scans += 1
+        return super().__eq__(other)
+
+
+def test_update_node_no_scan():
+    """
+    opening a cell only relabels the smaller component, the labels of the
+    whole grid are not scanned for every cell
+    """
+    matrix = np.ones((100, 100))
+    matrix[:, 50] = 0
+    grid = Grid(matrix=matrix)
+    ScanCounter.cells = 100 * 100
+    labels = grid.components().view(ScanCounter)
+    grid._components[DiagonalMovement.never] = labels
+    for y in range(100):
+        grid.update_node(50, y, walkable=True, weight=1)
+    assert ScanCounter.scans == 0
+    assert len(set(labels.tolist())) == 1
+    assert grid.connected(grid.node(0, 0), grid.node(99, 99))
+
+
+def test_graph():
+    graph = Graph(edges=[[1, 2, 1], [3, 2, 1], [4, 5, 1]])
+    finder = DijkstraFinder()
+    assert graph.connected(graph.node(1), graph.node(3))
+    assert not graph.connected(graph.node(1), graph.node(5))
+    path, runs = finder.find_path(graph.node(1), graph.node(5), graph)
+    assert (path, runs) == ([], 0)
+
+    graph.add_edge(2, 4, 1)
+    path, _ = finder.find_path(graph.node(1), graph.node(5), graph)
+    assert [node.node_id for node in path] == [1, 2, 4, 5]
+    graph.remove_node(4)
+    assert not graph.connected(graph.node(1), graph.node(5))
+
+
+def test_connections():
+    grid = Grid(matrix=MATRIX)
+    assert not grid.connected(grid.node(0, 0), grid.node(4, 0))
+    grid.node(1, 0).connect(grid.node(3, 0))
+    grid.invalidate_neighbor_tables()
+    path, _ = AStarFinder().find_path(grid.node(0, 0), grid.node(4, 0), grid)
+    assert len(path) == 4
+
+    # connected to another grid, the grid alone can't tell
+    other = Grid(matrix=MATRIX)
+    grid.node(0, 2).connect(other.node(0, 0))
+    grid.invalidate_neighbor_tables()
+    assert grid.components() is None
+    assert grid.connected(grid.node(0, 0), grid.node(4, 0))
+
+
+@pytest.mark.parametrize('grid_class', [Grid, CompactGrid])
+def test_connections_update_node(grid_class):
+    """
+    a cell that gets walkable is joined with the cells it is connected with
+    """
+    grid = grid_class(matrix=[[0, 1, 0, 1, 1]])
+    grid.node(0, 0).connect(grid.node(4, 0))
+    grid.node(4, 0).connect(grid.node(0, 0))
+    grid.node(2, 0).connect(grid.node(0, 0))
+    assert grid.components() is not None
+    grid.update_node(0, 0, walkable=True, weight=1)
+    assert grid.connected(grid.node(0, 0), grid.node(4, 0))
+    path, _ = AStarFinder().find_path(grid.node(0, 0), grid.node(4, 0), grid)
+    assert [(node.x, node.y) for node in path] == [(0, 0), (4, 0)]
+    # connected to a cell that is blocked
+    grid.update_node(2, 0, walkable=True, weight=1)
+    assert grid.connected(grid.node(2, 0), grid.node(1, 0))
+
+
+def test_search_context():
+    grid = Grid(matrix=MATRIX)
+    context = SearchContext(grid)
+    path, runs = context.find_path(
+        AStarFinder(), grid.node(0, 0), grid.node(4, 0))
+    assert (path, runs) == ([], 0)
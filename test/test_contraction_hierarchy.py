@@ -0,0 +1,80 @@
+import random
+
+import pytest
+
+from pathfinding.core.graph import Graph
+from pathfinding.core.grid import Grid
+from pathfinding.finder.contraction_hierarchy import (
+    ContractionHierarchy, ContractionHierarchyFinder)
+from pathfinding.finder.dijkstra import DijkstraFinder
+
+from helpers import path_cost
+
+
+EDGES = [
+    [1, 2, 7],
+    [1, 3, 9],
+    [1, 6, 14],
+    [2, 3, 10],
+    [2, 4, 15],
+    [3, 4, 11],
+    [3, 6, 2],
+    [4, 5, 6],
+    [6, 5, 9]
+]
+
+
+def test_graph():
+    graph = Graph(edges=EDGES, bi_directional=True)
+    finder = ContractionHierarchyFinder()
+    path, runs = finder.find_path(graph.node(1), graph.node(5), graph)
+    assert [n.node_id for n in path] == [1, 3, 6, 5]
+    assert runs > 0
+    path, _ = finder.find_path(graph.node(5), graph.node(1), graph)
+    assert [n.node_id for n in path] == [5, 6, 3, 1]
+
+    # the other way is not possible in a directed graph
+    graph = Graph(edges=[list(edge) for edge in EDGES])
+    finder = ContractionHierarchyFinder()
+    path, _ = finder.find_path(graph.node(5), graph.node(1), graph)
+    assert path == []
+    path, _ = finder.find_path(graph.node(1), graph.node(1), graph)
+    assert path == [graph.node(1)]
+
+
+def test_same_cost_as_dijkstra():
+    rnd = random.Random(0)
+    for bi_directional in (False, True):
+        edges = [[rnd.randrange(50), rnd.randrange(50), rnd.randint(1, 9)]
+                 for _ in range(150)]
+        graph = Graph(edges=edges, bi_directional=bi_directional)
+        finder = ContractionHierarchyFinder()
+        hierarchy = finder.preprocess(graph)
+        node_ids = list(graph.nodes)
+        for _ in range(50):
+            start = graph.node(rnd.choice(node_ids))
+            end = graph.node(rnd.choice(node_ids))
+            path, _ = finder.find_path(start, end, graph)
+            expected, _ = DijkstraFinder().find_path(start, end, graph)
+            assert finder.hierarchy is hierarchy
+            assert bool(path) == bool(expected)
+            if path:
+                assert path[0] == start and path[-1] == end
+                assert path_cost(graph, path) == path_cost(graph, expected)
+
+
+def test_shortcuts_are_unpacked():
+    edges = [[i, i + 1, 1] for i in range(20)]
+    graph = Graph(edges=edges, bi_directional=True)
+    hierarchy = ContractionHierarchy(graph)
+    assert hierarchy.shortcuts > 0
+    path, cost, _ = hierarchy.query(0, 20)
+    assert path == list(range(21))
+    assert cost == 20
+
+
+def test_only_graphs():
+    grid = Grid(width=3, height=3)
+    with pytest.raises(TypeError):
+        ContractionHierarchyFinder().find_path(
+            grid.node(0, 0), grid.node(2, 2), grid)
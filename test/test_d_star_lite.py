@@ -0,0 +1,102 @@
+import gc
+import random
+
+import pytest
+
+from pathfinding.core.diagonal_movement import DiagonalMovement
+from pathfinding.core.graph import Graph
+from pathfinding.core.grid import Grid
+from pathfinding.finder.d_star_lite import DStarLiteFinder
+from pathfinding.finder.dijkstra import DijkstraFinder
+
+from helpers import path_cost
+
+
+def test_replan_after_changes():
+    """
+    a unit walks along its path while cells change, the repaired path
+    always costs the same as a new search
+    """
+    rnd = random.Random(0)
+    for diagonal_movement in (DiagonalMovement.never,
+                              DiagonalMovement.only_when_no_obstacle):
+        size = 20
+        grid = Grid(matrix=[[rnd.choice((0, 1, 1, 1, 3))
+                             for _ in range(size)] for _ in range(size)])
+        grid.set_passable_left_right_border()
+        finder = DStarLiteFinder(diagonal_movement=diagonal_movement)
+        dijkstra = DijkstraFinder(diagonal_movement=diagonal_movement)
+        start, end = grid.node(0, 0), grid.node(size - 1, size - 1)
+        grid.update_node(end.x, end.y, walkable=True, weight=1)
+        for _ in range(30):
+            path, _ = finder.find_path(start, end, grid)
+            expected, _ = dijkstra.find_path(start, end, grid)
+            assert bool(path) == bool(expected)
+            if path:
+                assert path[0] == start and path[-1] == end
+                assert path_cost(grid, path) == pytest.approx(
+                    path_cost(grid, expected))
+                if len(path) > 1:
+                    start = path[1]
+            for _ in range(2):
+                weight = rnd.choice((0, 1, 2, 5))
+                grid.update_node(rnd.randrange(size), rnd.randrange(size),
+                                 walkable=weight > 0, weight=weight)
+
+
+def test_repair_is_cheaper():
+    rnd = random.Random(1)
+    matrix = [[rnd.randint(1, 9) for _ in range(30)] for _ in range(30)]
+    grid = Grid(matrix=matrix)
+    finder = DStarLiteFinder()
+    start, end = grid.node(0, 0), grid.node(29, 29)
+    path, _ = finder.find_path(start, end, grid)
+    blocked = path[3]
+    grid.update_node(blocked.x, blocked.y, walkable=False, weight=0)
+    path, runs = finder.find_path(path[1], end, grid)
+    assert blocked not in path
+    new_path, new_runs = DStarLiteFinder().find_path(path[0], end, grid)
+    assert path_cost(grid, path) == pytest.approx(path_cost(grid, new_path))
+    assert runs < new_runs
+
+
+def test_new_end_and_unreachable():
+    grid = Grid(width=5, height=5)
+    finder = DStarLiteFinder()
+    path, _ = finder.find_path(grid.node(0, 0), grid.node(4, 4), grid)
+    assert len(path) == 9
+    path, _ = finder.find_path(grid.node(0, 0), grid.node(4, 0), grid)
+    assert path[-1] == grid.node(4, 0)
+
+    for y in range(5):
+        grid.update_node(2, y, walkable=False, weight=0)
+    path, _ = finder.find_path(grid.node(0, 0), grid.node(4, 0), grid)
+    assert path == []
+    grid.update_node(2, 3, walkable=True, weight=1)
+    path, _ = finder.find_path(grid.node(0, 0), grid.node(4, 0), grid)
+    assert grid.node(2, 3) in path
+
+
+def test_listener():
+    """
+    the finder stops listening to the grid when it searches another grid or
+    gets garbage collected
+    """
+    grid = Grid(matrix=[[1, 1, 1], [1, 1, 1]])
+    other = Grid(matrix=[[1, 1, 1], [1, 1, 1]])
+    finder = DStarLiteFinder()
+    finder.find_path(grid.node(0, 0), grid.node(2, 1), grid)
+    assert len(grid._listeners) == 1
+    finder.find_path(other.node(0, 0), other.node(2, 1), other)
+    assert not grid._listeners and len(other._listeners) == 1
+
+    del finder
+    gc.collect()
+    other.update_node(1, 0, walkable=False)
+    assert not other._listeners
+
+
+def test_only_grids():
+    graph = Graph(edges=[[1, 2, 1]])
+    with pytest.raises(TypeError):
+        DStarLiteFinder().find_path(graph.node(1), graph.node(2), graph)
@@ -0,0 +1,57 @@
+import numpy as np
+
+from pathfinding.core.diagonal_movement import DiagonalMovement
+from pathfinding.core.grid import Grid
+from pathfinding.finder.dijkstra import DijkstraFinder
+
+from helpers import path_cost
+
+
+MATRIX = [
+    [1, 1, 1, 1, 1],
+    [1, 0, 0, 0, 1],
+    [1, 1, 5, 0, 1],
+    [0, 0, 1, 0, 1],
+    [1, 1, 1, 1, 1],
+]
+
+
+def test_same_cost_as_find_path():
+    grid = Grid(matrix=MATRIX)
+    grid.set_passable_up_down_border()
+    finder = DijkstraFinder(diagonal_movement=DiagonalMovement.always)
+    goal = grid.node(0, 4)
+    field = finder.distance_field(goal, grid)
+    for y, row in enumerate(MATRIX):
+        for x, value in enumerate(row):
+            if not value:
+                assert not field.reachable(x, y)
+                assert field.path(x, y) == []
+                continue
+            path, _ = finder.find_path(grid.node(x, y), goal, grid)
+            assert np.isclose(field.distance[y, x], path[-1].g)
+            field_path = field.path(x, y)
+            assert field_path[0] == grid.node(x, y)
+            assert field_path[-1] == goal
+            assert np.isclose(
+                path_cost(grid, field_path), field.distance[y, x])
+            if len(field_path) > 1:
+                dx, dy = field.direction[y, x]
+                assert ((x + dx) % 5, (y + dy) % 5) == tuple(field_path[1])
+    assert field.parent[4, 0] == -1
+    assert tuple(field.direction[4, 0]) == (0, 0)
+
+
+def test_cutoff():
+    grid = Grid(width=20, height=20)
+    finder = DijkstraFinder()
+    field = finder.distance_field(grid.node(10, 10), grid, max_cost=3)
+    assert np.isfinite(field.distance).sum() == 25
+    assert field.distance.max(initial=0, where=np.isfinite(
+        field.distance)) == 3
+    assert finder.runs < 30
+
+    field = finder.distance_field(grid.node(10, 10), grid, radius=2)
+    assert field.reachable(12, 10)
+    assert not field.reachable(12, 12)
+    assert not field.reachable(0, 0)
@@ -1,5 +1,7 @@
 from unittest.mock import patch
 
+import pytest
+
 from pathfinding.core.graph import Graph
 from pathfinding.finder.dijkstra import DijkstraFinder
 
@@ -47,7 +49,99 @@ def test_graph_cleanup():
 
     assert graph.dirty
 
+    # nodes are reset lazily, the finder does not need to clean the graph
     with patch.object(graph, "cleanup", wraps=graph.cleanup) as mock_cleanup:
         path, _ = finder.find_path(graph.node(1), graph.node(0), graph)
         assert [n.node_id for n in path] == [1, 0]
-        mock_cleanup.assert_called_once()
+        mock_cleanup.assert_not_called()
+
+
+def test_add_remove_edges():
+    graph = Graph(edges=[[1, 2, 1], [2, 3, 1]], bi_directional=False)
+    finder = DijkstraFinder()
+    path, _ = finder.find_path(graph.node(1), graph.node(3), graph)
+    assert [n.node_id for n in path] == [1, 2, 3]
+
+    # add a shortcut, the index gets updated without rebuilding it
+    graph.add_edge(1, 3, 1.5)
+    assert graph.calc_cost(graph.node(1), graph.node(3)) == 1.5
+    path, _ = finder.find_path(graph.node(1), graph.node(3), graph)
+    assert [n.node_id for n in path] == [1, 3]
+
+    # new nodes are added to the graph
+    graph.add_edge(3, 4, 1)
+    assert [n.node_id for n in graph.neighbors(graph.node(3))] == [4]
+
+    graph.remove_edge(1, 3)
+    assert [n.node_id for n in graph.neighbors(graph.node(1))] == [2]
+    with pytest.raises(RuntimeError):
+        graph.calc_cost(graph.node(1), graph.node(3))
+    path, _ = finder.find_path(graph.node(1), graph.node(4), graph)
+    assert [n.node_id for n in path] == [1, 2, 3, 4]
+
+
+class ScanList(list):
+    """
+    edges that count how often all of them are looked at
+    """
+    scans = 0
+
+    def __iter__(self):
+        ScanList.scans += 1
+        return super().__iter__()
+
+
+def test_remove_edges_no_scan():
+    """
+    removing edges only updates the index, the list of edges is updated
+    when it is used
+    """
+    graph = Graph(edges=[[1, 2, 1], [2, 3, 1], [1, 3, 5], [3, 4, 1]])
+    graph.edges = ScanList(graph.edges)
+    graph.remove_edge(1, 3)
+    graph.remove_node(4)
+    assert ScanList.scans == 0
+    assert [n.node_id for n in graph.neighbors(graph.node(1))] == [2]
+    assert [n.node_id for n in graph.neighbors(graph.node(3))] == []
+
+    assert [[edge[0].node_id, edge[1].node_id, edge[2]]
+            for edge in graph.edges] == [[1, 2, 1], [2, 3, 1]]
+    # added again after it was removed
+    graph.remove_edge(2, 3)
+    graph.add_edge(2, 3, 2)
+    assert [[edge[0].node_id, edge[1].node_id, edge[2]]
+            for edge in graph.edges] == [[1, 2, 1], [2, 3, 2]]
+    graph.build_index()
+    assert graph.calc_cost(graph.node(2), graph.node(3)) == 2
+
+
+def test_bi_directional_index():
+    graph = Graph(edges=[[1, 2, 5], [2, 1, 3], [3, 1, 2]],
+                  bi_directional=True)
+    assert [n.node_id for n in graph.neighbors(graph.node(1))] == [2, 3]
+    # the cheapest edge between two nodes is used
+    assert graph.calc_cost(graph.node(1), graph.node(2)) == 3
+    assert graph.calc_cost(graph.node(1), graph.node(3)) == 2
+
+    graph.remove_edge(3, 1)
+    assert [n.node_id for n in graph.neighbors(graph.node(1))] == [2]
+    assert [n.node_id for n in graph.neighbors(graph.node(3))] == []
+
+
+def test_big_graph():
+    """
+    neighbors and costs are looked up without scanning all edges
+    """
+    size = 200
+    edges = []
+    for y in range(size):
+        for x in range(size):
+            if x + 1 < size:
+                edges.append([f'{x}_{y}', f'{x + 1}_{y}', 1])
+            if y + 1 < size:
+                edges.append([f'{x}_{y}', f'{x}_{y + 1}', 1])
+    graph = Graph(edges=edges, bi_directional=True)
+    finder = DijkstraFinder(time_limit=10)
+    path, _ = finder.find_path(
+        graph.node('0_0'), graph.node(f'{size - 1}_{size - 1}'), graph)
+    assert len(path) == 2 * size - 1
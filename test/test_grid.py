@@ -1,7 +1,13 @@
+import pickle
+import random
+from unittest.mock import patch
+
 import numpy as np
+import pytest
 
 from pathfinding.core.diagonal_movement import DiagonalMovement
 from pathfinding.core.grid import Grid
+from pathfinding.core import grid as grid_module
 from pathfinding.finder.a_star import AStarFinder
 
 BORDERLESS_GRID = """
@@ -81,5 +87,173 @@ def test_numpy():
     assert grid.grid_str(path, start, end) == SIMPLE_WALKED[1:-1]
 
 
+def test_numpy_same_as_list():
+    """
+    grids created from numpy arrays are the same as the ones created from
+    lists, for all dtypes and memory layouts
+    """
+    rnd = random.Random(3)
+    matrix = [[rnd.choice((-1, 0, 1, 2, 4)) for _ in range(7)]
+              for _ in range(5)]
+    for inverse in (False, True):
+        expected = Grid(matrix=matrix, inverse=inverse)
+        for array in (np.array(matrix), np.array(matrix).astype(np.int8),
+                      np.asfortranarray(matrix)):
+            grid = Grid(matrix=array, inverse=inverse)
+            assert grid.min_weight == expected.min_weight
+            for row, expected_row in zip(grid.nodes, expected.nodes):
+                for node, expected_node in zip(row, expected_row):
+                    assert node.walkable == expected_node.walkable
+                    assert node.weight == expected_node.weight
+                    assert type(node.weight) is float
+
+
+def test_reuse_without_cleanup():
+    """
+    values of an older search must not influence the next search
+    """
+    grid = Grid(matrix=SIMPLE_MATRIX)
+    finder = AStarFinder()
+    with patch.object(grid, 'cleanup', wraps=grid.cleanup) as mock_cleanup:
+        path, _ = finder.find_path(grid.node(0, 0), grid.node(2, 2), grid)
+        assert len(path) == 5
+        path, _ = finder.find_path(grid.node(2, 2), grid.node(0, 1), grid)
+        assert [tuple(p) for p in path] == [(2, 2), (1, 2), (0, 2), (0, 1)]
+        mock_cleanup.assert_not_called()
+
+    # stale values are ignored even without a cleanup
+    assert grid.node(0, 0).closed
+    path, _ = finder.find_path(grid.node(0, 0), grid.node(2, 0), grid)
+    assert len(path) == 3
+
+
+def _neighbor_positions(grid):
+    return {
+        (x, y, diagonal_movement): [
+            (n.x, n.y) for n in grid.neighbors(
+                grid.node(x, y), diagonal_movement=diagonal_movement)]
+        for diagonal_movement in (
+            DiagonalMovement.always, DiagonalMovement.never,
+            DiagonalMovement.if_at_most_one_obstacle,
+            DiagonalMovement.only_when_no_obstacle)
+        for y in range(grid.height) for x in range(grid.width)}
+
+
+def test_neighbor_tables():
+    """
+    neighbor tables created with numpy and without have to be the same and
+    need to be updated if a node changes
+    """
+    rnd = random.Random(1)
+    for _ in range(20):
+        width, height = rnd.randint(1, 6), rnd.randint(1, 6)
+        matrix = [[rnd.choice([0, 1, 1]) for _ in range(width)]
+                  for _ in range(height)]
+        left_right, up_down = rnd.random() < 0.5, rnd.random() < 0.5
+
+        neighbors = []
+        for use_numpy in (True, False):
+            with patch.object(grid_module, 'USE_NUMPY', use_numpy):
+                grid = Grid(matrix=matrix)
+                if left_right:
+                    grid.set_passable_left_right_border()
+                if up_down:
+                    grid.set_passable_up_down_border()
+                neighbors.append(_neighbor_positions(grid))
+        assert neighbors[0] == neighbors[1]
+
+        # update a cell and compare with a fresh grid
+        x, y = rnd.randrange(width), rnd.randrange(height)
+        matrix[y][x] = 1 - matrix[y][x]
+        grid.update_node(x, y, walkable=bool(matrix[y][x]), weight=1)
+        fresh_grid = Grid(matrix=matrix)
+        if left_right:
+            fresh_grid.set_passable_left_right_border()
+        if up_down:
+            fresh_grid.set_passable_up_down_border()
+        assert _neighbor_positions(grid) == _neighbor_positions(fresh_grid)
+
+
+def test_min_weight():
+    """
+    the minimum weight gets bigger again if the cheapest cells get heavier
+    or blocked
+    """
+    grid = Grid(matrix=[[1, 2, 3], [2, 2, 3]])
+    assert grid.min_weight == 1
+    grid.update_node(0, 0, weight=4)
+    assert grid.min_weight == 2
+    grid.update_node(2, 1, weight=1)
+    assert grid.min_weight == 1
+    grid.update_node(2, 1, walkable=False)
+    assert grid.min_weight == 2
+    grid.update_region(np.s_[:, :2], weight=5)
+    assert grid.min_weight == 3
+    grid.update_mask(np.ones((2, 3), dtype=bool), walkable=False)
+    assert grid.min_weight == float('inf')
+
+
+def test_update_region():
+    """
+    bulk updates give the same grid as changing cell by cell, the
+    subscribers get notified once
+    """
+    rnd = np.random.default_rng(1)
+    matrix = rnd.integers(0, 3, (8, 10))
+    grid = Grid(matrix=matrix)
+    expected = Grid(matrix=matrix)
+    for movement in (DiagonalMovement.never, DiagonalMovement.always):
+        grid.components(movement)
+        expected.components(movement)
+    changes = []
+    grid.subscribe(lambda _, cells: changes.append(cells))
+
+    weights = rnd.integers(1, 5, (3, 4))
+    walkable = rnd.random((3, 4)) < 0.5
+    grid.update_region(np.s_[2:5, 3:7], weight=weights, walkable=walkable)
+    for y in range(3):
+        for x in range(4):
+            expected.update_node(x + 3, y + 2, weight=weights[y][x],
+                                 walkable=bool(walkable[y][x]))
+    assert len(changes) == 1
+    assert sorted(changes[0]) == sorted(
+        (x + 3, y + 2) for y in range(3) for x in range(4)
+        if matrix[y + 2][x + 3] != weights[y][x] or
+        (matrix[y + 2][x + 3] > 0) != walkable[y][x])
+    assert _neighbor_positions(grid) == _neighbor_positions(expected)
+    assert grid.min_weight == expected.min_weight
+    for movement in (DiagonalMovement.never, DiagonalMovement.always):
+        for y in range(8):
+            for x in range(10):
+                assert grid.connected(
+                    grid.node(0, 0), grid.node(x, y), movement) == \
+                    expected.connected(
+                        expected.node(0, 0), expected.node(x, y), movement)
+
+    # nothing changes, no notification
+    grid.update_mask(np.zeros((8, 10), dtype=bool), walkable=False)
+    assert len(changes) == 1
+    with pytest.raises(ValueError):
+        grid.update_region(np.s_[0, :], weight=0, walkable=True)
+
+
+def test_neighbor_function():
+    """
+    the neighbors functions are dropped when the borders change and are not
+    pickled, nodes of different grids are not equal
+    """
+    grid = Grid(matrix=[[1, 1, 1]])
+    left = grid.node(0, 0)
+    assert grid.neighbors(left) == [grid.node(1, 0)]
+    grid.set_passable_left_right_border()
+    assert grid.neighbors(left) == [grid.node(1, 0), grid.node(2, 0)]
+
+    copy = pickle.loads(pickle.dumps(grid))
+    assert copy.neighbors(copy.node(0, 0)) == [
+        copy.node(1, 0), copy.node(2, 0)]
+    assert copy.node(0, 0) != left
+    assert len({left, grid.node(0, 0), copy.node(0, 0)}) == 2
+
+
 if __name__ == '__main__':
     test_str()
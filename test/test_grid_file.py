@@ -0,0 +1,87 @@
+import multiprocessing
+import random
+
+import numpy as np
+import pytest
+
+from pathfinding.core.compact_grid import CompactGrid
+from pathfinding.core.diagonal_movement import DiagonalMovement
+from pathfinding.core.grid import Grid
+from pathfinding.finder.a_star import AStarFinder
+from pathfinding.io.grid_file import open_grid, read_header, write_grid
+
+
+def random_grid(grid_class, width=13, height=7, seed=0):
+    rnd = random.Random(seed)
+    matrix = [[rnd.choice((0, 1, 1, 2, 3.5)) for _ in range(width)]
+              for _ in range(height)]
+    grid = grid_class(matrix=matrix)
+    grid.set_passable_left_right_border()
+    return grid
+
+
+def cells(grid):
+    return [[(node.walkable, node.weight) for node in row]
+            for row in grid.nodes]
+
+
+def test_write_and_open(tmp_path):
+    for grid_class in (Grid, CompactGrid):
+        grid = random_grid(grid_class)
+        # walkability that doesn't follow from the weight
+        grid.update_node(2, 3, walkable=False)
+        file = tmp_path / 'map.grid'
+        write_grid(grid, file)
+        assert read_header(file)['width'] == 13
+        for open_class in (Grid, CompactGrid):
+            loaded = open_grid(file, open_class)
+            assert isinstance(loaded, open_class)
+            assert (loaded.width, loaded.height) == (13, 7)
+            assert loaded.passable_left_right_border
+            assert not loaded.passable_up_down_border
+            assert loaded.min_weight == grid.min_weight
+            assert cells(loaded) == cells(grid)
+
+            finder = AStarFinder(diagonal_movement=DiagonalMovement.always)
+            path, _ = finder.find_path(
+                loaded.node(0, 0), loaded.node(12, 6), loaded)
+            expected, _ = finder.find_path(
+                grid.node(0, 0), grid.node(12, 6), grid)
+            assert [tuple(node) for node in path] == \
+                [tuple(node) for node in expected]
+
+
+def test_changes_stay_private(tmp_path):
+    """
+    the memory mapped file is not changed by update_node
+    """
+    file = tmp_path / 'map.grid'
+    write_grid(random_grid(CompactGrid), file)
+    grid = open_grid(file)
+    assert isinstance(grid._weight.obj, np.memmap)
+    grid.update_node(1, 1, weight=9, walkable=True)
+    assert grid.node(1, 1).weight == 9
+    assert open_grid(file).node(1, 1).weight != 9
+
+
+def test_not_a_grid_file(tmp_path):
+    file = tmp_path / 'map.grid'
+    file.write_bytes(b'P1\n2 2\n0 1 1 0\n')
+    with pytest.raises(ValueError):
+        open_grid(file)
+
+
+def _path_length(file):
+    grid = open_grid(file)
+    finder = AStarFinder()
+    path, _ = finder.find_path(grid.node(0, 0), grid.node(12, 6), grid)
+    return len(path)
+
+
+def test_worker_processes(tmp_path):
+    file = tmp_path / 'map.grid'
+    grid = CompactGrid(width=13, height=7)
+    write_grid(grid, file)
+    context = multiprocessing.get_context('spawn')
+    with context.Pool(2) as pool:
+        assert pool.map(_path_length, [str(file)] * 2) == [19, 19]
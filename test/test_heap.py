@@ -1,5 +1,10 @@
-from pathfinding.core.heap import SimpleHeap
+from pathfinding.core.diagonal_movement import DiagonalMovement
+from pathfinding.core.heap import (
+    BucketQueue, IndexedHeap, PairingHeap, SimpleHeap, TieBreaking)
 from pathfinding.core.grid import Grid
+from pathfinding.finder.a_star import AStarFinder
+from pathfinding.finder.bi_a_star import BiAStarFinder
+from pathfinding.finder.dijkstra import DijkstraFinder
 
 
 def test_heap():
@@ -24,3 +29,92 @@ def test_heap():
     assert open_list.pop_node() == grid.node(1, 1)
     assert open_list.pop_node() == grid.node(1, 3)
     assert len(open_list) == 0
+
+
+def test_open_lists():
+    """
+    all open lists return nodes ordered by f and in insertion order
+    """
+    for open_list_class in (IndexedHeap, PairingHeap, BucketQueue):
+        grid = Grid(width=10, height=10)
+        start = grid.node(0, 0)
+        open_list = open_list_class(start, grid)
+        assert open_list.pop_node() == start
+        assert len(open_list) == 0
+
+        for x, f in enumerate([5, 3, 3, 7, 1, 3]):
+            node = grid.node(x, 1)
+            node.f = f
+            open_list.push_node(node)
+        assert len(open_list) == 6
+
+        # remove one node and decrease the f value of another one
+        open_list.remove_node(grid.node(3, 1), 7)
+        node = grid.node(0, 1)
+        node.f = 2
+        open_list.update_node(node, 5)
+        assert len(open_list) == 5
+
+        order = []
+        while len(open_list) > 0:
+            order.append(open_list.pop_node().x)
+        assert order == [4, 0, 1, 2, 5], open_list_class.__name__
+
+
+def test_finders_with_open_lists():
+    """
+    the finders expand the same nodes with every open list
+    """
+    matrix = [[(x * 7 + y * 3) % 5 + 1 for x in range(15)] for y in range(15)]
+    for finder_class in (AStarFinder, DijkstraFinder, BiAStarFinder):
+        results = set()
+        for open_list_class in (IndexedHeap, PairingHeap, BucketQueue):
+            grid = Grid(matrix=matrix)
+            finder = finder_class(diagonal_movement=DiagonalMovement.always,
+                                  open_list_class=open_list_class)
+            path, runs = finder.find_path(
+                grid.node(0, 0), grid.node(14, 14), grid)
+            results.add((tuple(tuple(n) for n in path), runs))
+        assert len(results) == 1, finder_class.__name__
+
+
+def test_tie_breaking():
+    """
+    nodes with the same f value are ordered by the tie-breaking policy
+    """
+    expected = {
+        TieBreaking.fifo: [4, 0, 1, 2, 5, 3],
+        TieBreaking.lifo: [4, 5, 2, 1, 0, 3],
+        TieBreaking.high_g: [4, 2, 0, 1, 5, 3],
+        TieBreaking.low_h: [4, 2, 0, 1, 5, 3],
+    }
+    for open_list_class in (SimpleHeap, IndexedHeap, PairingHeap,
+                            BucketQueue):
+        for tie_breaking, order in expected.items():
+            grid = Grid(width=10, height=10)
+            open_list = open_list_class(grid.node(0, 0), grid, tie_breaking)
+            open_list.pop_node()
+            for x, (g, h) in enumerate(
+                    [(2, 1), (1, 2), (3, 0), (5, 5), (0, 1), (1, 2)]):
+                node = grid.node(x, 1)
+                node.g, node.h, node.f = g, h, g + h
+                open_list.push_node(node)
+            assert [open_list.pop_node().x for _ in range(6)] == order, \
+                (open_list_class.__name__, tie_breaking)
+
+
+def test_tie_breaking_finder():
+    """
+    on an open map preferring high g values expands only the nodes of the
+    path, the cost stays the same
+    """
+    runs = {}
+    for tie_breaking in (TieBreaking.fifo, TieBreaking.lifo,
+                         TieBreaking.high_g, TieBreaking.low_h):
+        grid = Grid(width=30, height=30)
+        finder = AStarFinder(tie_breaking=tie_breaking)
+        path, runs[tie_breaking] = finder.find_path(
+            grid.node(0, 0), grid.node(29, 29), grid)
+        assert len(path) == 59
+    assert runs[TieBreaking.fifo] == 900
+    assert runs[TieBreaking.high_g] == runs[TieBreaking.low_h] == 59
@@ -0,0 +1,141 @@
+import random
+
+from pathfinding.core.diagonal_movement import DiagonalMovement
+from pathfinding.core.grid import Grid
+from pathfinding.finder.a_star import AStarFinder
+from pathfinding.finder.hpa_star import ClusterGraph, HPAStarFinder
+
+from helpers import path_cost, random_matrix
+
+# weights of the walkable cells of the random grids
+WEIGHTS = (1, 1, 1, 1, 2)
+
+
+def check_queries(grid, finder, diagonal_movement, queries=20, seed=0):
+    """
+    HPA* finds a valid path whenever A* does, close to the shortest one
+    """
+    rnd = random.Random(seed)
+    astar = AStarFinder(diagonal_movement=diagonal_movement)
+    costs = []
+    for _ in range(queries):
+        start = grid.node(rnd.randrange(grid.width),
+                          rnd.randrange(grid.height))
+        end = grid.node(rnd.randrange(grid.width),
+                        rnd.randrange(grid.height))
+        if not start.walkable or not end.walkable or start == end:
+            continue
+        path, _ = finder.find_path(start, end, grid)
+        expected, _ = astar.find_path(start, end, grid)
+        assert bool(path) == bool(expected)
+        if not path:
+            continue
+        assert path[0] == start and path[-1] == end
+        for node_a, node_b in zip(path, path[1:]):
+            assert node_b in grid.neighbors(node_a, diagonal_movement)
+        costs.append((path_cost(grid, path), path_cost(grid, expected)))
+    assert costs
+    # near optimal
+    assert sum(cost for cost, _ in costs) <= \
+        1.2 * sum(cost for _, cost in costs)
+
+
+def test_near_optimal():
+    for diagonal_movement in (DiagonalMovement.never,
+                              DiagonalMovement.always,
+                              DiagonalMovement.only_when_no_obstacle):
+        grid = Grid(matrix=random_matrix(40, 1, WEIGHTS))
+        finder = HPAStarFinder(
+            diagonal_movement=diagonal_movement, cluster_size=8)
+        check_queries(grid, finder, diagonal_movement)
+
+
+def test_passable_borders():
+    grid = Grid(matrix=random_matrix(30, 2, WEIGHTS))
+    grid.set_passable_left_right_border()
+    grid.set_passable_up_down_border()
+    finder = HPAStarFinder(diagonal_movement=DiagonalMovement.always,
+                           cluster_size=7)
+    check_queries(grid, finder, DiagonalMovement.always)
+
+
+def test_cluster_graph_is_cached():
+    grid = Grid(matrix=random_matrix(30, 3, WEIGHTS))
+    finder = HPAStarFinder(cluster_size=10)
+    cluster_graph = finder.preprocess(grid)
+    finder.find_path(grid.node(0, 0), grid.node(29, 29), grid)
+    assert finder.cluster_graph is cluster_graph
+    path, _ = finder.find_path(grid.node(5, 5), grid.node(5, 5), grid)
+    assert path == [grid.node(5, 5)]
+
+
+def test_update_grid():
+    """
+    the cluster graph follows changes of the grid
+    """
+    size = 24
+    # entrances of 6 cells get transitions at both ends
+    grid = Grid(width=size, height=size)
+    finder = HPAStarFinder(cluster_size=6)
+    start, end = grid.node(0, 0), grid.node(size - 1, 0)
+    path, _ = finder.find_path(start, end, grid)
+    assert len(path) == size
+
+    # wall with a gap at the bottom
+    for y in range(size - 1):
+        grid.update_node(12, y, walkable=False, weight=0)
+    cluster_graph = finder.cluster_graph
+    path, _ = finder.find_path(start, end, grid)
+    assert finder.cluster_graph is cluster_graph
+    assert grid.node(12, size - 1) in path
+    assert all(node.walkable for node in path)
+
+    grid.update_node(12, size - 1, walkable=False, weight=0)
+    path, _ = finder.find_path(start, end, grid)
+    assert path == []
+
+    # open the wall again at the top
+    grid.update_node(12, 0, walkable=True, weight=1)
+    path, _ = finder.find_path(start, end, grid)
+    assert len(path) == size
+
+
+def test_update_same_as_rebuild():
+    """
+    updating the clusters around a changed cell gives the same graph as
+    creating it again
+    """
+    def edges(cluster_graph):
+        return {node_id: {other: cost for other, (_, cost) in items.items()}
+                for node_id, items in cluster_graph.graph.successors.items()
+                if items}
+
+    rnd = random.Random(6)
+    grid = Grid(matrix=random_matrix(20, 6, WEIGHTS))
+    grid.set_passable_left_right_border()
+    for diagonal_movement in (DiagonalMovement.never,
+                              DiagonalMovement.only_when_no_obstacle):
+        cluster_graph = ClusterGraph(grid, 4, diagonal_movement)
+        for _ in range(10):
+            weight = rnd.choice((0, 1, 3))
+            grid.update_node(rnd.randrange(20), rnd.randrange(20),
+                             walkable=weight > 0, weight=weight)
+            expected = ClusterGraph(grid, 4, diagonal_movement)
+            expected.close()
+            assert edges(cluster_graph) == edges(expected)
+        cluster_graph.close()
+
+
+def test_parallel_preprocessing():
+    grid = Grid(matrix=random_matrix(30, 5, WEIGHTS))
+    finder = HPAStarFinder(cluster_size=6)
+    serial = finder.preprocess(grid)
+    serial_edges = sorted(
+        (edge[0].node_id, edge[1].node_id, edge[2])
+        for edge in serial.graph.edges)
+    parallel = finder.preprocess(grid, workers=2)
+    parallel_edges = sorted(
+        (edge[0].node_id, edge[1].node_id, edge[2])
+        for edge in parallel.graph.edges)
+    assert serial_edges == parallel_edges
+    check_queries(grid, finder, DiagonalMovement.never)
@@ -0,0 +1,118 @@
+import sys
+
+import pytest
+
+from pathfinding.core.compact_grid import CompactGrid
+from pathfinding.core.diagonal_movement import DiagonalMovement
+from pathfinding.core.grid import Grid
+from pathfinding.finder.a_star import AStarFinder
+from pathfinding.finder.finder import ExecutionRunsException
+from pathfinding.finder.fringe_search import FringeSearchFinder
+from pathfinding.finder.ida_star import IDAStarFinder
+
+from helpers import path_cost, random_matrix
+
+
+def snake_matrix(size):
+    """
+    maze with a single long path from the top left to the bottom right
+    """
+    matrix = [[1] * size for _ in range(size)]
+    for x in range(1, size, 2):
+        for y in range(size):
+            matrix[y][x] = 0
+        matrix[0 if x % 4 == 3 else size - 1][x] = 1
+    return matrix
+
+
+def check_shortest(finder, matrix, diagonal_movement, grid_class=Grid):
+    grid = grid_class(matrix=matrix)
+    end = grid.node(grid.width - 1, grid.height - 1)
+    path, runs = finder.find_path(grid.node(0, 0), end, grid)
+    expected, _ = AStarFinder(diagonal_movement=diagonal_movement).find_path(
+        grid.node(0, 0), end, grid)
+    assert bool(path) == bool(expected)
+    if path:
+        assert path[0] == grid.node(0, 0)
+        assert path[-1] == end
+        for node_a, node_b in zip(path, path[1:]):
+            assert node_b in grid.neighbors(node_a, diagonal_movement)
+    assert path_cost(grid, path, finder.weighted) == pytest.approx(
+        path_cost(grid, expected, finder.weighted))
+    return runs
+
+
+def test_no_recursion_limit():
+    """
+    paths much longer than the recursion limit are found
+    """
+    size = 45
+    assert size * size // 2 > sys.getrecursionlimit()
+    grid = Grid(matrix=snake_matrix(size))
+    path, _ = IDAStarFinder().find_path(
+        grid.node(0, 0), grid.node(size - 1, size - 1), grid)
+    assert len(path) == 1057
+
+
+def test_transposition_table():
+    """
+    the transposition table doesn't change the cost of the path but needs
+    far less expansions
+    """
+    # grids that have a path, without the table IDA* searches unreachable
+    # ends for a very long time
+    for seed in (5, 6, 7):
+        matrix = random_matrix(12, seed)
+        for diagonal_movement in (DiagonalMovement.never,
+                                  DiagonalMovement.always):
+            runs_table = check_shortest(
+                IDAStarFinder(diagonal_movement=diagonal_movement),
+                matrix, diagonal_movement)
+            runs = check_shortest(
+                IDAStarFinder(diagonal_movement=diagonal_movement,
+                              transposition_table_size=0),
+                matrix, diagonal_movement)
+            assert runs_table <= runs
+
+
+def test_transposition_table_full():
+    """
+    a full transposition table doesn't remember new nodes
+    """
+    matrix = random_matrix(15, 1)
+    for size in (1, 10):
+        check_shortest(
+            IDAStarFinder(transposition_table_size=size),
+            matrix, DiagonalMovement.never)
+
+
+def test_ida_star_max_runs():
+    grid = Grid(matrix=random_matrix(20, 2))
+    finder = IDAStarFinder(max_runs=10)
+    with pytest.raises(ExecutionRunsException):
+        finder.find_path(grid.node(0, 0), grid.node(19, 19), grid)
+    assert finder.runs == 10
+
+
+@pytest.mark.parametrize('grid_class', [Grid, CompactGrid])
+def test_fringe_search(grid_class):
+    """
+    Fringe Search finds the shortest path on weighted grids
+    """
+    for seed in range(5):
+        matrix = random_matrix(30, seed, weights=(1, 1, 2, 3))
+        for diagonal_movement in (DiagonalMovement.never,
+                                  DiagonalMovement.always,
+                                  DiagonalMovement.only_when_no_obstacle):
+            check_shortest(
+                FringeSearchFinder(diagonal_movement=diagonal_movement),
+                matrix, diagonal_movement, grid_class)
+
+
+def test_fringe_search_no_path():
+    matrix = random_matrix(10, 0)
+    matrix[8] = [0] * 10
+    grid = Grid(matrix=matrix)
+    path, _ = FringeSearchFinder().find_path(
+        grid.node(0, 0), grid.node(9, 9), grid)
+    assert path == []
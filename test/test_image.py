@@ -0,0 +1,68 @@
+import numpy as np
+import pytest
+
+from pathfinding.core.compact_grid import CompactGrid
+from pathfinding.finder.a_star import AStarFinder
+from pathfinding.io.image import (
+    color_weights, draw_path, find_color, image_grid, load_image)
+
+WATER = (0, 0, 255)
+SAND = (250, 220, 180)
+WALL = (0, 0, 0)
+START = (255, 255, 0)
+END = (255, 0, 0)
+
+MAPPING = {WATER: 5, SAND: 1, WALL: 0}
+
+
+def image():
+    pixels = np.zeros((4, 6, 3), dtype=np.uint8)
+    pixels[:] = SAND
+    pixels[1:3, 2:4] = WATER
+    pixels[:3, 4] = WALL
+    pixels[0, 0] = START
+    pixels[0, 5] = END
+    return pixels
+
+
+def test_color_weights():
+    weights = color_weights(image(), MAPPING, default=2)
+    assert weights.shape == (4, 6)
+    assert weights[0].tolist() == [2, 1, 1, 1, 0, 2]
+    assert weights[1].tolist() == [1, 1, 5, 5, 0, 1]
+    # only the first channels are compared
+    rgba = np.concatenate(
+        (image(), np.full((4, 6, 1), 255, dtype=np.uint8)), axis=-1)
+    assert (color_weights(rgba, MAPPING, default=2) == weights).all()
+    # grayscale
+    gray = np.array([[0, 10], [255, 10]], dtype=np.uint8)
+    assert color_weights(gray, {10: 3, 255: 0}).tolist() == [[1, 3], [0, 3]]
+
+
+def test_find_color():
+    pixels = image()
+    assert find_color(pixels, START) == [(0, 0)]
+    assert find_color(pixels, WALL) == [(4, 0), (4, 1), (4, 2)]
+    assert find_color(pixels, (250, 250, 5)) == []
+    assert find_color(pixels, (250, 250, 5), tolerance=5) == [(0, 0)]
+
+
+def test_path_in_image():
+    pixels = image()
+    grid = image_grid(pixels, MAPPING, grid_class=CompactGrid)
+    start = grid.node(*find_color(pixels, START)[0])
+    end = grid.node(*find_color(pixels, END)[0])
+    path, _ = AStarFinder().find_path(start, end, grid)
+    assert (4, 3) in [tuple(node) for node in path]
+
+    out = draw_path(pixels, path, (255, 165, 0))
+    assert (pixels == image()).all()
+    drawn = find_color(out, (255, 165, 0))
+    assert sorted(drawn) == sorted(tuple(node) for node in path)
+
+
+def test_load_image(tmp_path):
+    Image = pytest.importorskip('PIL.Image')
+    Image.fromarray(image()).save(tmp_path / 'map.png')
+    assert (load_image(tmp_path / 'map.png') == image()).all()
+    assert load_image(tmp_path / 'map.png', 'L').shape == (4, 6)
@@ -0,0 +1,82 @@
+import random
+
+from pathfinding.core.compact_grid import CompactGrid
+from pathfinding.core.diagonal_movement import DiagonalMovement
+from pathfinding.core.grid import Grid
+from pathfinding.core.util import SQRT2
+from pathfinding.finder.a_star import AStarFinder
+from pathfinding.finder.jump_point import JumpPointFinder
+
+
+MODES = [DiagonalMovement.always, DiagonalMovement.never,
+         DiagonalMovement.if_at_most_one_obstacle,
+         DiagonalMovement.only_when_no_obstacle]
+
+
+def path_cost(path):
+    cost = 0
+    for node_a, node_b in zip(path, path[1:]):
+        # steps over a passable border count as a single step
+        dx = min(abs(node_a.x - node_b.x), 1)
+        dy = min(abs(node_a.y - node_b.y), 1)
+        cost += SQRT2 if dx and dy else 1
+    return cost
+
+
+def test_same_cost_as_a_star():
+    """
+    jump point search has to find paths with the same cost as A* on random
+    maps, for all diagonal movements and with passable borders
+    """
+    rnd = random.Random(42)
+    for _ in range(400):
+        width, height = rnd.randint(1, 10), rnd.randint(1, 10)
+        matrix = [[0 if rnd.random() < 0.3 else 1 for _ in range(width)]
+                  for _ in range(height)]
+        start_x, start_y = rnd.randrange(width), rnd.randrange(height)
+        end_x, end_y = rnd.randrange(width), rnd.randrange(height)
+        matrix[start_y][start_x] = matrix[end_y][end_x] = 1
+        diagonal_movement = rnd.choice(MODES)
+        left_right, up_down = rnd.random() < 0.3, rnd.random() < 0.3
+
+        costs = []
+        for finder_class, grid_class in (
+                (AStarFinder, Grid), (JumpPointFinder, Grid),
+                (JumpPointFinder, CompactGrid)):
+            grid = grid_class(matrix=matrix)
+            if left_right:
+                grid.set_passable_left_right_border()
+            if up_down:
+                grid.set_passable_up_down_border()
+            finder = finder_class(diagonal_movement=diagonal_movement)
+            path, _ = finder.find_path(
+                grid.node(start_x, start_y), grid.node(end_x, end_y), grid)
+            # every step of the path has to be a valid move
+            for node, next_node in zip(path, path[1:]):
+                assert next_node in grid.neighbors(
+                    node, diagonal_movement=diagonal_movement)
+            costs.append(round(path_cost(path), 6))
+        assert costs[0] == costs[1] == costs[2], matrix
+
+
+def test_fewer_runs():
+    matrix = [[1] * 50 for _ in range(50)]
+    for row in matrix[10:40]:
+        row[25] = 0
+    for diagonal_movement in MODES:
+        runs = []
+        for finder_class in (AStarFinder, JumpPointFinder):
+            grid = Grid(matrix=matrix)
+            finder = finder_class(diagonal_movement=diagonal_movement)
+            _, finder_runs = finder.find_path(
+                grid.node(0, 25), grid.node(49, 25), grid)
+            runs.append(finder_runs)
+        assert runs[1] * 2 < runs[0]
+
+
+def test_reuse_grid():
+    grid = Grid(matrix=[[1, 1, 1], [1, 0, 1], [1, 1, 1]])
+    finder = JumpPointFinder(diagonal_movement=DiagonalMovement.always)
+    for _ in range(2):
+        path, _ = finder.find_path(grid.node(0, 0), grid.node(2, 2), grid)
+        assert len(path) == 4
@@ -0,0 +1,125 @@
+import io
+import random
+
+import pytest
+
+from pathfinding.core.diagonal_movement import DiagonalMovement
+from pathfinding.core.graph import Graph
+from pathfinding.core.grid import Grid
+from pathfinding.core.landmarks import Landmarks
+from pathfinding.core.node import GraphNode
+from pathfinding.finder.a_star import AStarFinder
+from pathfinding.finder.bi_a_star import BiAStarFinder
+from pathfinding.finder.dijkstra import DijkstraFinder
+
+from helpers import random_matrix
+
+
+# weights of the walkable cells of the random grids
+WEIGHTS = (1, 2, 5, 15)
+
+
+def test_same_cost_as_dijkstra():
+    grid = Grid(matrix=random_matrix(30, 1, WEIGHTS))
+    landmarks = Landmarks(grid, 4, DiagonalMovement.always, seed=1)
+    assert len(landmarks.landmarks) == 4
+    finder = AStarFinder(heuristic=landmarks,
+                         diagonal_movement=DiagonalMovement.always)
+    dijkstra = DijkstraFinder(diagonal_movement=DiagonalMovement.always)
+    rnd = random.Random(2)
+    fewer_runs = 0
+    for _ in range(20):
+        start = grid.node(rnd.randrange(30), rnd.randrange(30))
+        end = grid.node(rnd.randrange(30), rnd.randrange(30))
+        path, runs = finder.find_path(start, end, grid)
+        expected, dijkstra_runs = dijkstra.find_path(start, end, grid)
+        assert bool(path) == bool(expected)
+        if path:
+            assert path[-1].g == pytest.approx(expected[-1].g)
+            fewer_runs += runs < dijkstra_runs
+    assert fewer_runs > 10
+
+
+def test_directed_graph():
+    rnd = random.Random(3)
+    edges = [[rnd.randrange(30), rnd.randrange(30), rnd.randint(1, 9)]
+             for _ in range(90)]
+    graph = Graph(edges=edges)
+    landmarks = Landmarks(graph, 3, seed=3)
+    finder = AStarFinder(heuristic=landmarks)
+    node_ids = list(graph.nodes)
+    for _ in range(30):
+        start = graph.node(rnd.choice(node_ids))
+        end = graph.node(rnd.choice(node_ids))
+        path, _ = finder.find_path(start, end, graph)
+        expected, _ = DijkstraFinder().find_path(start, end, graph)
+        assert bool(path) == bool(expected)
+        if path:
+            assert path[-1].g == pytest.approx(expected[-1].g)
+
+
+def test_bi_a_star():
+    grid = Grid(matrix=random_matrix(20, 4, WEIGHTS))
+    # BiAStarFinder doesn't use weights
+    landmarks = Landmarks(grid, 4, weighted=False)
+    start, end = grid.node(0, 0), grid.node(19, 19)
+    grid.update_node(0, 0, walkable=True, weight=2)
+    assert landmarks.stale
+    landmarks.compute()
+    path, _ = BiAStarFinder(heuristic=landmarks).find_path(start, end, grid)
+    expected, _ = BiAStarFinder().find_path(start, end, grid)
+    assert bool(path) == bool(expected)
+
+
+def test_save_and_load():
+    grid = Grid(matrix=random_matrix(15, 5, WEIGHTS))
+    landmarks = Landmarks(grid, 3, seed=5)
+    file = io.BytesIO()
+    landmarks.save(file)
+    file.seek(0)
+    loaded = Landmarks.load(file, grid)
+    assert loaded.landmarks == landmarks.landmarks
+    assert (loaded.distance_to == landmarks.distance_to).all()
+    start, end = grid.node(0, 0), grid.node(14, 14)
+    assert loaded.estimate(start, end) == landmarks.estimate(start, end)
+
+    file.seek(0)
+    with pytest.raises(ValueError):
+        Landmarks.load(file, Grid(width=3, height=3))
+
+
+def test_save_and_load_graph():
+    """
+    tuple ids of graph nodes are loaded as they were saved
+    """
+    nodes = {(x, y): GraphNode(node_id=(x, y))
+             for x in range(5) for y in range(3)}
+    edges = [[nodes[x, y], nodes[x + 1, y], 1 + (x * y) % 3]
+             for x in range(4) for y in range(3)]
+    edges += [[nodes[x, y], nodes[x, y + 1], 1]
+              for x in range(5) for y in range(2)]
+    graph = Graph(edges=edges, nodes=nodes, bi_directional=True)
+    landmarks = Landmarks(graph, 2, seed=1)
+    file = io.BytesIO()
+    landmarks.save(file)
+    file.seek(0)
+    loaded = Landmarks.load(file, graph)
+    assert loaded.node_ids == landmarks.node_ids
+    assert all(isinstance(node_id, tuple) for node_id in loaded.node_ids)
+    start, end = graph.node((0, 0)), graph.node((4, 2))
+    assert loaded.estimate(start, end) == landmarks.estimate(start, end)
+
+    file.seek(0)
+    with pytest.raises(ValueError):
+        Landmarks.load(file, Graph(edges=[[1, 2, 1]]))
+
+
+def test_stale_after_update():
+    grid = Grid(width=10, height=10)
+    landmarks = Landmarks(grid, landmarks=[grid.node(0, 0)])
+    assert landmarks.estimate(grid.node(0, 0), grid.node(9, 9)) > 0
+    grid.update_node(5, 5, walkable=False, weight=0)
+    # no valid bound until the costs are calculated again
+    assert landmarks.estimate(grid.node(0, 0), grid.node(9, 9)) == 0
+    landmarks.compute()
+    assert landmarks.estimate(grid.node(0, 0), grid.node(9, 9)) > 0
@@ -14,6 +14,7 @@ from pathfinding.finder.dijkstra import DijkstraFinder
 from pathfinding.finder.finder import ExecutionRunsException
 from pathfinding.finder.finder import ExecutionTimeException
 from pathfinding.finder.ida_star import IDAStarFinder
+from pathfinding.finder.jump_point import JumpPointFinder
 from pathfinding.finder.msp import MinimumSpanningTree
 
 import pytest
@@ -26,7 +27,7 @@ scenarios = os.path.join(BASE_PATH, 'path_test_scenarios.json')
 data = json.load(open(scenarios, 'r', encoding='utf-8'))
 finders = [AStarFinder, BestFirst, BiAStarFinder, BiBreadthFirstFinder, 
            BiBestFirstFinder, BiDijkstraFinder, DijkstraFinder, IDAStarFinder,
-           BreadthFirstFinder, MinimumSpanningTree]
+           BreadthFirstFinder, JumpPointFinder, MinimumSpanningTree]
 TIME_LIMIT = 10  # give it a 10 second limit.
 
 
@@ -118,6 +119,32 @@ def test_time():
         assert finder.runs == 1, msg
 
 
+def test_find_paths():
+    """
+    batch queries with and without worker processes
+    """
+    grid, start, end = grid_from_scenario(data[1])
+    nodes = [node for row in grid.nodes for node in row if node.walkable]
+    pairs = [(start, end)] + list(zip(nodes[:6], reversed(nodes[-6:])))
+    finder = AStarFinder(diagonal_movement=DiagonalMovement.always)
+    expected = []
+    for start_node, end_node in pairs:
+        path, runs = finder.find_path(start_node, end_node, grid)
+        expected.append(([tuple(node) for node in path], runs))
+
+    for workers, ordered in ((1, True), (2, True), (2, False)):
+        results = list(finder.find_paths(
+            pairs, grid, workers=workers, ordered=ordered, chunk_size=2))
+        if ordered:
+            assert [result[0] for result in results] == list(range(len(pairs)))
+        results.sort(key=lambda result: result[0])
+        assert [([tuple(node) for node in path], runs)
+                for _, path, runs, _ in results] == expected
+        # paths are made of the nodes of our grid
+        assert results[0][1][0] is start
+        assert all(duration >= 0 for *_, duration in results)
+
+
 if __name__ == '__main__':
     test_path()
     test_path_diagonal()
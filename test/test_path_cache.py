@@ -0,0 +1,154 @@
+import gc
+import weakref
+
+import pytest
+
+from pathfinding.core.compact_grid import CompactGrid
+from pathfinding.core.diagonal_movement import DiagonalMovement
+from pathfinding.core.graph import Graph
+from pathfinding.core.grid import Grid
+from pathfinding.core.world import World
+from pathfinding.finder.a_star import AStarFinder
+from pathfinding.finder.dijkstra import DijkstraFinder
+from pathfinding.finder.path_cache import PathCache
+from pathfinding.finder.theta_star import ThetaStarFinder
+
+
+def open_matrix(width, height):
+    return [[1] * width for _ in range(height)]
+
+
+def coords(path):
+    return [(node.x, node.y) for node in path]
+
+
+@pytest.mark.parametrize('grid_class', [Grid, CompactGrid])
+def test_hits(grid_class):
+    grid = grid_class(matrix=open_matrix(5, 5))
+    cache = PathCache(AStarFinder())
+    path, runs = cache.find_path(grid.node(0, 0), grid.node(4, 4), grid)
+    assert runs > 0
+    cached, runs = cache.find_path(grid.node(0, 0), grid.node(4, 4), grid)
+    assert runs == 0
+    assert coords(cached) == coords(path)
+    assert (cache.hits, cache.misses, len(cache)) == (1, 1, 1)
+
+    # other finder configuration
+    cache.finder = AStarFinder(diagonal_movement=DiagonalMovement.always)
+    path, runs = cache.find_path(grid.node(0, 0), grid.node(4, 4), grid)
+    assert runs > 0 and len(path) == 5
+    assert (cache.hits, cache.misses, len(cache)) == (1, 2, 2)
+
+
+def test_lru():
+    grid = Grid(matrix=open_matrix(5, 5))
+    cache = PathCache(AStarFinder(), max_size=2)
+    for x in (1, 2, 1, 3):
+        cache.find_path(grid.node(0, 0), grid.node(x, 4), grid)
+    assert cache.evictions == 1
+    assert (cache.hits, cache.misses) == (1, 3)
+    # (2, 4) was used least recently
+    cache.find_path(grid.node(0, 0), grid.node(1, 4), grid)
+    assert cache.hits == 2
+    cache.find_path(grid.node(0, 0), grid.node(2, 4), grid)
+    assert cache.misses == 4
+
+
+def test_evicted_grids():
+    """
+    grids without cached paths can be garbage collected
+    """
+    cache = PathCache(AStarFinder(), max_size=2)
+    grids = weakref.WeakSet()
+    for _ in range(50):
+        grid = Grid(matrix=open_matrix(3, 3))
+        grids.add(grid)
+        cache.find_path(grid.node(0, 0), grid.node(2, 2), grid)
+    del grid
+    gc.collect()
+    assert len(cache) == 2
+    assert len(grids) == 2
+
+
+def test_grid_changed():
+    grid = Grid(matrix=open_matrix(5, 5))
+    cache = PathCache(AStarFinder())
+    top, _ = cache.find_path(grid.node(0, 0), grid.node(4, 0), grid)
+    cache.find_path(grid.node(0, 4), grid.node(4, 4), grid)
+    assert len(cache) == 2
+
+    # a cell of another path gets blocked, the path along the top is kept
+    version = grid.version
+    grid.update_node(2, 4, walkable=False)
+    assert grid.version == version + 1
+    assert len(cache) == 1
+    path, runs = cache.find_path(grid.node(0, 0), grid.node(4, 0), grid)
+    assert runs == 0
+    path, runs = cache.find_path(grid.node(0, 4), grid.node(4, 4), grid)
+    assert runs > 0 and (2, 4) not in coords(path)
+
+    # a cell gets cheaper, there might be shorter paths now
+    grid.update_node(2, 4, walkable=True)
+    assert len(cache) == 0
+    path, runs = cache.find_path(grid.node(0, 4), grid.node(4, 4), grid)
+    assert len(path) == 5
+
+    # a cell next to a diagonal step gets blocked
+    cache.finder = AStarFinder(
+        diagonal_movement=DiagonalMovement.only_when_no_obstacle)
+    path, _ = cache.find_path(grid.node(0, 0), grid.node(1, 1), grid)
+    assert len(path) == 2
+    grid.update_node(1, 0, walkable=False)
+    path, runs = cache.find_path(grid.node(0, 0), grid.node(1, 1), grid)
+    assert runs > 0 and len(path) == 3
+
+
+def test_any_angle_path():
+    """
+    the cells crossed by a step of an any-angle path are watched as well
+    """
+    grid = Grid(matrix=open_matrix(7, 3))
+    cache = PathCache(ThetaStarFinder())
+    path, _ = cache.find_path(grid.node(0, 0), grid.node(6, 2), grid)
+    assert len(path) == 2
+    grid.update_node(3, 1, walkable=False)
+    path, runs = cache.find_path(grid.node(0, 0), grid.node(6, 2), grid)
+    assert runs > 0 and len(path) > 2
+
+
+def test_graph():
+    graph = Graph(edges=[[1, 2, 1], [2, 3, 1], [1, 3, 5]])
+    cache = PathCache(DijkstraFinder())
+    path, _ = cache.find_path(graph.node(1), graph.node(3), graph)
+    assert [node.node_id for node in path] == [1, 2, 3]
+    _, runs = cache.find_path(graph.node(1), graph.node(3), graph)
+    assert runs == 0
+
+    version = graph.version
+    graph.remove_edge(2, 3)
+    assert graph.version > version
+    path, runs = cache.find_path(graph.node(1), graph.node(3), graph)
+    assert runs > 0
+    assert [node.node_id for node in path] == [1, 3]
+
+
+def test_world():
+    level0 = Grid(matrix=open_matrix(3, 3), grid_id=0)
+    level1 = Grid(matrix=open_matrix(3, 3), grid_id=1)
+    level0.node(2, 2).connect(level1.node(2, 2))
+    world = World({0: level0, 1: level1})
+    cache = PathCache(AStarFinder())
+    path, _ = cache.find_path(level0.node(0, 0), level1.node(0, 0), world)
+    assert len(path) == 10
+    version = world.version
+    level1.update_node(1, 1, weight=3)
+    assert world.version == version + 1
+    _, runs = cache.find_path(level0.node(0, 0), level1.node(0, 0), world)
+    assert runs == 0
+    level1.update_node(2, 1, walkable=False)
+    _, runs = cache.find_path(level0.node(0, 0), level1.node(0, 0), world)
+    assert runs > 0
+
+    cache.clear()
+    assert len(cache) == 0
+    assert not level0._listeners and not level1._listeners
@@ -0,0 +1,103 @@
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from pathfinding.core.compact_grid import CompactGrid
+from pathfinding.core.diagonal_movement import DiagonalMovement
+from pathfinding.core.graph import Graph
+from pathfinding.core.grid import Grid
+from pathfinding.core.search_context import SearchContext
+from pathfinding.core.world import World
+from pathfinding.finder.a_star import AStarFinder
+from pathfinding.finder.bi_a_star import BiAStarFinder
+from pathfinding.finder.dijkstra import DijkstraFinder
+from pathfinding.finder.ida_star import IDAStarFinder
+from pathfinding.finder.jump_point import JumpPointFinder
+
+
+def test_threads():
+    """
+    searching the same grid from multiple threads gives the same results as
+    searching it one after another and does not touch the grid
+    """
+    rnd = random.Random(0)
+    size = 30
+    matrix = [[0 if rnd.random() < 0.2 else 1 for _ in range(size)]
+              for _ in range(size)]
+    cells = [(x, y) for y in range(size) for x in range(size) if matrix[y][x]]
+    pairs = [(rnd.choice(cells), rnd.choice(cells)) for _ in range(40)]
+    for grid_class in (Grid, CompactGrid):
+        for finder_class in (AStarFinder, BiAStarFinder, JumpPointFinder):
+            finder = finder_class(diagonal_movement=DiagonalMovement.always)
+            expected = []
+            for start, end in pairs:
+                grid = grid_class(matrix=matrix)
+                path, runs = finder.find_path(
+                    grid.node(*start), grid.node(*end), grid)
+                expected.append(([tuple(node) for node in path], runs))
+
+            grid = grid_class(matrix=matrix)
+            local = threading.local()
+
+            def query(pair):
+                if not hasattr(local, 'context'):
+                    local.context = SearchContext(grid)
+                path, runs = local.context.find_path(
+                    finder, grid.node(*pair[0]), grid.node(*pair[1]))
+                assert all(isinstance(node, type(grid.node(0, 0)))
+                           for node in path)
+                return [tuple(node) for node in path], runs
+
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                assert list(executor.map(query, pairs)) == expected
+            assert not grid.dirty
+            assert all(grid.node(x, y).search_id == 0 for x, y in cells)
+
+
+def test_ida_star():
+    grid = Grid(matrix=[[1, 1, 1], [1, 0, 1], [1, 1, 1]])
+    context = SearchContext(grid)
+    path, _ = context.find_path(
+        IDAStarFinder(), grid.node(0, 0), grid.node(2, 2))
+    assert len(path) == 5
+    assert path[0] is grid.node(0, 0)
+
+
+def test_world():
+    grid0 = Grid(matrix=[[1, 1, 1], [1, 0, 0], [1, 1, 1]], grid_id=0)
+    grid1 = Grid(matrix=[[1, 1, 1], [0, 0, 1], [1, 1, 1]], grid_id=1)
+    grid0.node(2, 2).connect(grid1.node(2, 2))
+    grid1.node(2, 2).connect(grid0.node(2, 2))
+    world = World({0: grid0, 1: grid1})
+    path, _ = SearchContext(world).find_path(
+        AStarFinder(), grid0.node(2, 0), grid1.node(0, 0))
+    assert [tuple(node) for node in path] == [
+        (2, 0, 0), (1, 0, 0), (0, 0, 0), (0, 1, 0), (0, 2, 0), (1, 2, 0),
+        (2, 2, 0), (2, 2, 1), (2, 1, 1), (2, 0, 1), (1, 0, 1), (0, 0, 1)]
+
+
+def test_graph():
+    edges = [[1, 2, 7], [1, 3, 9], [1, 6, 14], [2, 3, 10], [2, 4, 15],
+             [3, 4, 11], [3, 6, 2], [4, 5, 6], [6, 5, 9]]
+    graph = Graph(edges=edges, bi_directional=True)
+    context = SearchContext(graph)
+    for _ in range(2):
+        path, _ = context.find_path(
+            DijkstraFinder(), graph.node(1), graph.node(5))
+        assert [node.node_id for node in path] == [1, 3, 6, 5]
+        assert path[0] is graph.node(1)
+    assert graph.node(1).search_id == 0
+
+
+def test_nodes_released():
+    """
+    the context only keeps the nodes of the last query
+    """
+    grid = Grid(matrix=[[1] * 30 for _ in range(30)])
+    context = SearchContext(grid)
+    context.find_path(DijkstraFinder(), grid.node(0, 0), grid.node(29, 29))
+    assert len(context.view._context_nodes) == 30 * 30
+    path, _ = context.find_path(
+        AStarFinder(), grid.node(0, 0), grid.node(2, 0))
+    assert len(path) == 3
+    assert len(context.view._context_nodes) < 10
@@ -0,0 +1,173 @@
+import gc
+import math
+import random
+
+import pytest
+
+from pathfinding.core import line_of_sight
+from pathfinding.core.compact_grid import CompactGrid
+from pathfinding.core.diagonal_movement import DiagonalMovement
+from pathfinding.core.graph import Graph
+from pathfinding.core.grid import Grid
+from pathfinding.core.line_of_sight import LineOfSight
+from pathfinding.core.search_context import SearchContext
+from pathfinding.core.util import smoothen_path
+from pathfinding.finder.a_star import AStarFinder
+from pathfinding.finder import theta_star
+from pathfinding.finder.theta_star import (
+    LazyThetaStarFinder, ThetaStarFinder)
+
+from helpers import random_matrix
+
+
+def length(points):
+    return sum(math.hypot(a[0] - b[0], a[1] - b[1])
+               for a, b in zip(points, points[1:]))
+
+
+def test_line_of_sight():
+    matrix = [
+        [1, 1, 1, 1],
+        [1, 0, 1, 1],
+        [1, 1, 1, 1],
+    ]
+    los = LineOfSight(Grid(matrix=matrix))
+    assert los.check(0, 0, 3, 0)
+    assert los.check(0, 2, 3, 2)
+    assert not los.check(0, 0, 2, 2)
+    assert not los.check(0, 1, 3, 1)
+    # lines don't cut the corners of blocked cells
+    assert not los.check(0, 0, 1, 1)
+    assert not los.check(0, 2, 2, 0)
+    assert los.check(2, 0, 3, 2)
+    assert los.check(3, 2, 2, 0)
+    assert not los.check(1, 1, 1, 1)
+
+
+def test_line_of_sight_numpy():
+    """
+    long lines are checked with numpy, the result is the same as checking
+    cell by cell
+    """
+    rnd = random.Random(4)
+    matrix = random_matrix(60, 1, obstacles=0.02)
+    los = LineOfSight(CompactGrid(matrix=matrix))
+    for _ in range(500):
+        x0, y0, x1, y1 = (rnd.randrange(60) for _ in range(4))
+        expected = los.check(x0, y0, x1, y1)
+        old_length = line_of_sight.NUMPY_MIN_LENGTH
+        line_of_sight.NUMPY_MIN_LENGTH = 10 ** 9
+        try:
+            assert los.check(x0, y0, x1, y1) == expected
+        finally:
+            line_of_sight.NUMPY_MIN_LENGTH = old_length
+
+
+def test_line_of_sight_grid_changed():
+    grid = Grid(matrix=[[1, 1, 1, 1]])
+    los = LineOfSight(grid)
+    assert los.visible(grid.node(0, 0), grid.node(3, 0))
+    assert los.cache
+    grid.update_node(2, 0, walkable=False)
+    assert not los.cache
+    assert not los.visible(grid.node(3, 0), grid.node(0, 0))
+    los.close()
+    with pytest.raises(TypeError):
+        LineOfSight(Graph([[1, 2, 1]]))
+
+
+@pytest.mark.parametrize(
+    'finder_class', [ThetaStarFinder, LazyThetaStarFinder])
+def test_any_angle_path(finder_class):
+    """
+    any-angle paths are valid and shorter than A* paths, even if those are
+    smoothed
+    """
+    for seed in range(3):
+        matrix = random_matrix(50, seed)
+        for diagonal_movement in (DiagonalMovement.never,
+                                  DiagonalMovement.only_when_no_obstacle):
+            grid = Grid(matrix=matrix)
+            start, end = grid.node(0, 0), grid.node(49, 49)
+            finder = finder_class(diagonal_movement=diagonal_movement)
+            path, runs = finder.find_path(start, end, grid)
+            assert path[0] == start and path[-1] == end
+            los = LineOfSight(grid)
+            for node_a, node_b in zip(path, path[1:]):
+                assert los.check(node_a.x, node_a.y, node_b.x, node_b.y) or \
+                    node_b in grid.neighbors(node_a, diagonal_movement)
+            cost = end.g
+            assert cost == pytest.approx(
+                length([(node.x, node.y) for node in path]))
+
+            expected, _ = AStarFinder(
+                diagonal_movement=diagonal_movement).find_path(
+                    grid.node(0, 0), grid.node(49, 49), grid)
+            smooth = smoothen_path(
+                grid, [(node.x, node.y) for node in expected])
+            assert cost < length(smooth)
+
+
+def test_lazy_theta_star():
+    """
+    Lazy Theta* finds paths as short as Theta* with less line of sight
+    checks
+    """
+    grid = Grid(matrix=random_matrix(50, 0))
+    theta = ThetaStarFinder()
+    path, _ = theta.find_path(grid.node(0, 0), grid.node(49, 49), grid)
+    cost = path[-1].g
+    lazy = LazyThetaStarFinder()
+    path, _ = lazy.find_path(grid.node(0, 0), grid.node(49, 49), grid)
+    assert path[-1].g == pytest.approx(cost, rel=0.01)
+    assert len(lazy.line_of_sight.cache) < len(theta.line_of_sight.cache)
+
+
+def test_theta_star_grid_changed():
+    grid = Grid(matrix=[[1, 1, 1, 1, 1]] * 3)
+    finder = ThetaStarFinder()
+    path, _ = finder.find_path(grid.node(0, 1), grid.node(4, 1), grid)
+    assert len(path) == 2
+    grid.update_node(2, 1, walkable=False)
+    path, _ = finder.find_path(grid.node(0, 1), grid.node(4, 1), grid)
+    assert len(path) > 2
+    assert all(node != grid.node(2, 1) for node in path)
+
+
+def test_theta_star_search_context():
+    """
+    searches of copies of the finder on other grids don't close the line of
+    sight checks of the finder, a context sees changes of its grid
+    """
+    grid = Grid(matrix=[[1, 1, 1, 1, 1]] * 3)
+    finder = ThetaStarFinder()
+    path, _ = finder.find_path(grid.node(0, 1), grid.node(4, 1), grid)
+    assert len(path) == 2
+    context = SearchContext(grid)
+    path, _ = context.find_path(finder, grid.node(0, 1), grid.node(4, 1))
+    assert len(path) == 2
+
+    grid.update_node(2, 1, walkable=False)
+    path, _ = finder.find_path(grid.node(0, 1), grid.node(4, 1), grid)
+    assert len(path) > 2
+    path, _ = context.find_path(finder, grid.node(0, 1), grid.node(4, 1))
+    assert len(path) > 2
+
+
+def test_theta_star_dropped_line_of_sight():
+    """
+    line of sight checks of grids the finder doesn't keep anymore stop
+    listening to their grid
+    """
+    grids = [Grid(matrix=[[1, 1, 1]]) for _ in range(10)]
+    finder = ThetaStarFinder()
+    for grid in grids:
+        finder.find_path(grid.node(0, 0), grid.node(2, 0), grid)
+        grid.cleanup()
+    assert len(finder.lines_of_sight) == theta_star.LINE_OF_SIGHT_GRIDS
+    gc.collect()
+    grids[0].update_node(1, 0, walkable=False)
+    assert not grids[0]._listeners
+    path, _ = finder.find_path(
+        grids[0].node(0, 0), grids[0].node(2, 0), grids[0])
+    assert path == []